@@ -45,6 +45,10 @@ import weakref
 
 log = get_logger(__name__)
 
+# Environment variable used by the LibspecManager to key its libspecs folder
+# (kept in sync with `robotframework_ls.impl.libspec_manager`).
+ENV_LIBSPEC_ENVIRONMENT_ID = "ROBOTFRAMEWORK_LS_LIBSPEC_ENVIRONMENT_ID"
+
 
 _CachedFileMTimeInfo = namedtuple("_CachedFileMTimeInfo", "st_mtime, st_size, path")
 
@@ -135,6 +139,15 @@ class _CachedInterpreterInfo(object):
             if len(parts) == 2:
                 environ[parts[0]] = parts[1]
 
+        if conda_config_file_info is not None:
+            # Robots with the same conda.yaml have the same libraries available,
+            # so, they can share the same libspecs.
+            import hashlib
+
+            environ[ENV_LIBSPEC_ENVIRONMENT_ID] = hashlib.sha256(
+                conda_config_file_info.contents.encode("utf-8")
+            ).hexdigest()
+
         pythonpath_lst = robot_yaml_file_info.yaml_contents.get("PYTHONPATH", [])
         additional_pythonpath_entries: List[str] = []
         if isinstance(pythonpath_lst, list):
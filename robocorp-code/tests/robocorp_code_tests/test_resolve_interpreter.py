@@ -35,6 +35,16 @@ def test_resolve_interpreter(
     assert environ
     assert environ["RPA_SECRET_MANAGER"] == "RPA.Robocloud.Secrets.FileSecrets"
     assert environ["RPA_SECRET_FILE"] == "/Users/<your-username-here>/vault.json"
+
+    # The libspecs are shared among robots with the same conda.yaml.
+    import hashlib
+
+    conda_yaml = Path(path).parent.parent / "config" / "conda.yaml"
+    assert environ["ROBOTFRAMEWORK_LS_LIBSPEC_ENVIRONMENT_ID"] == (
+        hashlib.sha256(
+            conda_yaml.read_text(encoding="utf-8", errors="replace").encode("utf-8")
+        ).hexdigest()
+    )
     additional_pythonpath_entries = interpreter_info.get_additional_pythonpath_entries()
     assert len(additional_pythonpath_entries) == 3
     found = set()
@@ -173,6 +173,9 @@ class _ReaderThread(threading.Thread):
         self._id_message_matchers = {}  # msg id-> matcher
         self._pattern_message_matchers = {}  # id(matcher) -> matcher
 
+        # Notification handlers.
+        self._method_to_notification_handlers = {}  # method -> list(handler)
+
     def run(self):
         try:
             self.reader.listen(self._on_message)
@@ -208,6 +211,11 @@ class _ReaderThread(threading.Thread):
                 message_matcher = self._id_message_matchers.pop(msg["id"], None)
                 if message_matcher is not None:
                     notify_matchers.append(message_matcher)
+                notification_handlers = ()
+            else:
+                notification_handlers = self._method_to_notification_handlers.get(
+                    msg.get("method"), ()
+                )
 
             if Setup.options.DEBUG_MESSAGE_MATCHERS:
                 log.debug(
@@ -222,6 +230,26 @@ class _ReaderThread(threading.Thread):
         for message_matcher in notify_matchers:
             message_matcher.notify(msg)
 
+        for handler in notification_handlers:
+            try:
+                handler(msg)
+            except Exception:
+                log.exception("Error handling notification: %s", msg)
+
+    def register_notification_handler(self, method, handler):
+        """
+        :param method:
+            The method of the notification to be handled.
+            
+        :param handler:
+            A callable which receives the notification message (it's called
+            in the reader thread, so, it shouldn't block).
+        """
+        with self._lock:
+            # Copy on write (the handlers are iterated without the lock).
+            handlers = self._method_to_notification_handlers.get(method, [])
+            self._method_to_notification_handlers[method] = handlers + [handler]
+
     def obtain_pattern_message_matcher(self, message_pattern):
         """
         :param message_pattern:
@@ -343,6 +371,12 @@ class LanguageServerClientBase(object):
     def obtain_id_message_matcher(self, message_id):
         return self._reader_thread.obtain_id_message_matcher(message_id)
 
+    @implements(ILanguageServerClientBase.register_notification_handler)
+    def register_notification_handler(
+        self, method: str, handler: Callable[[dict], None]
+    ) -> None:
+        self._reader_thread.register_notification_handler(method, handler)
+
     @implements(ILanguageServerClientBase.write)
     def write(self, contents):
         return self.writer.write(contents)
@@ -191,6 +191,15 @@ class ILanguageServerClientBase(IRequestCancellable, Protocol):
     def obtain_id_message_matcher(self, message_id) -> IMessageMatcher:
         pass
 
+    def register_notification_handler(
+        self, method: str, handler: Callable[[Dict], None]
+    ) -> None:
+        """
+        Registers a handler which is called (in the reader thread) with the
+        notification message whenever a notification with the given method
+        is received.
+        """
+
     def write(self, contents):
         pass
 
@@ -261,6 +270,11 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
         :Note: async complete.
         """
 
+    def request_libspec_manager_status(self) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+
     def request_signature_help(
         self, doc_uri: str, line: int, col: int
     ) -> Optional[IIdMessageMatcher]:
@@ -484,6 +498,13 @@ class IDocument(Protocol):
     def get_line(self, line: int) -> str:
         pass
 
+    @property
+    def source_mtime(self) -> float:
+        """
+        The mtime of the file when the source was loaded from the filesystem
+        (-1 if the source wasn't loaded from the filesystem).
+        """
+
     def is_source_in_sync(self) -> bool:
         """
         If the document is backed up by a file, returns true if the sources are
@@ -158,9 +158,19 @@ class _Observer(object):
             def on_any_event(self, event):
                 if event.is_directory:
                     return None
-                for ext in self._extensions:
-                    if event.src_path.lower().endswith(ext):
-                        on_change(event.src_path, *call_args)
+
+                changed = [event.src_path]
+                # Note: files are usually atomically written by writing to a
+                # temporary file which is then moved to the final place.
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path:
+                    changed.append(dest_path)
+
+                for path in changed:
+                    for ext in self._extensions:
+                        if path.lower().endswith(ext):
+                            on_change(path, *call_args)
+                            break
 
         handler = _Handler(extensions)
         watches = []
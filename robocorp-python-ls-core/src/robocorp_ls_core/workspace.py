@@ -314,6 +314,14 @@ class Document(object):
         with io.open(self.path, "r", encoding="utf-8") as f:
             self._source = f.read()
 
+    @property
+    def source_mtime(self) -> float:
+        """
+        The mtime of the file when the source was loaded from the filesystem
+        (-1 if the source wasn't loaded from the filesystem).
+        """
+        return self._source_mtime
+
     @implements(IDocument.is_source_in_sync)
     def is_source_in_sync(self):
         try:
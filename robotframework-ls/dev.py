@@ -8,6 +8,7 @@ Some example commands:
     python -m dev set-version 0.0.2
     python -m dev check-tag-version
     python -m dev vendor-robocorp-ls-core
+    python -m dev generate-prebuilt-libspecs
 """
 import sys
 import os
@@ -141,6 +142,48 @@ class Dev(object):
         shutil.copytree(src_core, vendored_dir)
         print("Finished vendoring.")
 
+    def generate_prebuilt_libspecs(self):
+        """
+        Generates the libspecs for the builtin libraries of the robotframework
+        version currently installed (those are shipped so that the language
+        server doesn't need to generate them when it's started).
+        """
+        import shutil
+        import tempfile
+        from robotframework_ls.impl.libspec_manager import LibspecManager
+
+        robot_version = LibspecManager.get_robot_version()
+        target_dir = os.path.join(
+            os.path.dirname(__file__),
+            "src",
+            "robotframework_ls",
+            "impl",
+            "prebuilt_libspecs",
+            robot_version,
+        )
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        os.makedirs(target_dir)
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            libspec_manager = LibspecManager(
+                builtin_libspec_dir=os.path.join(tmp_dir, "builtins"),
+                user_libspec_dir=os.path.join(tmp_dir, "user"),
+            )
+            libspec_manager.dispose()
+
+            builtins_dir = os.path.join(tmp_dir, "builtins")
+            for filename in sorted(os.listdir(builtins_dir)):
+                if filename.endswith(".libspec"):
+                    shutil.copyfile(
+                        os.path.join(builtins_dir, filename),
+                        os.path.join(target_dir, filename),
+                    )
+                    print("Generated: %s" % (os.path.join(target_dir, filename),))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
     def fix_readme(self):
         """
         Updates the links in the README.md to match the current tagged version.
@@ -1,5 +1,5 @@
 import sys
-from typing import Iterator, Optional
+from typing import Iterator, Optional, List, Tuple
 
 import ast as ast_module
 from robocorp_ls_core.lsp import Error
@@ -96,8 +96,14 @@ def collect_errors(node):
     """
     :return list(Error)
     """
+    return _collect_errors(_iter_nodes(node))
+
+
+def _collect_errors(iter_nodes):
     errors = []
-    for _stack, node in _iter_nodes_filtered(node, accept_class="Error"):
+    for _stack, node in iter_nodes:
+        if node.__class__.__name__ != "Error":
+            continue
         msg = node.error
 
         if len(errors) >= MAX_ERRORS:
@@ -180,6 +186,32 @@ def _iter_nodes(node, stack=None, recursive=True):
                 stack.pop()
 
 
+def iter_blocks(ast) -> Iterator[NodeInfo]:
+    """
+    Iterates through the top-level blocks of the document (in the order in
+    which they appear in the document): the header of each section and each
+    item in the body of a section (i.e.: a test case, a keyword, a setting,
+    a variable, a comment, ...).
+    """
+    for section in ast.sections:
+        stack = (section,)
+        if section.header is not None:
+            yield NodeInfo(stack, section.header)
+        for node in section.body:
+            yield NodeInfo(stack, node)
+
+
+def _iter_block_nodes(block_info: NodeInfo):
+    """
+    Same as `_iter_nodes` but the block node itself is also provided.
+    """
+    stack = list(block_info.stack)
+    yield stack, block_info.node
+    stack.append(block_info.node)
+    for o in _iter_nodes(block_info.node, stack):
+        yield o
+
+
 def find_token(ast, line, col) -> Optional[TokenInfo]:
     for stack, node in _iter_nodes(ast):
         try:
@@ -290,24 +322,44 @@ def _iter_nodes_filtered(ast, accept_class, recursive=True):
             yield stack, node
 
 
+def _iter_section_nodes_filtered(ast, accept_class) -> Iterator[NodeInfo]:
+    """
+    Provides the same nodes as `_iter_nodes_filtered` for nodes which can only
+    be in the body of a section (imports, keywords, variables), without
+    visiting the contents of the test cases/keywords (which is what takes time
+    in big documents).
+    """
+    sections = getattr(ast, "sections", None)
+    if sections is None:
+        for stack, node in _iter_nodes_filtered(ast, accept_class=accept_class):
+            yield NodeInfo(tuple(stack), node)
+        return
+
+    for section in sections:
+        stack = (section,)
+        for node in section.body:
+            if node.__class__.__name__ == accept_class:
+                yield NodeInfo(stack, node)
+
+
 def iter_library_imports(ast) -> Iterator[NodeInfo]:
-    for stack, node in _iter_nodes_filtered(ast, accept_class="LibraryImport"):
-        yield NodeInfo(tuple(stack), node)
+    return _iter_section_nodes_filtered(ast, "LibraryImport")
 
 
 def iter_resource_imports(ast) -> Iterator[NodeInfo]:
-    for stack, node in _iter_nodes_filtered(ast, accept_class="ResourceImport"):
-        yield NodeInfo(tuple(stack), node)
+    return _iter_section_nodes_filtered(ast, "ResourceImport")
+
+
+def iter_variables_imports(ast) -> Iterator[NodeInfo]:
+    return _iter_section_nodes_filtered(ast, "VariablesImport")
 
 
 def iter_keywords(ast) -> Iterator[NodeInfo]:
-    for stack, node in _iter_nodes_filtered(ast, accept_class="Keyword"):
-        yield NodeInfo(tuple(stack), node)
+    return _iter_section_nodes_filtered(ast, "Keyword")
 
 
 def iter_variables(ast) -> Iterator[NodeInfo]:
-    for stack, node in _iter_nodes_filtered(ast, accept_class="Variable"):
-        yield NodeInfo(tuple(stack), node)
+    return _iter_section_nodes_filtered(ast, "Variable")
 
 
 def iter_keyword_arguments_as_str(ast) -> Iterator[str]:
@@ -367,6 +419,29 @@ def iter_keyword_usage_tokens(ast) -> Iterator[KeywordUsageInfo]:
             yield usage_info
 
 
+def collect_block_errors_and_keyword_usages(
+    block_info: NodeInfo,
+) -> Tuple[List[Error], List[KeywordUsageInfo]]:
+    """
+    Same as `collect_errors` and `iter_keyword_usage_tokens` for a block
+    provided by `iter_blocks` (visiting the nodes of the block only once).
+
+    :return tuple(list(Error), list(KeywordUsageInfo))
+    """
+    errors = []
+    keyword_usages = []
+    for stack, node in _iter_block_nodes(block_info):
+        if node.__class__.__name__ == "Error":
+            if len(errors) < MAX_ERRORS:
+                errors.append(create_error_from_node(node, node.error))
+            continue
+
+        usage_info = create_keyword_usage_info(stack, node)
+        if usage_info is not None:
+            keyword_usages.append(usage_info)
+    return errors, keyword_usages
+
+
 def create_keyword_usage_info(stack, node) -> Optional[KeywordUsageInfo]:
     """
     If this is a keyword usage node, return information on it, otherwise, 
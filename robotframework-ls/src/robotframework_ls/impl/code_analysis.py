@@ -8,6 +8,7 @@ class _KeywordContainer(object):
     def __init__(self):
         self._name_to_keyword = {}
         self._names_with_variables = set()
+        self._embedded_args_matcher = None
 
     def add_keyword(self, keyword_found):
         from robotframework_ls.impl.text_utilities import normalize_robot_name
@@ -17,20 +18,26 @@ class _KeywordContainer(object):
 
         if "{" in normalized_name:
             self._names_with_variables.add(normalized_name)
+            self._embedded_args_matcher = None
 
     def contains_keyword(self, normalized_keyword_name):
-        from robotframework_ls.impl.text_utilities import matches_robot_keyword
+        from robotframework_ls.impl.text_utilities import get_embedded_args_matcher
 
         if normalized_keyword_name in self._name_to_keyword:
             return True
 
-        # We do not have an exact match, still, we need to check if we may
-        # have a match in keywords that accept variables.
-        for name in self._names_with_variables:
-            if matches_robot_keyword(normalized_keyword_name, name):
-                return True
+        if not self._names_with_variables:
+            return False
 
-        return False
+        # We do not have an exact match, still, we need to check if we may
+        # have a match in keywords that accept variables (all of those are
+        # checked at once by the matcher).
+        matcher = self._embedded_args_matcher
+        if matcher is None:
+            matcher = self._embedded_args_matcher = get_embedded_args_matcher(
+                frozenset(self._names_with_variables)
+            )
+        return matcher.matches(normalized_keyword_name)
 
 
 class _KeywordsCollector(object):
@@ -101,20 +108,93 @@ class _KeywordsCollector(object):
         return False
 
 
-def collect_analysis_errors(completion_context):
-    from robotframework_ls.impl import ast_utils
+def collect_library_import_errors(completion_context):
+    """
+    Reports the libraries whose libspec couldn't be generated (the failure is
+    recorded by the libspec manager when collecting the keywords).
+    """
+    from robot.api import Token
     from robotframework_ls.impl.ast_utils import create_error_from_node
-    from robotframework_ls.impl.collect_keywords import collect_keywords
-    from robotframework_ls.impl.text_utilities import normalize_robot_name
 
     errors = []
+    libspec_manager = completion_context.workspace.libspec_manager
+    for library_import in completion_context.get_imported_libraries():
+        completion_context.check_cancelled()
+        if not library_import.name:
+            continue
+        msg = libspec_manager.get_library_creation_error(
+            library_import.name, current_doc_uri=completion_context.doc.uri
+        )
+        if msg:
+            token = library_import.get_token(Token.NAME)
+            error = create_error_from_node(
+                library_import,
+                "Unable to generate libspec for library: %s.\n%s"
+                % (library_import.name, msg),
+                tokens=[token] if token is not None else None,
+            )
+            errors.append(error)
+    return errors
+
+
+def normalize_keyword_usages(keyword_usages):
+    """
+    :param keyword_usages:
+        An iterable with the KeywordUsageInfo to be normalized.
+
+    :return list(tuple(KeywordUsageInfo, str)):
+        The keyword usages along with their normalized names.
+    """
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    return [
+        (keyword_usage_info, normalize_robot_name(keyword_usage_info.name))
+        for keyword_usage_info in keyword_usages
+    ]
+
+
+def collect_keywords_for_usages(completion_context, keyword_usages):
+    """
+    :param keyword_usages:
+        The keyword usages (as provided by `normalize_keyword_usages`).
+
+    :return:
+        A collector with the keywords which may match the given keyword usages.
+    """
+    from robotframework_ls.impl.collect_keywords import collect_keywords
+    from robotframework_ls.impl.text_utilities import iter_dotted_names
+
+    normalized_names = set()
+    for _keyword_usage_info, normalized_name in keyword_usages:
+        normalized_names.add(normalized_name)
+        for _name, remainder in iter_dotted_names(normalized_name):
+            if remainder:
+                normalized_names.add(remainder)
+
     collector = _KeywordsCollector()
-    collect_keywords(completion_context, collector)
+    # Only the keywords which may match some keyword usage are needed.
+    collect_keywords(completion_context, collector, tuple(normalized_names))
+    return collector
 
-    ast = completion_context.get_ast()
-    for keyword_usage_info in ast_utils.iter_keyword_usage_tokens(ast):
+
+def collect_undefined_keyword_errors(
+    completion_context, collector, keyword_usages, max_errors=MAX_ERRORS
+):
+    """
+    :param collector:
+        The collector provided by `collect_keywords_for_usages`.
+
+    :param keyword_usages:
+        The keyword usages (as provided by `normalize_keyword_usages`).
+    """
+    from robotframework_ls.impl.ast_utils import create_error_from_node
+
+    errors = []
+    if max_errors <= 0:
+        return errors
+
+    for keyword_usage_info, normalized_name in keyword_usages:
         completion_context.check_cancelled()
-        normalized_name = normalize_robot_name(keyword_usage_info.name)
         if not collector.contains_keyword(normalized_name):
 
             # There's not a direct match, but the library name may be builtin
@@ -127,7 +207,29 @@ def collect_analysis_errors(completion_context):
                 tokens=[keyword_usage_info.token],
             )
             errors.append(error)
-            if len(errors) >= MAX_ERRORS:
+            if len(errors) >= max_errors:
                 # i.e.: Collect at most 100 errors
                 break
     return errors
+
+
+def collect_analysis_errors(completion_context):
+    from robotframework_ls.impl import ast_utils
+
+    ast = completion_context.get_ast()
+    keyword_usages = normalize_keyword_usages(ast_utils.iter_keyword_usage_tokens(ast))
+
+    errors = []
+    collector = collect_keywords_for_usages(completion_context, keyword_usages)
+
+    errors.extend(collect_library_import_errors(completion_context))
+
+    errors.extend(
+        collect_undefined_keyword_errors(
+            completion_context,
+            collector,
+            keyword_usages,
+            max_errors=MAX_ERRORS - len(errors),
+        )
+    )
+    return errors
@@ -10,7 +10,7 @@ from robotframework_ls.impl.protocols import (
     IKeywordCollector,
 )
 from robotframework_ls.impl.robot_specbuilder import KeywordArg
-from typing import Tuple, Sequence
+from typing import Tuple, Sequence, Optional
 
 
 log = get_logger(__name__)
@@ -212,46 +212,64 @@ class _KeywordFoundFromLibrary(object):
         _: IKeywordFound = check_implements(self)
 
 
-def _collect_completions_from_ast(
-    ast, completion_context: ICompletionContext, collector
+def _collect_current_doc_keywords(
+    completion_context: ICompletionContext,
+    collector: IKeywordCollector,
+    normalized_names: Optional[Sequence[str]],
 ):
-    from robotframework_ls.impl import ast_utils
+    """
+    :param CompletionContext completion_context:
+    """
     from robocorp_ls_core.lsp import CompletionItemKind
 
-    for keyword in ast_utils.iter_keywords(ast):
+    # Get keywords defined in the file itself
+    keyword_index = completion_context.workspace.keyword_index
+    doc_keywords = keyword_index.get_doc_keywords(completion_context.doc)
+    if not doc_keywords.keywords:
+        return
+
+    ast = completion_context.get_ast()
+    for keyword in doc_keywords.iter_keywords(normalized_names):
         completion_context.check_cancelled()
-        keyword_name = keyword.node.name
+        keyword_name = keyword.keyword_name
         if collector.accepts(keyword_name):
-            keyword_args = []
-            for arg in ast_utils.iter_keyword_arguments_as_str(keyword.node):
-                keyword_args.append(KeywordArg(arg))
-
             collector.on_keyword(
                 _KeywordFoundFromAst(
                     ast,
                     keyword.node,
                     keyword_name,
-                    keyword_args,
+                    keyword.keyword_args,
                     completion_context,
                     CompletionItemKind.Function,
                 )
             )
 
 
-def _collect_current_doc_keywords(completion_context, collector):
-    """
-    :param CompletionContext completion_context:
-    """
-    # Get keywords defined in the file itself
-
-    ast = completion_context.get_ast()
-    _collect_completions_from_ast(ast, completion_context, collector)
-
-
-_LibInfo = namedtuple("_LibInfo", "name, alias")
+_LibInfo = namedtuple("_LibInfo", "name, alias, args")
 
 
-def _collect_libraries_keywords(completion_context, collector):
+def get_library_import_args(completion_context, library_import):
+    """
+    :return tuple(str):
+        The arguments used in the library import (empty if some argument
+        has a variable which can't be resolved).
+    """
+    import re
+    from robot.api import Token
+
+    args = []
+    for token in library_import.get_tokens(Token.ARGUMENT):
+        # Note: resolve from the value (the argument token would be tokenized
+        # with its own type).
+        value = completion_context.token_value_resolving_variables(token.value)
+        if re.search(r"[$@&%]\{", value):
+            log.debug("Unable to resolve library argument: %s", value)
+            return ()
+        args.append(value)
+    return tuple(args)
+
+
+def _collect_libraries_keywords(completion_context, collector, normalized_names):
     """
     :param CompletionContext completion_context:
     """
@@ -260,9 +278,17 @@ def _collect_libraries_keywords(completion_context, collector):
     from robocorp_ls_core.lsp import CompletionItemKind
 
     libraries = completion_context.get_imported_libraries()
-    library_infos = set(_LibInfo(library.name, library.alias) for library in libraries)
-    library_infos.add(_LibInfo(BUILTIN_LIB, None))
+    library_infos = set(
+        _LibInfo(
+            library.name,
+            library.alias,
+            get_library_import_args(completion_context, library),
+        )
+        for library in libraries
+    )
+    library_infos.add(_LibInfo(BUILTIN_LIB, None, ()))
     libspec_manager = completion_context.workspace.libspec_manager
+    keyword_index = completion_context.workspace.keyword_index
 
     for library_info in library_infos:
         completion_context.check_cancelled()
@@ -270,11 +296,15 @@ def _collect_libraries_keywords(completion_context, collector):
             continue
 
         library_doc = libspec_manager.get_library_info(
-            library_info.name, create=True, current_doc_uri=completion_context.doc.uri
+            library_info.name,
+            create=True,
+            current_doc_uri=completion_context.doc.uri,
+            lib_args=library_info.args,
         )
         if library_doc is not None:
+            library_keywords = keyword_index.get_library_keywords(library_doc)
             #: :type keyword: KeywordDoc
-            for keyword in library_doc.keywords:
+            for keyword in library_keywords.iter_keywords(normalized_names):
                 keyword_name = keyword.name
                 if collector.accepts(keyword_name):
 
@@ -295,31 +325,40 @@ def _collect_libraries_keywords(completion_context, collector):
                     )
 
 
-def _collect_resource_imports_keywords(completion_context, collector):
+def _collect_resource_imports_keywords(completion_context, collector, normalized_names):
     """
     :param CompletionContext completion_context:
     """
     for resource_doc in completion_context.get_resource_imports_as_docs():
         new_ctx = completion_context.create_copy(resource_doc)
-        _collect_following_imports(new_ctx, collector)
+        _collect_following_imports(new_ctx, collector, normalized_names)
 
 
-def _collect_following_imports(completion_context, collector):
+def _collect_following_imports(completion_context, collector, normalized_names):
     completion_context.check_cancelled()
     if completion_context.memo.follow_import(completion_context.doc.uri):
         # i.e.: prevent collecting keywords for the same doc more than once.
 
-        _collect_current_doc_keywords(completion_context, collector)
+        _collect_current_doc_keywords(completion_context, collector, normalized_names)
 
-        _collect_resource_imports_keywords(completion_context, collector)
+        _collect_resource_imports_keywords(
+            completion_context, collector, normalized_names
+        )
 
-        _collect_libraries_keywords(completion_context, collector)
+        _collect_libraries_keywords(completion_context, collector, normalized_names)
 
 
 def collect_keywords(
-    completion_context: ICompletionContext, collector: IKeywordCollector
+    completion_context: ICompletionContext,
+    collector: IKeywordCollector,
+    normalized_names: Optional[Sequence[str]] = None,
 ):
     """
     Collects all the keywords that are available to the given completion_context.
+
+    :param normalized_names:
+        If given, only the keywords which may match one of the given
+        (normalized) names are reported to the collector (i.e.: the keywords
+        with one of those names and the keywords with embedded arguments).
     """
-    _collect_following_imports(completion_context, collector)
+    _collect_following_imports(completion_context, collector, normalized_names)
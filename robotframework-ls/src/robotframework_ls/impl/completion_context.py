@@ -258,25 +258,11 @@ class CompletionContext(object):
             return None
         return ast_utils.find_variable(section, self.sel.line, self.sel.col)
 
-    @instance_cache
     def get_imported_libraries(self):
-        from robotframework_ls.impl import ast_utils
-
-        ast = self.get_ast()
-        ret = []
-        for library_import in ast_utils.iter_library_imports(ast):
-            ret.append(library_import.node)
-        return tuple(ret)
+        return self.doc.get_library_imports()
 
-    @instance_cache
     def get_resource_imports(self):
-        from robotframework_ls.impl import ast_utils
-
-        ast = self.get_ast()
-        ret = []
-        for resource in ast_utils.iter_resource_imports(ast):
-            ret.append(resource.node)
-        return tuple(ret)
+        return self.doc.get_resource_imports()
 
     def token_value_resolving_variables(self, token):
         from robotframework_ls.impl import ast_utils
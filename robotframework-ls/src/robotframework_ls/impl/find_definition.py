@@ -129,6 +129,12 @@ class _FindDefinitionKeywordCollector(IDefinitionsCollector):
         self._matcher = RobotStringMatcher(match_name)
         self._scope_matchers = build_matchers_with_resource_or_library_scope(match_name)
 
+        # The names of the keywords which may match (used to query the keyword
+        # index instead of checking all the keywords available).
+        self.normalized_names = [self._matcher.filter_text] + [
+            matcher.filter_text for matcher in self._scope_matchers
+        ]
+
     def accepts(self, keyword_name):
         return True
 
@@ -175,7 +181,7 @@ def find_keyword_definition(
     token = ast_utils.get_keyword_name_token(token_info.node, token_info.token)
     if token is not None:
         collector = _FindDefinitionKeywordCollector(token.value)
-        collect_keywords(completion_context, collector)
+        collect_keywords(completion_context, collector, collector.normalized_names)
         return collector.matches
     return None
 
@@ -0,0 +1,179 @@
+"""
+Index of the keywords defined in the workspace documents and in the libraries.
+
+Keywords in Robot Framework are scoped by the imports of a document, so, the
+index is kept per document (normalized keyword name -> keyword definitions)
+and is queried for each document in the import closure of the document being
+analyzed (instead of traversing the AST of each of those documents and parsing
+the arguments of each keyword on each request).
+
+The entry of a document is weakly keyed by its AST (a new document -- and
+AST -- is created when the document is changed in the editor or when it's
+reloaded from the filesystem because it changed in the disk), so, only the
+documents which actually changed have to be indexed again and the entry is
+removed when the AST is garbage-collected (the index doesn't keep the AST of
+documents which are no longer referenced alive).
+"""
+import threading
+import weakref
+from typing import Dict, Tuple, Optional, Iterator, Sequence, Any
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.protocols import IRobotDocument
+from robotframework_ls.impl.robot_specbuilder import KeywordArg
+
+log = get_logger(__name__)
+
+
+class IndexedKeyword(object):
+    """
+    A keyword defined in a document (with the information which would be
+    obtained from its node in the AST).
+    """
+
+    __slots__ = ["keyword_name", "normalized_name", "node", "keyword_args"]
+
+    def __init__(
+        self, keyword_name: str, normalized_name: str, node, keyword_args
+    ) -> None:
+        self.keyword_name = keyword_name
+        self.normalized_name = normalized_name
+        self.node = node
+        self.keyword_args: Tuple[KeywordArg, ...] = keyword_args
+
+
+class _KeywordsByName(object):
+    """
+    Maps the normalized keyword name to the keywords with that name (keywords
+    with embedded arguments are kept apart as they may match any name).
+    """
+
+    __slots__ = ["keywords", "_name_to_keywords", "_keywords_with_variables"]
+
+    def __init__(self, keywords: Sequence[Any], get_name) -> None:
+        """
+        :param keywords:
+            The keywords to be indexed (IndexedKeyword or KeywordDoc).
+
+        :param get_name:
+            Called as `get_name(keyword)` to get the name of a keyword.
+        """
+        from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+        name_to_keywords: Dict[str, list] = {}
+        keywords_with_variables = []
+        for keyword in keywords:
+            normalized_name = normalize_robot_name(get_name(keyword))
+            lst = name_to_keywords.get(normalized_name)
+            if lst is None:
+                lst = name_to_keywords[normalized_name] = []
+            lst.append(keyword)
+            if "{" in normalized_name:
+                keywords_with_variables.append(keyword)
+
+        self.keywords = tuple(keywords)
+        self._name_to_keywords = dict(
+            (name, tuple(lst)) for name, lst in name_to_keywords.items()
+        )
+        self._keywords_with_variables = tuple(keywords_with_variables)
+
+    def iter_keywords(
+        self, normalized_names: Optional[Sequence[str]] = None
+    ) -> Iterator[Any]:
+        """
+        :param normalized_names:
+            If None all the keywords are provided, otherwise, only the keywords
+            which may match one of the given names (i.e.: the keywords with
+            one of those names and the keywords with embedded arguments).
+        """
+        if normalized_names is None:
+            yield from self.keywords
+            return
+
+        found = set()
+        for name in normalized_names:
+            for keyword in self._name_to_keywords.get(name, ()):
+                if id(keyword) not in found:
+                    found.add(id(keyword))
+                    yield keyword
+
+        for keyword in self._keywords_with_variables:
+            if id(keyword) not in found:
+                found.add(id(keyword))
+                yield keyword
+
+
+def _index_ast(ast) -> _KeywordsByName:
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    keywords = []
+    for keyword in ast_utils.iter_keywords(ast):
+        keyword_name = keyword.node.name
+        keyword_args = tuple(
+            KeywordArg(arg)
+            for arg in ast_utils.iter_keyword_arguments_as_str(keyword.node)
+        )
+        keywords.append(
+            IndexedKeyword(
+                keyword_name,
+                normalize_robot_name(keyword_name),
+                keyword.node,
+                keyword_args,
+            )
+        )
+    return _KeywordsByName(keywords, lambda keyword: keyword.keyword_name)
+
+
+class KeywordIndex(object):
+    """
+    Note: thread-safe (the same document may be indexed more than once if it's
+    requested concurrently, but that should be ok).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        # AST -> _KeywordsByName
+        # Note: the keywords only reference the keyword nodes (which don't
+        # reference their parent), so, the AST may still be collected.
+        self._ast_to_doc_keywords: "weakref.WeakKeyDictionary[Any, _KeywordsByName]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        # LibraryDoc -> _KeywordsByName
+        self._library_doc_to_keywords: "weakref.WeakKeyDictionary[Any, _KeywordsByName]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_doc_keywords(self, doc: IRobotDocument) -> _KeywordsByName:
+        """
+        :return:
+            The keywords defined in the given document (indexed by name).
+        """
+        ast = doc.get_ast()
+        with self._lock:
+            keywords_by_name = self._ast_to_doc_keywords.get(ast)
+        if keywords_by_name is not None:
+            return keywords_by_name
+
+        keywords_by_name = _index_ast(ast)
+        with self._lock:
+            self._ast_to_doc_keywords[ast] = keywords_by_name
+        return keywords_by_name
+
+    def get_library_keywords(self, library_doc) -> _KeywordsByName:
+        """
+        :param LibraryDoc library_doc:
+
+        :return:
+            The keywords (KeywordDoc) of the given library (indexed by name).
+        """
+        with self._lock:
+            keywords_by_name = self._library_doc_to_keywords.get(library_doc)
+            if keywords_by_name is None:
+                keywords_by_name = _KeywordsByName(
+                    library_doc.keywords, lambda keyword: keyword.name
+                )
+                self._library_doc_to_keywords[library_doc] = keywords_by_name
+        return keywords_by_name
@@ -0,0 +1,551 @@
+"""
+Compiled (binary) representation of a .libspec file.
+
+The compiled file is written next to the .libspec file and is memory-mapped
+to load a LibraryDoc from it, so, the keyword names/args can be gotten without
+parsing the xml.
+
+The mapping is kept alive while the LibraryDoc is alive: the docs and tags
+(which are the bulk of the contents) are read from it on demand and are backed
+by the OS page cache (so, their pages are shared by all the processes which
+use the same libspec). The keyword names/args are still copied to each process
+as those are needed for any completion anyway.
+
+Layout (all integers are little-endian):
+
+    header:     magic, format version, spec mtime, spec size, the number of
+                inits, keywords, tags and args and a digest of the contents
+                (everything after the header).
+    library:    the library record.
+    inits:      keyword records for the inits.
+    keywords:   keyword records for the keywords.
+    tags:       string references for the tags of inits/keywords.
+    args:       arg records for the args of inits/keywords.
+    strings:    utf-8 contents referenced by the records.
+
+Strings are referenced as (offset, length) in the strings section (an offset
+of 0xFFFFFFFF means None).
+
+For libraries whose docs are in the html format, the docs converted to
+markdown are also saved in the compiled file (so, the conversion is done only
+once when the libspec is generated and not when the docs are requested).
+
+Note: the compiled file is always replaced atomically (a new version is a
+new file), so, the contents mapped by a LibraryDoc never change.
+"""
+import hashlib
+import os
+import struct
+import threading
+from typing import Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+_MAGIC = b"RFLSPEC\x00"
+_FORMAT_VERSION = 3
+
+_NONE_OFFSET = 0xFFFFFFFF
+
+# magic, format version, spec mtime, spec size, inits, keywords, tags, args,
+# digest
+_HEADER = struct.Struct("<8sIdqIIII8s")
+
+# name, doc, version, specversion, type, scope, doc_format, source, md_doc,
+# named_args, lineno
+_LIBRARY = struct.Struct("<" + "II" * 9 + "?i")
+
+# name, doc, source, md_doc, tags start, tags count, args start, args count,
+# lineno
+_KEYWORD = struct.Struct("<" + "II" * 4 + "IIIIi")
+
+# tag
+_TAG = struct.Struct("<II")
+
+# original arg, arg name, arg type, default value
+_ARG = struct.Struct("<" + "II" * 4)
+
+
+def get_compiled_filename(spec_filename):
+    return spec_filename + ".bin"
+
+
+class _StringsWriter(object):
+    def __init__(self):
+        self._contents = []
+        self._size = 0
+        self._str_to_ref = {}
+
+    def add(self, s):
+        if s is None:
+            return (_NONE_OFFSET, 0)
+        ref = self._str_to_ref.get(s)
+        if ref is None:
+            encoded = s.encode("utf-8")
+            ref = self._str_to_ref[s] = (self._size, len(encoded))
+            self._contents.append(encoded)
+            self._size += len(encoded)
+        return ref
+
+    def getvalue(self):
+        return b"".join(self._contents)
+
+
+def write_compiled_libspec(library_doc, spec_mtime, spec_size, compiled_filename):
+    """
+    Writes the given library doc to the compiled filename.
+
+    The contents are written to a temporary file which is then renamed to the
+    final location (so, readers never see a partially written file).
+
+    :param LibraryDoc library_doc:
+    """
+    from robotframework_ls.impl.robot_specbuilder import markdown_doc
+
+    strings = _StringsWriter()
+    is_html = library_doc.doc_format.lower() == "html"
+
+    def add_md_doc(obj):
+        if not is_html:
+            return strings.add(None)
+        return strings.add(markdown_doc(obj))
+
+    tags = []
+    args = []
+
+    def create_keyword_records(keywords):
+        records = []
+        for keyword in keywords:
+            tags_start = len(tags)
+            for tag in keyword.tags:
+                tags.append(_TAG.pack(*strings.add(tag)))
+
+            args_start = len(args)
+            for arg in keyword.args:
+                args.append(
+                    _ARG.pack(
+                        *strings.add(arg.original_arg),
+                        *strings.add(arg.arg_name),
+                        *strings.add(arg.arg_type),
+                        *strings.add(arg.default_value),
+                    )
+                )
+
+            records.append(
+                _KEYWORD.pack(
+                    *strings.add(keyword.name),
+                    *strings.add(keyword.doc),
+                    *strings.add(keyword._source),
+                    *add_md_doc(keyword),
+                    tags_start,
+                    len(tags) - tags_start,
+                    args_start,
+                    len(args) - args_start,
+                    keyword.lineno,
+                )
+            )
+        return records
+
+    library = _LIBRARY.pack(
+        *strings.add(library_doc.name),
+        *strings.add(library_doc.doc),
+        *strings.add(library_doc.version),
+        *strings.add(library_doc.specversion),
+        *strings.add(library_doc.type),
+        *strings.add(library_doc.scope),
+        *strings.add(library_doc.doc_format),
+        *strings.add(library_doc._source),
+        *add_md_doc(library_doc),
+        bool(library_doc.named_args),
+        library_doc.lineno,
+    )
+    inits = create_keyword_records(library_doc.inits)
+    keywords = create_keyword_records(library_doc.keywords)
+
+    contents = b"".join(
+        (
+            library,
+            b"".join(inits),
+            b"".join(keywords),
+            b"".join(tags),
+            b"".join(args),
+            strings.getvalue(),
+        )
+    )
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT_VERSION,
+        spec_mtime,
+        spec_size,
+        len(inits),
+        len(keywords),
+        len(tags),
+        len(args),
+        hashlib.sha256(contents).digest()[:8],
+    )
+
+    temp_filename = "%s.%s_%s.tmp" % (
+        compiled_filename,
+        os.getpid(),
+        threading.get_ident(),
+    )
+    try:
+        with open(temp_filename, "wb") as stream:
+            stream.write(header)
+            stream.write(contents)
+        os.replace(temp_filename, compiled_filename)
+    except:
+        try:
+            os.remove(temp_filename)
+        except:
+            pass
+        raise
+
+
+class CompiledKeyword(object):
+    """
+    A view of a keyword record in a CompiledLibspec (the contents are only
+    read from the compiled file when requested).
+    """
+
+    __slots__ = ["_compiled", "_offset"]
+
+    def __init__(self, compiled, offset):
+        self._compiled = compiled
+        self._offset = offset
+
+    def _unpack(self):
+        return _KEYWORD.unpack_from(self._compiled._buffer, self._offset)
+
+    @property
+    def name(self) -> str:
+        record = self._unpack()
+        return self._compiled.get_string(record[0], record[1])
+
+    @property
+    def doc(self) -> str:
+        record = self._unpack()
+        return self._compiled.get_string(record[2], record[3])
+
+    @property
+    def source(self) -> Optional[str]:
+        record = self._unpack()
+        return self._compiled.get_string(record[4], record[5])
+
+    @property
+    def md_doc(self) -> Optional[str]:
+        record = self._unpack()
+        return self._compiled.get_string(record[6], record[7])
+
+    @property
+    def lineno(self) -> int:
+        return self._unpack()[12]
+
+    @property
+    def tags(self):
+        record = self._unpack()
+        return self._compiled.get_tags(record[8], record[9])
+
+    @property
+    def args(self):
+        record = self._unpack()
+        return self._compiled.get_args(record[10], record[11])
+
+
+class CompiledLibspec(object):
+    """
+    Memory-mapped view of a compiled libspec file.
+
+    To be used as:
+
+        compiled = CompiledLibspec.open(compiled_filename, spec_mtime, spec_size)
+        if compiled is not None:
+            try:
+                ...
+            finally:
+                compiled.close()
+    """
+
+    def __init__(self, compiled_filename, stream, buffer):
+        self.compiled_filename = compiled_filename
+        self._stream = stream
+        self._buffer = buffer
+
+        (
+            _magic,
+            _version,
+            self.spec_mtime,
+            self.spec_size,
+            self._inits_count,
+            self._keywords_count,
+            tags_count,
+            args_count,
+            self.digest,
+        ) = _HEADER.unpack_from(buffer, 0)
+
+        self._library_offset = _HEADER.size
+        self._inits_offset = self._library_offset + _LIBRARY.size
+        self._keywords_offset = self._inits_offset + self._inits_count * _KEYWORD.size
+        self._tags_offset = self._keywords_offset + self._keywords_count * _KEYWORD.size
+        self._args_offset = self._tags_offset + tags_count * _TAG.size
+        self._strings_offset = self._args_offset + args_count * _ARG.size
+
+        self._library = _LIBRARY.unpack_from(buffer, self._library_offset)
+
+    @classmethod
+    def open(cls, compiled_filename, spec_mtime, spec_size):
+        """
+        :return CompiledLibspec|NoneType:
+            None if the compiled file does not exist or if it's not valid for
+            the given spec mtime/size.
+        """
+        import mmap
+
+        try:
+            stream = open(compiled_filename, "rb")
+        except (IOError, OSError):
+            return None
+
+        try:
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            # i.e.: empty file or not able to map.
+            stream.close()
+            return None
+
+        try:
+            if len(buffer) < _HEADER.size:
+                raise ValueError("Compiled file too small.")
+            magic, version, mtime, size = _HEADER.unpack_from(buffer, 0)[:4]
+            if (
+                magic != _MAGIC
+                or version != _FORMAT_VERSION
+                or mtime != spec_mtime
+                or size != spec_size
+            ):
+                raise ValueError("Compiled file outdated.")
+            return cls(compiled_filename, stream, buffer)
+        except Exception:
+            buffer.close()
+            stream.close()
+            return None
+
+    def close(self):
+        """
+        Note: the mapping itself is not closed here (it's closed when it's no
+        longer referenced -- i.e.: a LibraryDoc loaded from it keeps it alive
+        to read the docs/tags on demand).
+        """
+        stream = self._stream
+        self._stream = None
+        self._buffer = None
+        if stream is not None:
+            stream.close()
+
+    def get_string(self, offset, length) -> Optional[str]:
+        if offset == _NONE_OFFSET:
+            return None
+        start = self._strings_offset + offset
+        return str(self._buffer[start : start + length], "utf-8")
+
+    def _get_library_string(self, i) -> Optional[str]:
+        return self.get_string(self._library[i * 2], self._library[i * 2 + 1])
+
+    @property
+    def name(self):
+        return self._get_library_string(0)
+
+    @property
+    def doc(self):
+        return self._get_library_string(1)
+
+    @property
+    def version(self):
+        return self._get_library_string(2)
+
+    @property
+    def specversion(self):
+        return self._get_library_string(3)
+
+    @property
+    def type(self):
+        return self._get_library_string(4)
+
+    @property
+    def scope(self):
+        return self._get_library_string(5)
+
+    @property
+    def doc_format(self):
+        return self._get_library_string(6)
+
+    @property
+    def source(self):
+        return self._get_library_string(7)
+
+    @property
+    def md_doc(self):
+        return self._get_library_string(8)
+
+    @property
+    def named_args(self):
+        return self._library[18]
+
+    @property
+    def lineno(self):
+        return self._library[19]
+
+    @property
+    def keyword_count(self):
+        return self._keywords_count
+
+    def iter_inits(self):
+        for i in range(self._inits_count):
+            yield CompiledKeyword(self, self._inits_offset + i * _KEYWORD.size)
+
+    def iter_keywords(self):
+        for i in range(self._keywords_count):
+            yield CompiledKeyword(self, self._keywords_offset + i * _KEYWORD.size)
+
+    def get_tags(self, start, count):
+        ret = []
+        for i in range(start, start + count):
+            record = _TAG.unpack_from(self._buffer, self._tags_offset + i * _TAG.size)
+            ret.append(self.get_string(record[0], record[1]))
+        return tuple(ret)
+
+    def get_args(self, start, count):
+        from robotframework_ls.impl.robot_specbuilder import KeywordArg
+
+        ret = []
+        for i in range(start, start + count):
+            record = _ARG.unpack_from(self._buffer, self._args_offset + i * _ARG.size)
+            ret.append(
+                KeywordArg(
+                    self.get_string(record[0], record[1]),
+                    self.get_string(record[2], record[3]),
+                    self.get_string(record[4], record[5]),
+                    self.get_string(record[6], record[7]),
+                )
+            )
+        return tuple(ret)
+
+
+class _LazyReader(object):
+    """
+    Reads the docs/tags from the memory-mapped compiled file on demand.
+
+    Note: the mapping is kept alive while the LibraryDoc is alive (the compiled
+    file is always replaced atomically, so, the mapped contents never change
+    even if the libspec is generated again by some other process).
+    """
+
+    __slots__ = ["_buffer", "_tags_offset", "_strings_offset"]
+
+    def __init__(self, compiled):
+        """
+        :param CompiledLibspec compiled:
+        """
+        self._buffer = compiled._buffer
+        self._tags_offset = compiled._tags_offset
+        self._strings_offset = compiled._strings_offset
+
+    def get_string(self, offset, length) -> Optional[str]:
+        if offset == _NONE_OFFSET:
+            return None
+        start = self._strings_offset + offset
+        return str(self._buffer[start : start + length], "utf-8")
+
+    def get_tags(self, start, count):
+        if not count:
+            return ()
+        get_string = self.get_string
+        return tuple(
+            get_string(
+                *_TAG.unpack_from(self._buffer, self._tags_offset + i * _TAG.size)
+            )
+            for i in range(start, start + count)
+        )
+
+
+class _LazyString(object):
+    __slots__ = ["_reader", "_offset", "_length"]
+
+    def __init__(self, reader, offset, length):
+        self._reader = reader
+        self._offset = offset
+        self._length = length
+
+    def __call__(self):
+        return self._reader.get_string(self._offset, self._length)
+
+
+class _LazyTags(object):
+    __slots__ = ["_reader", "_start", "_count"]
+
+    def __init__(self, reader, start, count):
+        self._reader = reader
+        self._start = start
+        self._count = count
+
+    def __call__(self):
+        return self._reader.get_tags(self._start, self._count)
+
+
+def load_library_doc(spec_filename, compiled):
+    """
+    Creates a LibraryDoc from the contents of a compiled libspec.
+
+    :param CompiledLibspec compiled:
+    :rtype: LibraryDoc
+    """
+    import weakref
+    from robotframework_ls.impl.robot_specbuilder import LibraryDoc
+    from robotframework_ls.impl.robot_specbuilder import KeywordDoc
+
+    reader = _LazyReader(compiled)
+    libdoc = LibraryDoc(
+        spec_filename,
+        name=compiled.name,
+        doc=_LazyString(reader, *compiled._library[2:4]),
+        md_doc=_LazyString(reader, *compiled._library[16:18]),
+        version=compiled.version,
+        specversion=compiled.specversion,
+        type=compiled.type,
+        scope=compiled.scope,
+        named_args=compiled.named_args,
+        doc_format=compiled.doc_format,
+        source=compiled.source,
+        lineno=compiled.lineno,
+    )
+    weak_libdoc = weakref.ref(libdoc)
+
+    # The keywords of a library usually share the same source (so, keep a
+    # single instance of it).
+    sources = {}
+
+    def create_keywords(compiled_keywords):
+        ret = []
+        for compiled_keyword in compiled_keywords:
+            record = compiled_keyword._unpack()
+            source = compiled.get_string(record[4], record[5])
+            source = sources.setdefault(source, source)
+            ret.append(
+                KeywordDoc(
+                    weak_libdoc,
+                    name=compiled.get_string(record[0], record[1]),
+                    args=compiled.get_args(record[10], record[11]),
+                    doc=_LazyString(reader, record[2], record[3]),
+                    md_doc=_LazyString(reader, record[6], record[7]),
+                    tags=_LazyTags(reader, record[8], record[9]),
+                    source=source,
+                    lineno=record[12],
+                )
+            )
+        return ret
+
+    libdoc.inits = create_keywords(compiled.iter_inits())
+    libdoc.keywords = create_keywords(compiled.iter_keywords())
+    return libdoc
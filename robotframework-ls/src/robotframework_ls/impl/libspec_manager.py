@@ -3,9 +3,68 @@ import sys
 from robotframework_ls.constants import NULL
 from robocorp_ls_core.robotframework_log import get_logger
 import threading
+from collections import OrderedDict
 
 log = get_logger(__name__)
 
+# When the generation of a libspec fails, it's only retried after this amount
+# of seconds (doubled on each new failure up to the max).
+LIBSPEC_FAILURE_INITIAL_BACKOFF = 5
+LIBSPEC_FAILURE_MAX_BACKOFF = 5 * 60
+
+# Default timeout (in seconds) for generating a libspec (may be changed with
+# the `robot.libdoc.timeout` setting).
+DEFAULT_LIBDOC_TIMEOUT = 60
+
+# Maximum number of libspecs generated at the same time.
+MAX_CONCURRENT_LIBSPEC_GENERATIONS = min(4, os.cpu_count() or 1)
+
+# Maximum number of libspecs kept for libraries imported with arguments (the
+# least recently used are removed when the limit is reached).
+MAX_LIBSPECS_WITH_ARGS = 50
+
+# Folders which are never scanned for .libspec files (version control,
+# virtual environments, caches and build outputs). The patterns are matched
+# against the folder name and its path relative to the scanned folder (more
+# patterns may be added with the `robot.libdoc.scanExcludes` setting).
+DEFAULT_LIBSPEC_SCAN_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".bzr",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".eggs",
+    "*.egg-info",
+    "build",
+    "dist",
+)
+
+# Maximum number of folders scanned for .libspec files at the same time.
+MAX_CONCURRENT_LIBSPEC_SCANS = min(8, (os.cpu_count() or 1) * 2)
+
+# The listing of a folder is only reused if its mtime is older than this
+# (in seconds) when it's scanned (a folder changed in the same mtime tick
+# in which it was scanned would have the same mtime).
+_RACY_MTIME_INTERVAL = 2
+
+# Environment variable which may be set with an id for the environment of the
+# interpreter (i.e.: a hash of the conda.yaml used to create it). When set,
+# the internal libspec folder is keyed by it instead of by the interpreter
+# executable (so, different interpreters created from the same environment
+# specification share the same libspecs).
+ENV_LIBSPEC_ENVIRONMENT_ID = "ROBOTFRAMEWORK_LS_LIBSPEC_ENVIRONMENT_ID"
+
+# Environment variable with additional folders (separated by os.pathsep) with
+# prebuilt libspecs for the builtin libraries (in `<folder>/<robot version>`).
+ENV_PREBUILT_LIBSPECS_DIR = "ROBOTFRAMEWORK_LS_PREBUILT_LIBSPECS_DIR"
+
 
 def _normfile(filename):
     return os.path.abspath(os.path.normpath(os.path.normcase(filename)))
@@ -25,42 +84,212 @@ def _get_additional_info_filename(spec_filename):
     return additional_info_filename
 
 
-def _load_library_doc_and_mtime(spec_filename, obtain_mutex=True):
+# Prefix of the temporary libspec files (those are written in the same folder
+# of the final libspec so that the relative sources in it are still valid
+# after it's renamed).
+_TMP_LIBSPEC_PREFIX = ".tmp_"
+
+
+def _get_libspec_stat_key(spec_filename):
     """
-    :param obtain_mutex:
-        Should be False if this is part of a bigger operation that already
-        has the spec_filename mutex.
+    :return tuple(int, int)|None:
+        The (mtime, size) of the given libspec (or None if it doesn't exist).
     """
-    from robotframework_ls.impl import robot_specbuilder
-    from robocorp_ls_core.system_mutex import timed_acquire_mutex
-
-    if obtain_mutex:
-        ctx = timed_acquire_mutex(_get_libspec_mutex_name(spec_filename))
-    else:
-        ctx = NULL
-    with ctx:
-        # We must load it with a mutex to avoid conflicts between generating/reading.
-        builder = robot_specbuilder.SpecDocBuilder()
+    try:
+        stat = os.stat(spec_filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_normalized_libname(libname):
+    """
+    :return str:
+        The name used to find the libspec of a library (i.e.: the library name
+        in lowercase and without the path/extension if it's a path to a
+        library file).
+    """
+    libname_lower = libname.lower()
+    if libname_lower.endswith((".py", ".class", ".java")):
+        libname_lower = os.path.splitext(libname_lower)[0]
+
+    if "/" in libname_lower or "\\" in libname_lower:
+        libname_lower = os.path.basename(libname_lower)
+    return libname_lower
+
+
+def _is_tmp_libspec_filename(spec_filename):
+    return os.path.basename(spec_filename).startswith(_TMP_LIBSPEC_PREFIX)
+
+
+def _get_tmp_libspec_filename(spec_filename):
+    dirname, basename = os.path.split(spec_filename)
+    return os.path.join(
+        dirname,
+        "%s%s_%s_%s"
+        % (_TMP_LIBSPEC_PREFIX, os.getpid(), threading.get_ident(), basename),
+    )
+
+
+def _publish_libspec(tmp_spec_filename, spec_filename, is_builtin, creation_args=None):
+    """
+    Atomically moves the given (temporary) libspec to its final place along
+    with its additional info and compiled version.
+
+    :param tuple(str, str, str) creation_args:
+        The (libname, additional_path, cwd) used to create the libspec (saved
+        in the additional info so that it can be regenerated when its sources
+        change even if it was created by some other session).
+
+    Note: the libspec is moved last, so, a reader that sees the new libspec
+    also sees its related files (thus, readers don't need a mutex -- only the
+    writers of the same libspec must coordinate among themselves).
+    """
+    import json
+    from robotframework_ls.impl import libspec_compiled
+
+    # Note: the compiled version is created here (it's keyed by the mtime and
+    # size of the libspec, which are kept when the file is renamed).
+    additional_info = _create_additional_info(tmp_spec_filename, is_builtin)
+    if creation_args is not None:
+        additional_info[_CREATION_ARGS] = list(creation_args)
+
+    tmp_compiled_filename = libspec_compiled.get_compiled_filename(tmp_spec_filename)
+    if os.path.exists(tmp_compiled_filename):
+        compiled_filename = libspec_compiled.get_compiled_filename(spec_filename)
         try:
-            mtime = os.path.getmtime(spec_filename)
-            libdoc = builder.build(spec_filename)
-            return libdoc, mtime
+            os.replace(tmp_compiled_filename, compiled_filename)
+        except OSError:
+            # i.e.: on Windows the compiled file can't be replaced while some
+            # loaded library doc still maps it (it's not valid for the new
+            # libspec, so, the libspec is parsed until it can be compiled).
+            log.info("Unable to replace compiled libspec: %s", compiled_filename)
+            try:
+                os.remove(tmp_compiled_filename)
+            except OSError:
+                pass
+
+    tmp_additional_info_filename = _get_additional_info_filename(tmp_spec_filename)
+    with open(tmp_additional_info_filename, "w") as stream:
+        json.dump(additional_info, stream, indent=2, sort_keys=True)
+    os.replace(
+        tmp_additional_info_filename, _get_additional_info_filename(spec_filename)
+    )
+
+    os.replace(tmp_spec_filename, spec_filename)
+
+
+def _remove_libspec(spec_filename):
+    """
+    Removes the given libspec along with its additional info and compiled
+    version.
+    """
+    from robotframework_ls.impl import libspec_compiled
+
+    for filename in (
+        spec_filename,
+        _get_additional_info_filename(spec_filename),
+        libspec_compiled.get_compiled_filename(spec_filename),
+    ):
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
         except Exception:
-            log.exception("Error when loading spec info from: %s", spec_filename)
-            return None
+            log.exception("Unable to remove: %s", filename)
+
+
+def _load_library_doc_and_mtime(spec_filename, use_compiled=False):
+    """
+    Note: libspecs are always atomically published (see: _publish_libspec),
+    so, no mutex is needed to read them.
+
+    :param use_compiled:
+        If True the library doc is loaded from the compiled libspec (which is
+        created if still not available).
+    """
+    from robotframework_ls.impl import robot_specbuilder
+
+    try:
+        stat = os.stat(spec_filename)
+        if use_compiled:
+            libdoc = _load_library_doc_compiled(spec_filename, stat)
+        else:
+            builder = robot_specbuilder.SpecDocBuilder()
+            libdoc = builder.build(spec_filename)
+        return libdoc, stat.st_mtime
+    except Exception:
+        log.exception("Error when loading spec info from: %s", spec_filename)
+        return None
+
+
+def _load_library_doc_compiled(spec_filename, stat):
+    """
+    Loads the library doc from the compiled libspec (if it's still not
+    available or if it's outdated the libspec is parsed and compiled).
+    """
+    from robotframework_ls.impl import robot_specbuilder
+    from robotframework_ls.impl import libspec_compiled
+
+    compiled_filename = libspec_compiled.get_compiled_filename(spec_filename)
+    compiled = libspec_compiled.CompiledLibspec.open(
+        compiled_filename, stat.st_mtime, stat.st_size
+    )
+    if compiled is not None:
+        try:
+            return libspec_compiled.load_library_doc(spec_filename, compiled)
+        finally:
+            compiled.close()
+
+    builder = robot_specbuilder.SpecDocBuilder()
+    libdoc = builder.build(spec_filename)
+    try:
+        libspec_compiled.write_compiled_libspec(
+            libdoc, stat.st_mtime, stat.st_size, compiled_filename
+        )
+    except Exception:
+        log.exception("Error writing compiled libspec: %s", compiled_filename)
+    return libdoc
+
+
+def _load_library_doc_header(spec_filename):
+    """
+    :return LibraryDocHeader|NoneType:
+        The header of the library (without its keywords) or None if it couldn't
+        be read.
+    """
+    from robotframework_ls.impl import robot_specbuilder
+
+    builder = robot_specbuilder.SpecDocBuilder()
+    try:
+        return builder.build_header(spec_filename)
+    except Exception:
+        log.exception("Error when loading spec header from: %s", spec_filename)
+        return None
 
 
 def _load_lib_info(canonical_spec_filename, can_regenerate):
-    libdoc_and_mtime = _load_library_doc_and_mtime(canonical_spec_filename)
+    import time
+
+    # Note: only the libspec files which we generate (and thus are in folders
+    # we manage) have a compiled version (we don't want to write files in the
+    # user folders).
+    initial_time = time.time()
+    libdoc_and_mtime = _load_library_doc_and_mtime(
+        canonical_spec_filename, use_compiled=can_regenerate
+    )
     if libdoc_and_mtime is None:
         return None
     libdoc, mtime = libdoc_and_mtime
-    return _LibInfo(libdoc, mtime, canonical_spec_filename, can_regenerate)
+    lib_info = _LibInfo(libdoc, mtime, canonical_spec_filename, can_regenerate)
+    lib_info.load_time = time.time() - initial_time
+    return lib_info
 
 
 _IS_BUILTIN = "is_builtin"
 _SOURCE_TO_MTIME = "source_to_mtime"
 _UNABLE_TO_LOAD = "unable_to_load"
+_CREATION_ARGS = "creation_args"
 
 
 def _create_updated_source_to_mtime(library_doc):
@@ -89,17 +318,20 @@ def _create_updated_source_to_mtime(library_doc):
     return source_to_mtime
 
 
-def _create_additional_info(spec_filename, is_builtin, obtain_mutex=True):
+def _create_additional_info(spec_filename, is_builtin):
     try:
         additional_info = {_IS_BUILTIN: is_builtin}
+
+        # Note: this also creates the compiled libspec (with the docs already
+        # converted to markdown), which is also wanted for the builtins.
+        library_doc_and_mtime = _load_library_doc_and_mtime(
+            spec_filename, use_compiled=True
+        )
         if is_builtin:
             # For builtins we don't have to check the mtime
             # (on a new version we update the folder).
             return additional_info
 
-        library_doc_and_mtime = _load_library_doc_and_mtime(
-            spec_filename, obtain_mutex=obtain_mutex
-        )
         if library_doc_and_mtime is None:
             additional_info[_UNABLE_TO_LOAD] = True
             return additional_info
@@ -133,19 +365,92 @@ def _load_spec_filename_additional_info(spec_filename):
         return {}
 
 
-def _dump_spec_filename_additional_info(spec_filename, is_builtin, obtain_mutex=True):
+class _LibrarySourcesTracker(object):
     """
-    Creates a filename with additional information not directly available in the
-    spec.
+    Tracks changes in the sources of the libraries whose libspec we generate
+    so that the related _LibInfo is invalidated when a source changes (and
+    thus the sources don't need to be checked on each request).
     """
-    import json
 
-    source_to_mtime = _create_additional_info(
-        spec_filename, is_builtin, obtain_mutex=obtain_mutex
-    )
-    additional_info_filename = _get_additional_info_filename(spec_filename)
-    with open(additional_info_filename, "w") as stream:
-        json.dump(source_to_mtime, stream, indent=2, sort_keys=True)
+    def __init__(self, observer, notifier, on_lib_info_invalidated=None):
+        """
+        :param callable on_lib_info_invalidated:
+            If given, it's called as `on_lib_info_invalidated(lib_info)` after
+            a _LibInfo is invalidated due to a change in its sources.
+        """
+        self._observer = observer
+        self._notifier = notifier
+        self._on_lib_info_invalidated = on_lib_info_invalidated
+        self._lock = threading.Lock()
+        self._folder_to_watch = {}
+        # normalized source -> WeakSet(_LibInfo)
+        self._source_to_lib_infos = {}
+
+    def track(self, lib_info, sources):
+        """
+        :param _LibInfo lib_info:
+        :param list(str) sources:
+            The (normalized) sources of the library.
+
+        :return bool:
+            Whether all the sources are being tracked (if False, the sources
+            must still be checked on each request).
+        """
+        import weakref
+        from robocorp_ls_core.watchdog_wrapper import PathInfo
+
+        with self._lock:
+            for source in sources:
+                if not source.endswith(".py"):
+                    return False
+
+                folder = os.path.dirname(source)
+                if folder not in self._folder_to_watch:
+                    try:
+                        watch = self._observer.notify_on_extensions_change(
+                            [PathInfo(folder, recursive=False)],
+                            ["py"],
+                            self._notifier.on_change,
+                            (self._on_source_changed,),
+                        )
+                    except Exception:
+                        log.exception("Unable to track changes in: %s", folder)
+                        return False
+                    self._folder_to_watch[folder] = watch
+
+            for source in sources:
+                lib_infos = self._source_to_lib_infos.get(source)
+                if lib_infos is None:
+                    lib_infos = self._source_to_lib_infos[source] = weakref.WeakSet()
+                lib_infos.add(lib_info)
+        return True
+
+    def _on_source_changed(self, source):
+        with self._lock:
+            lib_infos = self._source_to_lib_infos.pop(_normfile(source), None)
+            lib_infos = list(lib_infos) if lib_infos else []
+
+        for lib_info in lib_infos:
+            log.info(
+                "Library %s is invalid (source changed: %s).",
+                lib_info.library_doc.name,
+                source,
+            )
+            lib_info.invalidate()
+            if self._on_lib_info_invalidated is not None:
+                try:
+                    self._on_lib_info_invalidated(lib_info)
+                except Exception:
+                    log.exception("Error handling invalidated library.")
+
+    def dispose(self):
+        with self._lock:
+            watches = list(self._folder_to_watch.values())
+            self._folder_to_watch.clear()
+            self._source_to_lib_infos.clear()
+
+        for watch in watches:
+            watch.stop_tracking()
 
 
 class _LibInfo(object):
@@ -156,6 +461,9 @@ class _LibInfo(object):
         "_additional_info",
         "_invalid",
         "_can_regenerate",
+        "load_time",
+        "validation_time",
+        "__weakref__",
     ]
 
     def __init__(self, library_doc, mtime, spec_filename, can_regenerate):
@@ -180,8 +488,24 @@ class _LibInfo(object):
         self._additional_info = None
         self._invalid = False
 
-    def verify_sources_sync(self):
+        # Time (in seconds) to load the library doc and to check whether its
+        # sources changed.
+        self.load_time = 0.0
+        self.validation_time = 0.0
+
+    @property
+    def canonical_spec_filename(self):
+        return self._canonical_spec_filename
+
+    def invalidate(self):
+        self._invalid = True
+
+    def verify_sources_sync(self, sources_tracker=None):
         """
+        :param _LibrarySourcesTracker sources_tracker:
+            If given, the sources are checked only once and the tracker is
+            responsible for invalidating this info when a source changes.
+
         :return bool:
             True if everything is ok and this library info can be used. Otherwise,
             the spec file and the _LibInfo must be recreated. 
@@ -194,40 +518,141 @@ class _LibInfo(object):
         if self._invalid:  # Once invalid, always invalid.
             return False
 
-        additional_info = self._additional_info
-        if additional_info is None:
-            additional_info = _load_spec_filename_additional_info(
-                self._canonical_spec_filename
-            )
-            if additional_info.get(_IS_BUILTIN, False):
-                return True
+        if self._additional_info is not None:
+            # Already validated (and changes in the sources are tracked).
+            return True
 
-            source_to_mtime = additional_info.get(_SOURCE_TO_MTIME)
-            if source_to_mtime is None:
-                # Nothing to validate...
-                return True
+        import time
 
-            updated_source_to_mtime = _create_updated_source_to_mtime(self.library_doc)
-            if source_to_mtime != updated_source_to_mtime:
-                log.info(
-                    "Library %s is invalid. Current source to mtime:\n%s\nChanged from:\n%s"
-                    % (self.library_doc.name, source_to_mtime, updated_source_to_mtime)
-                )
-                self._invalid = True
-                return False
+        initial_time = time.time()
+        try:
+            return self._verify_sources_sync(sources_tracker)
+        finally:
+            self.validation_time += time.time() - initial_time
+
+    def _verify_sources_sync(self, sources_tracker):
+        additional_info = _load_spec_filename_additional_info(
+            self._canonical_spec_filename
+        )
+        if additional_info.get(_IS_BUILTIN, False):
+            self._additional_info = additional_info
+            return True
+
+        source_to_mtime = additional_info.get(_SOURCE_TO_MTIME)
+        if source_to_mtime is None:
+            # Nothing to validate...
+            self._additional_info = additional_info
+            return True
+
+        # Note: start tracking before checking the sources so that a change
+        # done right after the check isn't lost.
+        tracked = sources_tracker is not None and sources_tracker.track(
+            self, list(source_to_mtime.keys())
+        )
+
+        updated_source_to_mtime = _create_updated_source_to_mtime(self.library_doc)
+        if source_to_mtime != updated_source_to_mtime:
+            log.info(
+                "Library %s is invalid. Current source to mtime:\n%s\nChanged from:\n%s"
+                % (self.library_doc.name, source_to_mtime, updated_source_to_mtime)
+            )
+            self._invalid = True
+            return False
 
+        if tracked:
+            self._additional_info = additional_info
         return True
 
 
+def _rebase_libspec_sources(contents, robot_package_dir):
+    """
+    Changes the `source` of the entries in the given libspec contents which
+    point to some file in the `robot` package so that those point to the
+    given `robot` package dir.
+    """
+    import re
+    from xml.sax.saxutils import escape
+
+    def _rebase(match):
+        source = match.group(1).replace("\\", "/")
+        i = source.rfind("/robot/")
+        if i == -1:
+            return match.group(0)
+        parts = source[i + len("/robot/") :].split("/")
+        new_source = os.path.join(robot_package_dir, *parts)
+        return 'source="%s"' % (escape(new_source, {'"': "&quot;"}),)
+
+    return re.sub(r'source="([^"]*)"', _rebase, contents)
+
+
+def _get_approximate_memory_size(obj):
+    """
+    :return int:
+        The approximate size (in bytes) of the given object and of the objects
+        it references (objects referenced more than once are only counted once
+        and contents which weren't lazily loaded yet aren't counted).
+    """
+    import types
+    import weakref
+
+    skip_types = (type, types.ModuleType, weakref.ref)
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, skip_types) or callable(obj):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+            continue
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            obj_dict = getattr(obj, "__dict__", None)
+            if obj_dict is not None:
+                stack.extend(obj_dict.values())
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot not in ("__weakref__", "__dict__"):
+                        try:
+                            stack.append(getattr(obj, slot))
+                        except AttributeError:
+                            pass
+    return size
+
+
 def _norm_filename(path):
     return os.path.normcase(os.path.realpath(os.path.abspath(path)))
 
 
 class _FolderInfo(object):
-    def __init__(self, folder_path, recursive):
+    def __init__(
+        self, folder_path, recursive, exclude_patterns=DEFAULT_LIBSPEC_SCAN_EXCLUDES
+    ):
         self.folder_path = folder_path
         self.recursive = recursive
         self.libspec_canonical_filename_to_info = {}
+        self._exclude_patterns = tuple(exclude_patterns)
+
+        # Result of the last scan (reused for the folders whose mtime didn't
+        # change).
+        # folder path -> (mtime_ns, racy, tuple(libspec filenames), tuple(subfolders))
+        self._folder_to_scan_result = {}
+
+        # Index used to get the libspec files for a given library name without
+        # having to load all the libspec files.
+        # canonical filename -> (mtime, LibraryDocHeader|None)
+        self._libspec_canonical_filename_to_header = {}
+        # normalized library name -> tuple(canonical filename)
+        self._libspec_name_to_canonical_filenames = {}
+
         self._watch = NULL
         self._lock = threading.Lock()
 
@@ -258,27 +683,90 @@ class _FolderInfo(object):
                     (self._on_change_spec,),
                 )
 
+    def set_exclude_patterns(self, exclude_patterns):
+        """
+        :return bool:
+            Whether the patterns changed (in which case it must be
+            synchronized again).
+        """
+        exclude_patterns = tuple(exclude_patterns)
+        with self._lock:
+            if exclude_patterns == self._exclude_patterns:
+                return False
+            self._exclude_patterns = exclude_patterns
+            self._folder_to_scan_result = {}
+            return True
+
+    def _is_excluded(self, name, relative_path):
+        import fnmatch
+
+        for pattern in self._exclude_patterns:
+            if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(
+                relative_path, pattern
+            ):
+                return True
+        return False
+
+    def _is_excluded_spec_file(self, spec_file):
+        try:
+            relative_path = os.path.relpath(
+                os.path.dirname(spec_file), self.folder_path
+            )
+        except ValueError:
+            # i.e.: different drives on windows.
+            return False
+
+        if relative_path == os.curdir or relative_path.startswith(os.pardir):
+            return False
+
+        parts = relative_path.replace(os.sep, "/").split("/")
+        for i, name in enumerate(parts):
+            if self._is_excluded(name, "/".join(parts[: i + 1])):
+                return True
+        return False
+
     def _on_change_spec(self, spec_file):
+        """
+        :return bool:
+            Whether the given spec file is tracked by this folder.
+        """
+        if _is_tmp_libspec_filename(spec_file):
+            return False
+
+        if self.recursive and self._is_excluded_spec_file(spec_file):
+            return False
+
         with self._lock:
             spec_file_key = _norm_filename(spec_file)
             # Just add/remove that specific spec file from the tracked list.
             libspec_canonical_filename_to_info = (
                 self.libspec_canonical_filename_to_info.copy()
             )
-            if os.path.exists(spec_file):
-                libspec_canonical_filename_to_info[spec_file_key] = None
-            else:
+            try:
+                curr_mtime = os.path.getmtime(spec_file)
+            except OSError:
                 libspec_canonical_filename_to_info.pop(spec_file_key, None)
-
+            else:
+                info = libspec_canonical_filename_to_info.get(spec_file_key)
+                if info is None or info.mtime != curr_mtime:
+                    # Set to None to reload it (note: the info is kept if it
+                    # was already loaded from this same file -- i.e.: when
+                    # the change is from a libspec we just published).
+                    libspec_canonical_filename_to_info[spec_file_key] = None
+
+            self._update_name_index(libspec_canonical_filename_to_info)
             self.libspec_canonical_filename_to_info = libspec_canonical_filename_to_info
+        return True
 
     def synchronize(self):
         with self._lock:
             try:
-                self.libspec_canonical_filename_to_info = self._collect_libspec_info(
-                    [self.folder_path],
-                    self.libspec_canonical_filename_to_info,
-                    recursive=self.recursive,
+                libspec_canonical_filename_to_info = self._collect_libspec_info(
+                    self.libspec_canonical_filename_to_info
+                )
+                self._update_name_index(libspec_canonical_filename_to_info)
+                self.libspec_canonical_filename_to_info = (
+                    libspec_canonical_filename_to_info
                 )
             except Exception:
                 log.exception("Error when synchronizing: %s", self.folder_path)
@@ -289,22 +777,194 @@ class _FolderInfo(object):
             self._watch = NULL
             watch.stop_tracking()
             self.libspec_canonical_filename_to_info = {}
+            self._libspec_canonical_filename_to_header = {}
+            self._libspec_name_to_canonical_filenames = {}
+            self._folder_to_scan_result = {}
 
-    def _collect_libspec_info(self, folders, old_libspec_filename_to_info, recursive):
-        seen_libspec_files = set()
-        if recursive:
-            for folder in folders:
-                if os.path.isdir(folder):
-                    for root, _dirs, files in os.walk(folder):
-                        for filename in files:
-                            if filename.lower().endswith(".libspec"):
-                                seen_libspec_files.add(os.path.join(root, filename))
-        else:
-            for folder in folders:
-                if os.path.isdir(folder):
-                    for filename in os.listdir(folder):
-                        if filename.lower().endswith(".libspec"):
-                            seen_libspec_files.add(os.path.join(folder, filename))
+    def _update_name_index(self, libspec_canonical_filename_to_info):
+        """
+        Updates the library name index for the given libspec files (only the
+        files which are new or whose mtime changed have their header re-read).
+
+        Note: must be called with the lock held.
+        """
+        old_filename_to_header = self._libspec_canonical_filename_to_header
+        filename_to_header = {}
+        name_to_filenames = {}
+
+        for filename in sorted(libspec_canonical_filename_to_info):
+            try:
+                mtime = os.path.getmtime(filename)
+            except:
+                # It was deleted in the meanwhile...
+                continue
+
+            mtime_and_header = old_filename_to_header.get(filename)
+            if mtime_and_header is None or mtime_and_header[0] != mtime:
+                mtime_and_header = (mtime, _load_library_doc_header(filename))
+
+            filename_to_header[filename] = mtime_and_header
+            header = mtime_and_header[1]
+
+            # Note: we also check if there are keywords available... in
+            # some cases we may create libraries for namespace packages
+            # (i.e.: empty folders) which don't really have anything -- in
+            # this case, this isn't a valid library.
+            if header is not None and header.name and header.keyword_count:
+                name_to_filenames.setdefault(header.name.lower(), []).append(filename)
+
+        self._libspec_canonical_filename_to_header = filename_to_header
+        self._libspec_name_to_canonical_filenames = dict(
+            (name, tuple(filenames)) for name, filenames in name_to_filenames.items()
+        )
+
+    def iter_library_doc_headers(self):
+        """
+        Provides the headers of the libraries which have keywords.
+
+        :rtype: generator(LibraryDocHeader)
+        """
+        for filenames in self._libspec_name_to_canonical_filenames.values():
+            for filename in filenames:
+                mtime_and_header = self._libspec_canonical_filename_to_header.get(
+                    filename
+                )
+                if mtime_and_header is not None:
+                    yield mtime_and_header[1]
+
+    def iter_lib_info_for_name(self, normalized_name, can_regenerate):
+        """
+        :param str normalized_name:
+            The name of the library (lower-case).
+
+        :rtype: generator(_LibInfo)
+        """
+        canonical_filename_to_info = self.libspec_canonical_filename_to_info
+        for canonical_spec_filename in self._libspec_name_to_canonical_filenames.get(
+            normalized_name, ()
+        ):
+            info = self._get_lib_info(
+                canonical_filename_to_info, canonical_spec_filename, can_regenerate
+            )
+            if info is not None:
+                yield info
+
+    def _get_lib_info(
+        self, canonical_filename_to_info, canonical_spec_filename, can_regenerate
+    ):
+        try:
+            info = canonical_filename_to_info[canonical_spec_filename]
+        except KeyError:
+            # Removed in the meanwhile.
+            return None
+
+        if info is None:
+            info = canonical_filename_to_info[canonical_spec_filename] = _load_lib_info(
+                canonical_spec_filename, can_regenerate
+            )
+
+        # Note: the header already checked that there are keywords, but the
+        # file may have changed in the meanwhile, so, check it again.
+        if (
+            info is not None
+            and info.library_doc is not None
+            and info.library_doc.keywords
+        ):
+            return info
+        return None
+
+    def _scan_folder(self, folder, relative_path, old_folder_to_scan_result, now):
+        """
+        :return tuple(int, bool, tuple(str), tuple(str)):
+            The mtime_ns of the folder, whether it may still change without
+            changing the mtime, the .libspec files and the subfolders to be
+            scanned.
+        """
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return (-1, True, (), ())
+
+        scan_result = old_folder_to_scan_result.get(folder)
+        if (
+            scan_result is not None
+            and scan_result[0] == mtime_ns
+            and not scan_result[1]
+        ):
+            return scan_result
+
+        racy = (now - (mtime_ns / 1e9)) < _RACY_MTIME_INTERVAL
+        libspec_files = []
+        subfolders = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if entry.is_dir():
+                            if self.recursive and not entry.is_symlink():
+                                subfolders.append(name)
+                        elif name.lower().endswith(
+                            ".libspec"
+                        ) and not _is_tmp_libspec_filename(name):
+                            libspec_files.append(entry.path)
+                        elif name == "pyvenv.cfg" and relative_path:
+                            # A virtual environment (which doesn't have a
+                            # well-known name).
+                            return (mtime_ns, racy, (), ())
+                    except OSError:
+                        continue
+        except OSError:
+            return (-1, True, (), ())
+
+        pruned_subfolders = []
+        for name in subfolders:
+            subfolder_relative_path = (
+                relative_path + "/" + name if relative_path else name
+            )
+            if not self._is_excluded(name, subfolder_relative_path):
+                pruned_subfolders.append(name)
+
+        return (mtime_ns, racy, tuple(libspec_files), tuple(pruned_subfolders))
+
+    def _iter_libspec_files(self):
+        """
+        Provides the .libspec files in this folder (skipping the excluded
+        folders and reusing the listing of the folders which didn't change
+        since the last scan).
+
+        Note: must be called with the lock held.
+        """
+        import time
+
+        old_folder_to_scan_result = self._folder_to_scan_result
+        new_folder_to_scan_result = {}
+        now = time.time()
+
+        if os.path.isdir(self.folder_path):
+            # list(tuple(folder, relative_path))
+            folders = [(self.folder_path, "")]
+            while folders:
+                folder, relative_path = folders.pop()
+                scan_result = self._scan_folder(
+                    folder, relative_path, old_folder_to_scan_result, now
+                )
+                new_folder_to_scan_result[folder] = scan_result
+                for filename in scan_result[2]:
+                    yield filename
+
+                for name in scan_result[3]:
+                    folders.append(
+                        (
+                            os.path.join(folder, name),
+                            relative_path + "/" + name if relative_path else name,
+                        )
+                    )
+
+        self._folder_to_scan_result = new_folder_to_scan_result
+
+    def _collect_libspec_info(self, old_libspec_filename_to_info):
+        seen_libspec_files = set(self._iter_libspec_files())
 
         new_libspec_filename_to_info = {}
 
@@ -327,6 +987,39 @@ class _FolderInfo(object):
         return new_libspec_filename_to_info
 
 
+class _LibspecFailure(object):
+    """
+    Information on a libspec which couldn't be generated.
+    """
+
+    __slots__ = [
+        "output",
+        "failures_count",
+        "next_retry_time",
+        "fingerprint",
+        "timed_out",
+    ]
+
+    def __init__(self, output, failures_count, next_retry_time, fingerprint, timed_out):
+        self.output = output
+        self.failures_count = failures_count
+        self.next_retry_time = next_retry_time
+        self.fingerprint = fingerprint
+        self.timed_out = timed_out
+
+    def get_message(self):
+        """
+        :return str:
+            The first line of the output (which should have the reason why
+            libdoc failed).
+        """
+        for line in self.output.splitlines():
+            line = line.strip()
+            if line:
+                return line
+        return "Unknown error (no output available)."
+
+
 class LibspecManager(object):
     """
     Used to manage the libspec files.
@@ -371,31 +1064,65 @@ class LibspecManager(object):
 
         home = robot_config.get_robotframework_ls_home()
 
-        pyexe = sys.executable
-        if not isinstance(pyexe, bytes):
-            pyexe = pyexe.encode("utf-8")
+        environment_id = os.environ.get(ENV_LIBSPEC_ENVIRONMENT_ID)
+        if environment_id:
+            key = ("environment:" + environment_id).encode("utf-8")
+        else:
+            key = sys.executable
+            if not isinstance(key, bytes):
+                key = key.encode("utf-8")
 
         import hashlib
 
-        digest = hashlib.sha256(pyexe).hexdigest()[:8]
+        digest = hashlib.sha256(key).hexdigest()[:8]
 
         v = cls.get_robot_version()
 
         # Note: _v1: information on the mtime of the libspec sources now available.
         return os.path.join(home, "specs", "%s_%s" % (digest, v))
 
+    @classmethod
+    def get_libspec_store_dir(cls):
+        """
+        :return str:
+            The folder with the libspecs which may be shared among interpreters
+            (see: libspec_store).
+        """
+        from robotframework_ls import robot_config
+
+        home = robot_config.get_robotframework_ls_home()
+        return os.path.join(home, "specs", "store")
+
     @classmethod
     def get_internal_builtins_libspec_dir(cls, internal_libspec_dir=None):
         return os.path.join(
             internal_libspec_dir or cls.get_internal_libspec_dir(), "builtins"
         )
 
-    def __init__(self, builtin_libspec_dir=None, user_libspec_dir=None):
+    @classmethod
+    def get_prebuilt_libspec_dirs(cls):
+        """
+        :return list(str):
+            The folders which may have prebuilt libspecs for the builtin
+            libraries (the actual libspecs are in a `<robot version>`
+            subfolder).
+        """
+        dirs = []
+        env_dirs = os.environ.get(ENV_PREBUILT_LIBSPECS_DIR)
+        if env_dirs:
+            dirs.extend(d for d in env_dirs.split(os.pathsep) if d)
+        dirs.append(os.path.join(os.path.dirname(__file__), "prebuilt_libspecs"))
+        return dirs
+
+    def __init__(
+        self, builtin_libspec_dir=None, user_libspec_dir=None, libspec_store_dir=None
+    ):
         """
         :param __internal_libspec_dir__:
             Only to be used in tests (to regenerate the builtins)!
         """
         from robocorp_ls_core import watchdog_wrapper
+        from robotframework_ls.impl.libspec_store import LibspecStore
 
         self._main_thread = threading.current_thread()
 
@@ -405,15 +1132,28 @@ class LibspecManager(object):
             self._on_spec_file_changed, timeout=0.5
         )
 
+        self._library_sources_tracker = _LibrarySourcesTracker(
+            self._observer, self._spec_changes_notifier, self._on_lib_info_invalidated,
+        )
+
         self._libspec_dir = self.get_internal_libspec_dir()
 
         self._user_libspec_dir = user_libspec_dir or os.path.join(
             self._libspec_dir, "user"
         )
+        # Note: the libspecs for libraries imported with arguments aren't
+        # found by name (so, those are in a folder which isn't tracked).
+        self._user_libspec_with_args_dir = os.path.join(
+            self._user_libspec_dir, "with_args"
+        )
         self._builtins_libspec_dir = (
             builtin_libspec_dir
             or self.get_internal_builtins_libspec_dir(self._libspec_dir)
         )
+        self._libspec_store = LibspecStore(
+            libspec_store_dir or self.get_libspec_store_dir(), self.get_robot_version(),
+        )
+
         log.debug("User libspec dir: %s", self._user_libspec_dir)
         log.debug("Builtins libspec dir: %s", self._builtins_libspec_dir)
 
@@ -427,6 +1167,16 @@ class LibspecManager(object):
         except:
             # Ignore exception if it's already created.
             pass
+        try:
+            os.makedirs(self._user_libspec_with_args_dir)
+        except:
+            # Ignore exception if it's already created.
+            pass
+
+        # Patterns of the folders not scanned for .libspec files.
+        self._libspec_scan_excludes = DEFAULT_LIBSPEC_SCAN_EXCLUDES
+        self._scan_executor = None
+        self._scan_executor_lock = threading.Lock()
 
         # Spec info found in the workspace
         self._workspace_folder_uri_to_folder_info = {}
@@ -451,6 +1201,55 @@ class LibspecManager(object):
             ),
         }
 
+        # env key -> LibdocWorkerPool
+        self._libdoc_worker_pools = {}
+        self._libdoc_worker_pools_lock = threading.Lock()
+
+        # (libname, additional_path, cwd, interpreter) -> Future(bool) for the
+        # libspec generations in progress (requested through get_library_info).
+        self._libspec_creation_key_to_future = {}
+        self._libspec_creation_lock = threading.Lock()
+
+        # Same key as above -> _LibspecFailure (libspecs which couldn't be
+        # generated).
+        self._libspec_creation_key_to_failure = {}
+
+        self._libspec_generation_semaphore = threading.BoundedSemaphore(
+            MAX_CONCURRENT_LIBSPEC_GENERATIONS
+        )
+        self._libdoc_timeout = DEFAULT_LIBDOC_TIMEOUT
+
+        # Libspecs which are out of date are regenerated in the background
+        # (while the stale version is still served).
+        self._regeneration_executor = None
+        self._regeneration_scheduled_keys = set()
+        # Normalized libspec filename -> (libname, additional_path, cwd) used
+        # to create it (so that it can be regenerated when its sources change).
+        self._spec_filename_to_creation_args = {}
+        self._on_libspecs_regenerated_callbacks = []
+        self._on_libspecs_changed_callbacks = []
+        # Normalized libspec filename -> stat key of the libspecs published by
+        # this manager.
+        self._published_spec_filename_to_stat_key = {}
+        self._published_lock = threading.Lock()
+        self._disposed = False
+
+        # Libraries imported with arguments: normalized libspec filename ->
+        # _LibInfo (in least recently used order).
+        self._libspec_with_args_filename_to_lib_info = OrderedDict()
+        # Libraries whose keywords don't depend on the arguments used to import
+        # them: libspec filename (generated without arguments) -> keyword names
+        # (the libspec without arguments is used while the keywords are the
+        # same).
+        self._args_independent_spec_filename_to_keyword_names = {}
+        self._libspec_with_args_lock = threading.Lock()
+
+        # Statistics reported by get_status().
+        self._stats_lock = threading.Lock()
+        # libname -> [generations count, total time, last time]
+        self._libname_to_generation_stats = {}
+        self._get_library_info_stats = {"hits": 0, "staleHits": 0, "misses": 0}
+
         # Must be set from the outside world when needed.
         self.config = None
 
@@ -475,10 +1274,29 @@ class LibspecManager(object):
     def config(self, config):
         self._check_in_main_thread()
         from robotframework_ls.impl.robot_lsp_constants import OPTION_ROBOT_PYTHONPATH
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_LIBDOC_TIMEOUT,
+        )
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_LIBDOC_SHARED_STORE,
+        )
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_LIBDOC_SCAN_EXCLUDES,
+        )
 
         self._config = config
         existing_entries = set(self._additional_pythonpath_folder_to_folder_info.keys())
         if config is not None:
+            self._libdoc_timeout = config.get_setting(
+                OPTION_ROBOT_LIBDOC_TIMEOUT, float, DEFAULT_LIBDOC_TIMEOUT
+            )
+            self._libspec_store.read_only_store_dirs = tuple(
+                config.get_setting(OPTION_ROBOT_LIBDOC_SHARED_STORE, list, [])
+            )
+            self._set_libspec_scan_excludes(
+                DEFAULT_LIBSPEC_SCAN_EXCLUDES
+                + tuple(config.get_setting(OPTION_ROBOT_LIBDOC_SCAN_EXCLUDES, list, []))
+            )
             pythonpath_entries = set(
                 config.get_setting(OPTION_ROBOT_PYTHONPATH, list, [])
             )
@@ -491,13 +1309,66 @@ class LibspecManager(object):
 
         self.synchronize_additional_pythonpath_folders()
 
+    def _set_libspec_scan_excludes(self, exclude_patterns):
+        exclude_patterns = tuple(exclude_patterns)
+        if exclude_patterns == self._libspec_scan_excludes:
+            return
+
+        log.debug("Folders excluded from the libspec scan: %s", exclude_patterns)
+        self._libspec_scan_excludes = exclude_patterns
+        changed = []
+        for folder_info in list(
+            self._workspace_folder_uri_to_folder_info.values()
+        ) + list(self._additional_pythonpath_folder_to_folder_info.values()):
+            if folder_info.set_exclude_patterns(exclude_patterns):
+                changed.append(folder_info)
+        self._synchronize_folder_infos(changed)
+
     @property
     def user_libspec_dir(self):
         return self._user_libspec_dir
 
     def _on_spec_file_changed(self, spec_file, target):
         log.debug("File change detected: %s", spec_file)
-        target(spec_file)
+        if not target(spec_file):
+            return
+
+        stat_key = _get_libspec_stat_key(spec_file)
+        with self._published_lock:
+            published_stat_key = self._published_spec_filename_to_stat_key.get(
+                _norm_filename(spec_file)
+            )
+        if stat_key is not None and stat_key == published_stat_key:
+            # Published by this manager (listeners were already notified).
+            return
+        self._notify_libspecs_changed(spec_file)
+
+    def _publish_created_libspec(
+        self, tmp_spec_filename, spec_filename, is_builtin, creation_args=None
+    ):
+        """
+        Publishes a libspec created by this manager (the listeners are notified
+        right away -- the change is ignored when it's later seen in the
+        filesystem).
+        """
+        _publish_libspec(tmp_spec_filename, spec_filename, is_builtin, creation_args)
+        stat_key = _get_libspec_stat_key(spec_filename)
+        with self._published_lock:
+            self._published_spec_filename_to_stat_key[
+                _norm_filename(spec_filename)
+            ] = stat_key
+        self._notify_libspecs_changed(spec_filename)
+
+    def _notify_libspecs_changed(self, spec_filename):
+        if self._disposed:
+            return
+
+        libname = os.path.splitext(os.path.basename(spec_filename))[0]
+        for callback in list(self._on_libspecs_changed_callbacks):
+            try:
+                callback([libname])
+            except Exception:
+                log.exception("Error notifying libspec change.")
 
     def add_workspace_folder(self, folder_uri):
         self._check_in_main_thread()
@@ -507,7 +1378,9 @@ class LibspecManager(object):
             log.debug("Added workspace folder: %s", folder_uri)
             cp = self._workspace_folder_uri_to_folder_info.copy()
             folder_info = cp[folder_uri] = _FolderInfo(
-                uris.to_fs_path(folder_uri), recursive=True
+                uris.to_fs_path(folder_uri),
+                recursive=True,
+                exclude_patterns=self._libspec_scan_excludes,
             )
             self._workspace_folder_uri_to_folder_info = cp
             folder_info.start_watch(self._observer, self._spec_changes_notifier)
@@ -531,7 +1404,11 @@ class LibspecManager(object):
         if folder_path not in self._additional_pythonpath_folder_to_folder_info:
             log.debug("Added additional pythonpath folder: %s", folder_path)
             cp = self._additional_pythonpath_folder_to_folder_info.copy()
-            folder_info = cp[folder_path] = _FolderInfo(folder_path, recursive=True)
+            folder_info = cp[folder_path] = _FolderInfo(
+                folder_path,
+                recursive=True,
+                exclude_patterns=self._libspec_scan_excludes,
+            )
             self._additional_pythonpath_folder_to_folder_info = cp
             folder_info.start_watch(self._observer, self._spec_changes_notifier)
             folder_info.synchronize()
@@ -577,11 +1454,15 @@ class LibspecManager(object):
                     timeout=100,
                 ):
                     log.debug("Obtained mutex to generate builtins.")
+                    installed = False
                     for libname in robot_constants.STDLIBS:
                         builtins_libspec_dir = self._builtins_libspec_dir
                         if not os.path.exists(
                             os.path.join(builtins_libspec_dir, f"{libname}.libspec")
                         ):
+                            if self._install_prebuilt_builtin_libspec(libname):
+                                installed = True
+                                continue
                             wait_for.append(
                                 thread_pool.submit(
                                     self._create_libspec, libname, is_builtin=True
@@ -590,7 +1471,7 @@ class LibspecManager(object):
                     for future in wait_for:
                         future.result()
 
-                if wait_for:
+                if wait_for or installed:
                     log.debug(
                         "Total time to generate builtins: %.2fs"
                         % (time.time() - initial_time)
@@ -603,87 +1484,227 @@ class LibspecManager(object):
         finally:
             log.info("Finished creating builtin libraries.")
 
-    def synchronize_workspace_folders(self):
-        for folder_info in self._workspace_folder_uri_to_folder_info.values():
+    def _install_prebuilt_builtin_libspec(self, libname):
+        """
+        Copies the prebuilt libspec of the given builtin library (for the
+        current robot version) to the builtins libspec dir.
+
+        :return bool:
+            Whether a prebuilt libspec was installed.
+        """
+        from robocorp_ls_core.system_mutex import timed_acquire_mutex
+
+        robot_version = self.get_robot_version()
+        for prebuilt_dir in self.get_prebuilt_libspec_dirs():
+            prebuilt_filename = os.path.join(
+                prebuilt_dir, robot_version, libname + ".libspec"
+            )
+            if os.path.isfile(prebuilt_filename):
+                break
+        else:
+            return False
+
+        try:
+            import robot
+
+            with open(prebuilt_filename, "r", encoding="utf-8") as stream:
+                contents = stream.read()
+            contents = _rebase_libspec_sources(
+                contents, os.path.dirname(robot.__file__)
+            )
+
+            libspec_filename = os.path.join(
+                self._builtins_libspec_dir, libname + ".libspec"
+            )
+            with timed_acquire_mutex(_get_libspec_mutex_name(libspec_filename)):
+                tmp_libspec_filename = _get_tmp_libspec_filename(libspec_filename)
+                try:
+                    with open(tmp_libspec_filename, "w", encoding="utf-8") as stream:
+                        stream.write(contents)
+                    self._publish_created_libspec(
+                        tmp_libspec_filename, libspec_filename, is_builtin=True
+                    )
+                finally:
+                    _remove_tmp_libspec(tmp_libspec_filename)
+        except Exception:
+            log.exception("Error installing prebuilt libspec: %s", prebuilt_filename)
+            return False
+
+        log.debug("Installed prebuilt libspec: %s", prebuilt_filename)
+        return True
+
+    def _synchronize_folder_infos(self, folder_infos):
+        """
+        Synchronizes the given folders (in parallel when there's more than one
+        folder to be synchronized).
+        """
+        from concurrent import futures
+
+        folder_infos = list(folder_infos)
+        for folder_info in folder_infos:
             folder_info.start_watch(self._observer, self._spec_changes_notifier)
-            folder_info.synchronize()
+
+        executor = None
+        if len(folder_infos) > 1:
+            with self._scan_executor_lock:
+                if not self._disposed:
+                    if self._scan_executor is None:
+                        self._scan_executor = futures.ThreadPoolExecutor(
+                            max_workers=MAX_CONCURRENT_LIBSPEC_SCANS,
+                            thread_name_prefix="LibspecScan",
+                        )
+                    executor = self._scan_executor
+
+        if executor is None:
+            for folder_info in folder_infos:
+                folder_info.synchronize()
+            return
+
+        try:
+            scan_futures = [
+                executor.submit(folder_info.synchronize) for folder_info in folder_infos
+            ]
+        except RuntimeError:
+            # Shutdown in the meanwhile.
+            for folder_info in folder_infos:
+                folder_info.synchronize()
+            return
+
+        for future in scan_futures:
+            future.result()
+
+    def synchronize_workspace_folders(self):
+        self._synchronize_folder_infos(
+            self._workspace_folder_uri_to_folder_info.values()
+        )
 
     def synchronize_pythonpath_folders(self):
-        for folder_info in self._pythonpath_folder_to_folder_info.values():
-            folder_info.start_watch(self._observer, self._spec_changes_notifier)
-            folder_info.synchronize()
+        self._synchronize_folder_infos(self._pythonpath_folder_to_folder_info.values())
 
     def synchronize_additional_pythonpath_folders(self):
-        for folder_info in self._additional_pythonpath_folder_to_folder_info.values():
-            folder_info.start_watch(self._observer, self._spec_changes_notifier)
-            folder_info.synchronize()
+        self._synchronize_folder_infos(
+            self._additional_pythonpath_folder_to_folder_info.values()
+        )
 
     def synchronize_internal_libspec_folders(self):
-        for folder_info in self._internal_folder_to_folder_info.values():
-            folder_info.start_watch(self._observer, self._spec_changes_notifier)
-            folder_info.synchronize()
+        self._synchronize_folder_infos(self._internal_folder_to_folder_info.values())
 
     def _synchronize(self):
         """
         Updates the internal caches related to the tracked .libspec files found.
         
         This can be a slow call as it may traverse the whole workspace folders
-        hierarchy, so, it should be used only during startup to fill the initial
-        info.
+        hierarchy (the folders are scanned in parallel and the folders which
+        didn't change since the last scan aren't listed again).
         """
-        self.synchronize_workspace_folders()
-        self.synchronize_pythonpath_folders()
-        self.synchronize_additional_pythonpath_folders()
-        self.synchronize_internal_libspec_folders()
+        self._synchronize_folder_infos(
+            [folder_info for folder_info, _can_regenerate in self._iter_folder_infos()]
+        )
 
-    def _iter_lib_info(self):
+    def _iter_folder_infos(self):
         """
-        :rtype: generator(_LibInfo)
+        :rtype: generator(tuple(_FolderInfo, bool))
+            The folder info and whether the libspec files from it can be
+            regenerated.
         """
         # Note: the iteration order is important (first ones are visited earlier
         # and have higher priority).
-        iter_in = []
         for (_uri, info) in self._workspace_folder_uri_to_folder_info.items():
-            iter_in.append((info.libspec_canonical_filename_to_info, False))
+            yield info, False
 
         for (_uri, info) in self._pythonpath_folder_to_folder_info.items():
-            iter_in.append((info.libspec_canonical_filename_to_info, False))
+            yield info, False
 
         for (_uri, info) in self._additional_pythonpath_folder_to_folder_info.items():
-            iter_in.append((info.libspec_canonical_filename_to_info, False))
+            yield info, False
 
         for (_uri, info) in self._internal_folder_to_folder_info.items():
-            iter_in.append((info.libspec_canonical_filename_to_info, True))
+            yield info, True
 
-        for canonical_filename_to_info, can_regenerate in iter_in:
-            for canonical_spec_filename, info in list(
-                canonical_filename_to_info.items()
-            ):
+    def _iter_lib_info_for_name(self, libname_lower):
+        """
+        :param str libname_lower:
+            The name of the library (lower-case).
 
-                if info is None:
-                    info = canonical_filename_to_info[
-                        canonical_spec_filename
-                    ] = _load_lib_info(canonical_spec_filename, can_regenerate)
-
-                # Note: we could end up yielding a library with the same name
-                # multiple times due to its scope. It's up to the caller to
-                # validate that.
-
-                # Note: we also check if there are keywords available... in
-                # some cases we may create libraries for namespace packages
-                # (i.e.: empty folders) which don't really have anything -- in
-                # this case, this isn't a valid library.
-                if (
-                    info is not None
-                    and info.library_doc is not None
-                    and info.library_doc.keywords
-                ):
-                    yield info
+        :rtype: generator(_LibInfo)
+        """
+        for folder_info, can_regenerate in list(self._iter_folder_infos()):
+            for info in folder_info.iter_lib_info_for_name(
+                libname_lower, can_regenerate
+            ):
+                yield info
 
     def get_library_names(self):
-        return sorted(
-            set(lib_info.library_doc.name for lib_info in self._iter_lib_info())
+        # Note: only the headers are needed here (the library docs are only
+        # loaded when actually requested).
+        names = set()
+        for folder_info, _can_regenerate in list(self._iter_folder_infos()):
+            for header in folder_info.iter_library_doc_headers():
+                names.add(header.name)
+        return sorted(names)
+
+    def _get_libdoc_worker_pool(self, env):
+        from robotframework_ls.impl.libspec_worker import LibdocWorkerPool
+
+        key = tuple(sorted(env.items())) if env else None
+        with self._libdoc_worker_pools_lock:
+            pool = self._libdoc_worker_pools.get(key)
+            if pool is None:
+                pool = self._libdoc_worker_pools[key] = LibdocWorkerPool(
+                    sys.executable, env, max_workers=MAX_CONCURRENT_LIBSPEC_GENERATIONS
+                )
+            return pool
+
+    def _get_libspec_filename(self, libname, lib_args=()):
+        from robotframework_ls.impl import robot_constants
+
+        if lib_args:
+            import hashlib
+
+            digest = hashlib.sha256("\0".join(lib_args).encode("utf-8")).hexdigest()
+            return os.path.join(
+                self._user_libspec_with_args_dir,
+                "%s_%s.libspec" % (libname, digest[:16]),
+            )
+
+        libspec_dir = self._user_libspec_dir
+        if libname in robot_constants.STDLIBS:
+            libspec_dir = self._builtins_libspec_dir
+
+        return os.path.join(libspec_dir, libname + ".libspec")
+
+    def _get_libdoc_args(self, libname, additional_path, lib_args=()):
+        """
+        :return tuple(list(str), list(str)):
+            The arguments to be passed to libdoc (without the output filename)
+            and the pythonpath entries used.
+        """
+        args = []
+        major_version = self.get_robot_major_version()
+        if major_version < 4:
+            args.extend("--format XML:HTML".split())
+        else:
+            # Use default values for libspec (--format XML:HTML is deprecated).
+            pass
+
+        pythonpath_entries = []
+        if additional_path:
+            if os.path.exists(additional_path):
+                pythonpath_entries.append(additional_path)
+
+        additional_pythonpath_entries = list(
+            self._additional_pythonpath_folder_to_folder_info.keys()
         )
+        for entry in list(additional_pythonpath_entries):
+            if os.path.exists(entry):
+                pythonpath_entries.append(entry)
+
+        for entry in pythonpath_entries:
+            args.extend(["-P", entry])
+
+        # Note: libdoc accepts the library arguments as `Name::arg1::arg2`.
+        args.append("::".join((libname,) + tuple(lib_args)))
+        return args, pythonpath_entries
 
     def _create_libspec(
         self,
@@ -693,117 +1714,287 @@ class LibspecManager(object):
         cwd=None,
         additional_path=None,
         is_builtin=False,
+        on_error=None,
+        lib_args=(),
     ):
         """
         :param str libname:
+
+        :param tuple(str) lib_args:
+            The arguments to be used to create the library.
+
+        :param callable on_error:
+            If given, it's called as `on_error(output, timed_out)` when the
+            libspec can't be created.
+
         :raise Exception: if unable to create the library.
         """
         import time
-        from robotframework_ls.impl import robot_constants
-        from robocorp_ls_core.subprocess_wrapper import subprocess
         from robocorp_ls_core.system_mutex import timed_acquire_mutex
 
         curtime = time.time()
 
         try:
             try:
-                call = [sys.executable]
-                major_version = self.get_robot_major_version()
-                if major_version < 4:
-                    call.extend("-m robot.libdoc --format XML:HTML".split())
-                else:
-                    # Use default values for libspec (--format XML:HTML is deprecated).
-                    call.extend("-m robot.libdoc".split())
-
-                if additional_path:
-                    if os.path.exists(additional_path):
-                        call.extend(["-P", additional_path])
-
-                additional_pythonpath_entries = list(
-                    self._additional_pythonpath_folder_to_folder_info.keys()
+                args, pythonpath_entries = self._get_libdoc_args(
+                    libname, additional_path, lib_args
                 )
-                for entry in list(additional_pythonpath_entries):
-                    if os.path.exists(entry):
-                        call.extend(["-P", entry])
-
-                call.append(libname)
-                libspec_dir = self._user_libspec_dir
-                if libname in robot_constants.STDLIBS:
-                    libspec_dir = self._builtins_libspec_dir
+                libspec_filename = self._get_libspec_filename(libname, lib_args)
+                initial_stat_key = _get_libspec_stat_key(libspec_filename)
 
-                libspec_filename = os.path.join(libspec_dir, libname + ".libspec")
-
-                log.debug(f"Obtaining mutex to generate libpsec: {libspec_filename}.")
-                with timed_acquire_mutex(
-                    _get_libspec_mutex_name(libspec_filename)
-                ):  # Could fail.
+                # Note: the semaphore is acquired before the system mutex so that
+                # the mutex isn't held while waiting for a free slot.
+                with self._libspec_generation_semaphore:
                     log.debug(
-                        f"Obtained mutex to generate libpsec: {libspec_filename}."
+                        f"Obtaining mutex to generate libpsec: {libspec_filename}."
                     )
-                    call.append(libspec_filename)
-
-                    mtime = -1
-                    try:
-                        mtime = os.path.getmtime(libspec_filename)
-                    except:
-                        pass
+                    with timed_acquire_mutex(
+                        _get_libspec_mutex_name(libspec_filename)
+                    ):  # Could fail.
+                        log.debug(
+                            f"Obtained mutex to generate libpsec: {libspec_filename}."
+                        )
+                        stat_key = _get_libspec_stat_key(libspec_filename)
+                        if stat_key is not None and stat_key != initial_stat_key:
+                            # Some other process published it while we were
+                            # waiting for the mutex (publishing it again would
+                            # just invalidate what readers already loaded).
+                            log.debug(
+                                f"Libspec published while waiting: {libspec_filename}."
+                            )
+                            return True
 
-                    log.debug(
-                        "Generating libspec for: %s.\nCwd:%s\nCommand line:\n%s",
-                        libname,
-                        cwd,
-                        " ".join(call),
-                    )
-                    try:
+                        # Note: libdoc writes to a temporary file which is then
+                        # atomically published (so, readers don't need the mutex).
+                        tmp_libspec_filename = _get_tmp_libspec_filename(
+                            libspec_filename
+                        )
+                        creation_args = None
+                        if not lib_args and not is_builtin:
+                            creation_args = (libname, additional_path, cwd)
                         try:
-                            # Note: stdout is always subprocess.PIPE in this call.
-                            subprocess.check_output(
-                                call,
-                                stderr=subprocess.STDOUT,
-                                stdin=subprocess.PIPE,
-                                env=env,
-                                cwd=cwd,
+                            return self._create_libspec_in_tmp(
+                                libname,
+                                args + [tmp_libspec_filename],
+                                env,
+                                cwd,
+                                pythonpath_entries,
+                                is_builtin,
+                                tmp_libspec_filename,
+                                libspec_filename,
+                                on_error,
+                                use_store=not lib_args,
+                                creation_args=creation_args,
                             )
-                        except OSError as e:
-                            log.exception("Error calling: %s", call)
-                            # We may have something as: Ignore OSError: [WinError 6] The handle is invalid,
-                            # give the result based on whether the file changed on disk.
-                            try:
-                                if mtime != os.path.getmtime(libspec_filename):
-                                    _dump_spec_filename_additional_info(
-                                        libspec_filename,
-                                        is_builtin=is_builtin,
-                                        obtain_mutex=False,
-                                    )
-                                    return True
-                            except:
-                                pass
-
-                            log.debug("Not retrying after OSError failure.")
-                            return False
-
-                    except subprocess.CalledProcessError as e:
-                        log.exception(
-                            "Error creating libspec: %s. Output:\n%s", libname, e.output
-                        )
-                        return False
-                    _dump_spec_filename_additional_info(
-                        libspec_filename, is_builtin=is_builtin, obtain_mutex=False
-                    )
-                    return True
+                        finally:
+                            _remove_libspec(tmp_libspec_filename)
             except Exception:
                 log.exception("Error creating libspec: %s", libname)
+                if on_error is not None:
+                    import traceback
+
+                    on_error(traceback.format_exc(), False)
                 return False
         finally:
+            delta = time.time() - curtime
+            self._on_libspec_generation_finished(libname, delta)
             if log_time:
-                delta = time.time() - curtime
                 log.debug("Took: %.2fs to generate info for: %s" % (delta, libname))
 
+    def _on_libspec_generation_finished(self, libname, elapsed):
+        with self._stats_lock:
+            stats = self._libname_to_generation_stats.setdefault(libname, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = elapsed
+
+    def _create_libspec_in_tmp(
+        self,
+        libname,
+        args,
+        env,
+        cwd,
+        pythonpath_entries,
+        is_builtin,
+        tmp_libspec_filename,
+        libspec_filename,
+        on_error,
+        use_store=True,
+        creation_args=None,
+    ):
+        """
+        Creates the libspec in the given temporary file and publishes it in
+        its final place.
+
+        :param use_store:
+            Whether the libspec store may be used (the store is keyed only by
+            the library sources, so, it can't be used for libraries created
+            with arguments).
+
+        :param creation_args:
+            The creation args to be saved with the libspec (see:
+            `_publish_libspec`).
+
+        Note: must be called with the libspec_filename mutex held.
+        """
+        from robotframework_ls.impl.libspec_worker import LibdocWorkerTimeoutError
+
+        store_key = None
+        if use_store and not is_builtin:
+            store_key = self._libspec_store.compute_key(
+                libname, pythonpath_entries + ([cwd] if cwd else []) + sys.path
+            )
+            if store_key is not None and self._libspec_store.fetch(
+                store_key, tmp_libspec_filename
+            ):
+                self._publish_created_libspec(
+                    tmp_libspec_filename, libspec_filename, is_builtin, creation_args
+                )
+                return True
+
+        log.debug(
+            "Generating libspec for: %s.\nCwd:%s\nLibdoc args:\n%s",
+            libname,
+            cwd,
+            " ".join(args),
+        )
+        reload_paths = pythonpath_entries + ([cwd] if cwd else [])
+        try:
+            created, output = self._run_libdoc(
+                libname, args, env, cwd, reload_paths, tmp_libspec_filename, -1
+            )
+        except LibdocWorkerTimeoutError as e:
+            log.critical("Error creating libspec: %s. %s", libname, e)
+            if on_error is not None:
+                on_error(str(e), True)
+            return False
+
+        if not created:
+            if on_error is not None:
+                on_error(output, False)
+            return False
+
+        if store_key is not None:
+            self._libspec_store.publish(store_key, tmp_libspec_filename)
+        self._publish_created_libspec(
+            tmp_libspec_filename, libspec_filename, is_builtin, creation_args
+        )
+        return True
+
+    def _run_libdoc(
+        self, libname, args, env, cwd, reload_paths, libspec_filename, mtime
+    ):
+        """
+        Runs libdoc in a libdoc worker (or in a new process if it's not possible
+        to use a worker).
+
+        Note: must be called with the libspec_filename mutex held.
+
+        :return tuple(bool, str):
+            Whether the libspec was generated and the libdoc output.
+
+        :raise LibdocWorkerTimeoutError:
+            If libdoc didn't finish in the configured timeout (in which case
+            the process tree used to generate it is killed).
+        """
+        from robotframework_ls.impl.libspec_worker import LibdocWorkerError
+        from robotframework_ls.impl.libspec_worker import LibdocWorkerTimeoutError
+
+        timeout = self._libdoc_timeout
+        if timeout is not None and timeout <= 0:
+            timeout = None
+
+        try:
+            returncode, output = self._get_libdoc_worker_pool(env).run_libdoc(
+                args, cwd=cwd, reload_paths=reload_paths, timeout=timeout
+            )
+        except LibdocWorkerTimeoutError:
+            raise
+        except LibdocWorkerError:
+            log.exception(
+                "Unable to generate libspec for: %s in libdoc worker (a new process will be used).",
+                libname,
+            )
+            return self._run_libdoc_in_subprocess(
+                libname, args, env, cwd, libspec_filename, mtime, timeout
+            )
+
+        if returncode != 0:
+            log.critical("Error creating libspec: %s. Output:\n%s", libname, output)
+            return False, output
+        return True, output
+
+    def _run_libdoc_in_subprocess(
+        self, libname, args, env, cwd, libspec_filename, mtime, timeout=None
+    ):
+        from robocorp_ls_core.subprocess_wrapper import subprocess
+        from robocorp_ls_core.basic import kill_process_and_subprocesses
+        from robotframework_ls.impl.libspec_worker import LibdocWorkerTimeoutError
+
+        call = [sys.executable, "-m", "robot.libdoc"] + list(args)
+        try:
+            process = subprocess.Popen(
+                call,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.PIPE,
+                env=env,
+                cwd=cwd,
+            )
+            try:
+                output, _ = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kill_process_and_subprocesses(process.pid)
+                process.communicate()
+                raise LibdocWorkerTimeoutError(
+                    "Libdoc timed out after %ss (args: %s)." % (timeout, " ".join(args))
+                )
+        except OSError as e:
+            log.exception("Error calling: %s", call)
+            # We may have something as: Ignore OSError: [WinError 6] The handle is invalid,
+            # give the result based on whether the file changed on disk.
+            try:
+                if mtime != os.path.getmtime(libspec_filename):
+                    return True, ""
+            except:
+                pass
+
+            log.debug("Not retrying after OSError failure.")
+            return False, str(e)
+
+        output = output.decode("utf-8", "replace") if output else ""
+        if process.returncode != 0:
+            log.critical("Error creating libspec: %s. Output:\n%s", libname, output)
+            return False, output
+        return True, output
+
     def dispose(self):
+        with self._libspec_creation_lock:
+            self._disposed = True
+            regeneration_executor = self._regeneration_executor
+            self._regeneration_executor = None
+        if regeneration_executor is not None:
+            regeneration_executor.shutdown(wait=False)
+        with self._scan_executor_lock:
+            scan_executor = self._scan_executor
+            self._scan_executor = None
+        if scan_executor is not None:
+            scan_executor.shutdown(wait=False)
+        self._library_sources_tracker.dispose()
         self._observer.dispose()
         self._spec_changes_notifier.dispose()
+        with self._libdoc_worker_pools_lock:
+            pools = list(self._libdoc_worker_pools.values())
+            self._libdoc_worker_pools.clear()
+        for pool in pools:
+            pool.dispose()
 
-    def _do_create_libspec_on_get(self, libname, current_doc_uri):
+    def _get_libspec_creation_args(self, libname, current_doc_uri):
+        """
+        :return tuple(str, str, str):
+            The libname, additional_path and cwd to be used to create the
+            libspec for the library referenced in the given document.
+        """
         from robocorp_ls_core import uris
 
         additional_path = None
@@ -828,52 +2019,978 @@ class LibspecManager(object):
             if libname.lower().endswith((".py", ".class", ".java")):
                 libname = os.path.splitext(libname)[0]
 
-        if self._create_libspec(libname, additional_path=additional_path, cwd=cwd):
-            self.synchronize_internal_libspec_folders()
-            return True
+        return libname, additional_path, cwd
+
+    def _do_create_libspec_on_get(self, libname, current_doc_uri):
+        libname, additional_path, cwd = self._get_libspec_creation_args(
+            libname, current_doc_uri
+        )
+        return self._create_libspec_single_flight(libname, additional_path, cwd)
+
+    def _get_libspec_inputs_fingerprint(
+        self, libname, additional_path, cwd, pythonpath_folders=None
+    ):
+        """
+        :param list(str) pythonpath_folders:
+            The additional pythonpath folders used in the generation (if not
+            given the current ones are used).
+
+        :return tuple:
+            Information on the files which may affect the libspec generation
+            (so, a previous failure is only valid while this doesn't change):
+
+            - the module or all the .py files/folders of the package the
+              library may resolve to (i.e.: a broken submodule is fixed).
+            - the folders in `sys.path` (i.e.: a missing dependency is
+              installed with pip in `site-packages`).
+
+        Note: the cwd and the pythonpath folders themselves aren't used because
+        their mtime changes whenever any file is created/removed in them (i.e.:
+        the cwd changes on any unrelated change in the workspace).
+        """
+        module_name = libname.split(".")[0]
+        if pythonpath_folders is None:
+            pythonpath_folders = self._additional_pythonpath_folder_to_folder_info
+        paths = [additional_path, cwd] + list(pythonpath_folders)
+
+        filenames = []
+        for path in paths:
+            if not path:
+                continue
+            package_dir = os.path.join(path, module_name)
+            filenames.append(os.path.join(path, module_name + ".py"))
+            filenames.append(package_dir)
+            for root, dirs, files in os.walk(package_dir):
+                dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+                for name in dirs:
+                    filenames.append(os.path.join(root, name))
+                for name in sorted(files):
+                    if name.endswith(".py"):
+                        filenames.append(os.path.join(root, name))
+
+        skip_paths = set(_norm_filename(path) for path in paths if path)
+        skip_paths.add(_norm_filename(os.getcwd()))
+        for path in sys.path:
+            if path and _norm_filename(path) not in skip_paths:
+                filenames.append(path)
+
+        fingerprint = []
+        for filename in filenames:
+            try:
+                mtime = os.path.getmtime(filename)
+            except Exception:
+                mtime = -1
+            fingerprint.append((filename, mtime))
+        return tuple(fingerprint)
+
+    def _get_valid_libspec_failure(self, key, fingerprint):
+        """
+        :return _LibspecFailure|NoneType:
+            The failure for the given key if its inputs didn't change.
+        """
+        failure = self._libspec_creation_key_to_failure.get(key)
+        if failure is not None and failure.fingerprint == fingerprint:
+            return failure
+        return None
+
+    def _on_libspec_creation_finished(
+        self, key, fingerprint, created, output, timed_out
+    ):
+        import time
+
+        if created:
+            self._libspec_creation_key_to_failure.pop(key, None)
+            return
+
+        failure = self._get_valid_libspec_failure(key, fingerprint)
+        failures_count = failure.failures_count + 1 if failure is not None else 1
+        if timed_out:
+            # A library which hangs when imported will probably hang again,
+            # so, don't retry it soon.
+            backoff = LIBSPEC_FAILURE_MAX_BACKOFF
+        else:
+            backoff = min(
+                LIBSPEC_FAILURE_INITIAL_BACKOFF * (2 ** (failures_count - 1)),
+                LIBSPEC_FAILURE_MAX_BACKOFF,
+            )
+        log.debug(
+            "Unable to create libspec for: %s (failures: %s). Retrying in %ss.",
+            key[0],
+            failures_count,
+            backoff,
+        )
+        self._libspec_creation_key_to_failure[key] = _LibspecFailure(
+            output, failures_count, time.time() + backoff, fingerprint, timed_out
+        )
+
+    def get_status(self):
+        """
+        :return dict:
+            Information to help identifying slow or failing libraries: the
+            folders tracked (with the number of libspecs found/loaded in each),
+            the libraries loaded (with the time to load them, to check whether
+            their sources changed and their approximate memory size), the
+            libspec generations, the failures and how `get_library_info`
+            requests were served.
+        """
+        import time
+
+        folders = []
+        # normalized name -> dict
+        name_to_library = {}
+
+        def get_library_entry(name):
+            entry = name_to_library.get(name.lower())
+            if entry is None:
+                entry = name_to_library[name.lower()] = {
+                    "name": name,
+                    "libspecs": [],
+                    "generations": 0,
+                    "totalGenerationTime": 0.0,
+                    "lastGenerationTime": None,
+                }
+            return entry
+
+        def add_lib_info(spec_filename, lib_info):
+            library_doc = lib_info.library_doc
+            get_library_entry(library_doc.name or "<unknown>")["libspecs"].append(
+                {
+                    "specFilename": spec_filename,
+                    "loaded": True,
+                    "loadTime": lib_info.load_time,
+                    "validationTime": lib_info.validation_time,
+                    "memorySize": _get_approximate_memory_size(library_doc),
+                }
+            )
+
+        def add_header(header):
+            # i.e.: a libspec which is available (prebuilt, generated in some
+            # other process, fetched from the store, ...) but wasn't loaded
+            # in this process yet.
+            get_library_entry(header.name)["libspecs"].append(
+                {
+                    "specFilename": header.filename,
+                    "loaded": False,
+                    "loadTime": None,
+                    "validationTime": None,
+                    "memorySize": None,
+                }
+            )
+
+        for kind, folder_to_folder_info in (
+            ("workspace", self._workspace_folder_uri_to_folder_info),
+            ("pythonpath", self._pythonpath_folder_to_folder_info),
+            ("additionalPythonpath", self._additional_pythonpath_folder_to_folder_info),
+            ("internal", self._internal_folder_to_folder_info),
+        ):
+            for folder_info in list(folder_to_folder_info.values()):
+                filename_to_info = folder_info.libspec_canonical_filename_to_info
+                loaded = 0
+                for spec_filename, lib_info in list(filename_to_info.items()):
+                    if lib_info is not None:
+                        loaded += 1
+                        add_lib_info(spec_filename, lib_info)
+
+                for header in list(folder_info.iter_library_doc_headers()):
+                    if (
+                        header is not None
+                        and filename_to_info.get(header.filename) is None
+                    ):
+                        add_header(header)
+
+                folders.append(
+                    {
+                        "kind": kind,
+                        "path": folder_info.folder_path,
+                        "recursive": folder_info.recursive,
+                        "libspecs": len(filename_to_info),
+                        "loadedLibspecs": loaded,
+                    }
+                )
+
+        with self._libspec_with_args_lock:
+            with_args = list(self._libspec_with_args_filename_to_lib_info.items())
+        for spec_filename, lib_info in with_args:
+            add_lib_info(spec_filename, lib_info)
+
+        with self._stats_lock:
+            generation_stats = [
+                (libname, list(stats))
+                for libname, stats in self._libname_to_generation_stats.items()
+            ]
+            get_library_info_stats = self._get_library_info_stats.copy()
+
+        for libname, (count, total_time, last_time) in generation_stats:
+            entry = get_library_entry(libname)
+            entry["generations"] += count
+            entry["totalGenerationTime"] += total_time
+            entry["lastGenerationTime"] = last_time
+
+        failures = []
+        now = time.time()
+        for key, failure in list(self._libspec_creation_key_to_failure.items()):
+            failures.append(
+                {
+                    "name": key[0],
+                    "additionalPath": key[1],
+                    "cwd": key[2],
+                    "args": list(key[4]) if len(key) > 4 else [],
+                    "failures": failure.failures_count,
+                    "timedOut": failure.timed_out,
+                    "retryIn": max(0.0, failure.next_retry_time - now),
+                    "message": failure.get_message(),
+                }
+            )
+
+        return {
+            "folders": folders,
+            "libraries": sorted(
+                name_to_library.values(), key=lambda entry: entry["name"].lower()
+            ),
+            "failures": failures,
+            "getLibraryInfo": get_library_info_stats,
+        }
+
+    def get_library_creation_error(self, libname, current_doc_uri=None):
+        """
+        :return str|NoneType:
+            A message with the reason why the libspec for the given library
+            couldn't be generated (None if there's no failure recorded or if
+            the inputs used in the failed generation changed).
+        """
+        libname, additional_path, cwd = self._get_libspec_creation_args(
+            libname, current_doc_uri
+        )
+        key = (libname, additional_path, cwd, sys.executable)
+        failure = self._get_valid_libspec_failure(
+            key, self._get_libspec_inputs_fingerprint(libname, additional_path, cwd)
+        )
+        if failure is None:
+            return None
+        return failure.get_message()
+
+    def _create_libspec_single_flight(self, libname, additional_path, cwd, lib_args=()):
+        """
+        Creates the libspec for the given library (if the same library is
+        already being generated in some other thread, wait for it and share
+        its result instead of generating it again).
+
+        :return bool:
+            Whether the libspec was created.
+        """
+        from concurrent import futures
+
+        key = (libname, additional_path, cwd, sys.executable)
+        if lib_args:
+            key += (lib_args,)
+        with self._libspec_creation_lock:
+            future = self._libspec_creation_key_to_future.get(key)
+            in_flight = future is not None
+            if not in_flight:
+                future = futures.Future()
+                self._libspec_creation_key_to_future[key] = future
+
+        if in_flight:
+            log.debug("Waiting for libspec generation in progress for: %s", libname)
+            created = future.result()
+            if (
+                not created
+                and self._get_valid_libspec_failure(
+                    key,
+                    self._get_libspec_inputs_fingerprint(libname, additional_path, cwd),
+                )
+                is None
+            ):
+                # The inputs changed while it was being generated (i.e.: the
+                # pythonpath was changed), so, its result can't be reused.
+                return self._create_libspec_single_flight(
+                    libname, additional_path, cwd, lib_args=lib_args
+                )
+            return created
+
+        import time
+
+        created = False
+        try:
+            fingerprint = self._get_libspec_inputs_fingerprint(
+                libname, additional_path, cwd
+            )
+            failure = self._get_valid_libspec_failure(key, fingerprint)
+            if failure is not None and time.time() < failure.next_retry_time:
+                log.debug(
+                    "Skipping libspec creation for: %s (failed previously: %s).",
+                    libname,
+                    failure.get_message(),
+                )
+                return False
+
+            errors = []
+
+            def on_error(output, timed_out):
+                errors.append((output, timed_out))
+
+            # Note: the pythonpath may change while it's being generated.
+            pythonpath_folders = list(self._additional_pythonpath_folder_to_folder_info)
+            if self._create_libspec(
+                libname,
+                additional_path=additional_path,
+                cwd=cwd,
+                on_error=on_error,
+                lib_args=lib_args,
+            ):
+                if not lib_args:
+                    self._spec_filename_to_creation_args[
+                        _norm_filename(self._get_libspec_filename(libname))
+                    ] = (libname, additional_path, cwd)
+                    self.synchronize_internal_libspec_folders()
+                created = True
+            # Note: get the fingerprint again as the generation itself may
+            # change the folders (i.e.: create __pycache__).
+            self._on_libspec_creation_finished(
+                key,
+                self._get_libspec_inputs_fingerprint(
+                    libname, additional_path, cwd, pythonpath_folders
+                ),
+                created,
+                "\n".join(output for output, _timed_out in errors),
+                any(timed_out for _output, timed_out in errors),
+            )
+        finally:
+            with self._libspec_creation_lock:
+                self._libspec_creation_key_to_future.pop(key, None)
+            future.set_result(created)
+        return created
+
+    def create_libspecs(self, libraries, monitor=None):
+        """
+        Creates the libspecs for the given libraries which are still not
+        available (all of those are generated in a single libdoc worker job
+        instead of one job per library).
+
+        :param list(tuple(str, str)) libraries:
+            The libraries as (libname, current_doc_uri) -- i.e.: the libraries
+            imported by a document (and its resources) or by all the documents
+            in the workspace.
+
+        :param IMonitor monitor:
+            Checked between the libraries (if cancelled, the libraries still
+            not created aren't created and no failure is recorded for those).
+
+        :return dict(tuple, bool):
+            The creation key -- (libname, additional_path, cwd, executable) --
+            of the libraries which were not available -> whether its libspec
+            was created (the reason for a failure may be gotten through
+            `get_library_creation_error`).
+        """
+        import time
+        from concurrent import futures
+
+        key_to_created = {}
+        to_create = []  # list(tuple(key, future))
+        to_wait = []  # list(tuple(key, future))
+        seen_keys = set()
+
+        for libname, current_doc_uri in libraries:
+            if self._has_library_info(libname):
+                # Note: if it's out of date, it's regenerated when requested.
+                continue
+
+            creation_args = self._get_libspec_creation_args(libname, current_doc_uri)
+            key = creation_args + (sys.executable,)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+
+            failure = self._get_valid_libspec_failure(
+                key, self._get_libspec_inputs_fingerprint(*creation_args)
+            )
+            if failure is not None and time.time() < failure.next_retry_time:
+                key_to_created[key] = False
+                continue
+
+            with self._libspec_creation_lock:
+                future = self._libspec_creation_key_to_future.get(key)
+                if future is not None:
+                    to_wait.append((key, future))
+                else:
+                    future = futures.Future()
+                    self._libspec_creation_key_to_future[key] = future
+                    to_create.append((key, future))
+
+        if to_create:
+            key_to_result = {}
+            pythonpath_folders = list(self._additional_pythonpath_folder_to_folder_info)
+            try:
+                key_to_result = self._create_libspecs_in_batch(
+                    [key[:3] for key, _future in to_create], monitor
+                )
+            finally:
+                for key, _future in to_create:
+                    result = key_to_result.get(key, (False, "", False))
+                    key_to_created[key] = bool(result and result[0])
+
+                # Note: the futures are resolved in the finally so that the
+                # threads waiting for those are always released (even if some
+                # callback fails). The failures are recorded before that as the
+                # waiting threads check those to know whether the result can
+                # be reused.
+                try:
+                    for key, _future in to_create:
+                        result = key_to_result.get(key, (False, "", False))
+                        if result is None:
+                            # Cancelled (so, not a failure).
+                            continue
+                        try:
+                            self._on_libspec_batch_item_finished(
+                                key, result, pythonpath_folders
+                            )
+                        except Exception:
+                            log.exception("Error finishing libspec creation: %s", key)
+
+                    if any(key_to_created.values()):
+                        self.synchronize_internal_libspec_folders()
+                finally:
+                    for key, future in to_create:
+                        with self._libspec_creation_lock:
+                            self._libspec_creation_key_to_future.pop(key, None)
+                        future.set_result(key_to_created[key])
+
+        for key, future in to_wait:
+            key_to_created[key] = future.result()
+        return key_to_created
+
+    def _on_libspec_batch_item_finished(self, key, result, pythonpath_folders):
+        created, output, timed_out = result
+        if created:
+            self._spec_filename_to_creation_args[
+                _norm_filename(self._get_libspec_filename(key[0]))
+            ] = key[:3]
+        self._on_libspec_creation_finished(
+            key,
+            self._get_libspec_inputs_fingerprint(
+                *key[:3], pythonpath_folders=pythonpath_folders
+            ),
+            created,
+            output,
+            timed_out,
+        )
+
+    def _create_libspecs_in_batch(self, creation_args_list, monitor=None):
+        """
+        :param list(tuple(str, str, str)) creation_args_list:
+            The (libname, additional_path, cwd) of the libraries to be created.
+
+        :param IMonitor monitor:
+            Checked between the libraries.
+
+        :return dict(tuple, tuple(bool, str, bool)|NoneType):
+            The creation key -> (created, output, timed_out) (None if it was
+            cancelled).
+
+        Note: the libspecs are generated in temporary files (so, the mutex of
+        each libspec is only held to publish it).
+        """
+        from robocorp_ls_core.system_mutex import timed_acquire_mutex
+        from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+        from robotframework_ls.impl.libspec_worker import LibdocWorkerError
+
+        def is_cancelled():
+            if monitor is not None:
+                try:
+                    monitor.check_cancelled()
+                except JsonRpcRequestCancelled:
+                    return True
+            return False
+
+        ret = {}
+        # list(tuple(creation_args, libspec_filename, tmp_libspec_filename,
+        # store_key, initial_stat_key, job))
+        pending = []
+        # Libraries with the same name (from different paths) are written to
+        # the same libspec, so, those can't be in the same batch.
+        same_libspec_creation_args = []
+        try:
+            for creation_args in creation_args_list:
+                libname, additional_path, cwd = creation_args
+                libspec_filename = self._get_libspec_filename(libname)
+                if any(item[1] == libspec_filename for item in pending):
+                    same_libspec_creation_args.append(creation_args)
+                    continue
+
+                args, pythonpath_entries = self._get_libdoc_args(
+                    libname, additional_path
+                )
+                tmp_libspec_filename = _get_tmp_libspec_filename(libspec_filename)
+                initial_stat_key = _get_libspec_stat_key(libspec_filename)
+                store_key = self._libspec_store.compute_key(
+                    libname, pythonpath_entries + ([cwd] if cwd else []) + sys.path
+                )
+                job = None
+                if store_key is None or not self._libspec_store.fetch(
+                    store_key, tmp_libspec_filename
+                ):
+                    job = {
+                        "args": args + [tmp_libspec_filename],
+                        "cwd": cwd,
+                        "reload_paths": pythonpath_entries + ([cwd] if cwd else []),
+                    }
+                else:
+                    store_key = None  # Already in the store.
+                pending.append(
+                    (
+                        creation_args,
+                        libspec_filename,
+                        tmp_libspec_filename,
+                        store_key,
+                        initial_stat_key,
+                        job,
+                    )
+                )
+
+            jobs = [item[-1] for item in pending if item[-1] is not None]
+            results = iter(())
+            if jobs:
+                log.debug(
+                    "Generating libspecs in batch for: %s",
+                    ", ".join(item[0][0] for item in pending if item[-1] is not None),
+                )
+                timeout = self._libdoc_timeout
+                if timeout is not None and timeout <= 0:
+                    timeout = None
+                try:
+                    with self._libspec_generation_semaphore:
+                        results = iter(
+                            self._get_libdoc_worker_pool(None).run_libdoc_batch(
+                                jobs, timeout=timeout, monitor=monitor
+                            )
+                        )
+                except LibdocWorkerError:
+                    log.exception(
+                        "Unable to generate libspecs in batch (each library will be generated separately)."
+                    )
+                    results = None
+
+            for (
+                creation_args,
+                libspec_filename,
+                tmp_libspec_filename,
+                store_key,
+                initial_stat_key,
+                job,
+            ) in pending:
+                key = creation_args + (sys.executable,)
+                libname, additional_path, cwd = creation_args
+                if job is not None:
+                    if results is None:
+                        if is_cancelled():
+                            ret[key] = None
+                        else:
+                            ret[key] = self._create_libspec_separately(
+                                libname, additional_path, cwd
+                            )
+                        continue
+
+                    result = next(results)
+                    if result is None:
+                        ret[key] = None
+                        continue
+
+                    returncode, output, elapsed, timed_out = result
+                    self._on_libspec_generation_finished(libname, elapsed)
+                    if returncode != 0 or not os.path.exists(tmp_libspec_filename):
+                        log.critical(
+                            "Error creating libspec: %s. Output:\n%s", libname, output
+                        )
+                        ret[key] = (False, output, timed_out)
+                        continue
+
+                with timed_acquire_mutex(_get_libspec_mutex_name(libspec_filename)):
+                    stat_key = _get_libspec_stat_key(libspec_filename)
+                    if stat_key is not None and stat_key != initial_stat_key:
+                        # Published by some other process in the meanwhile.
+                        log.debug(
+                            "Libspec published while generating: %s.", libspec_filename
+                        )
+                    else:
+                        if store_key is not None:
+                            self._libspec_store.publish(store_key, tmp_libspec_filename)
+                        self._publish_created_libspec(
+                            tmp_libspec_filename,
+                            libspec_filename,
+                            False,
+                            creation_args=creation_args,
+                        )
+                ret[key] = (True, "", False)
+
+            for creation_args in same_libspec_creation_args:
+                key = creation_args + (sys.executable,)
+                if is_cancelled():
+                    ret[key] = None
+                else:
+                    ret[key] = self._create_libspec_separately(*creation_args)
+        except Exception:
+            log.exception("Error creating libspecs in batch.")
+        finally:
+            for item in pending:
+                _remove_libspec(item[2])
+        return ret
+
+    def _create_libspec_separately(self, libname, additional_path, cwd):
+        """
+        :return tuple(bool, str, bool):
+            Whether it was created, the output and whether it timed out.
+        """
+        errors = []
+
+        def on_error(output, timed_out):
+            errors.append((output, timed_out))
+
+        created = self._create_libspec(
+            libname, additional_path=additional_path, cwd=cwd, on_error=on_error
+        )
+        return (
+            bool(created),
+            "\n".join(output for output, _timed_out in errors),
+            any(timed_out for _output, timed_out in errors),
+        )
+
+    def register_libspecs_regenerated_callback(self, callback):
+        """
+        :param callable callback:
+            Called as `callback(libnames)` (in a background thread) when
+            out-of-date libspecs are regenerated in the background.
+        """
+        self._on_libspecs_regenerated_callbacks.append(callback)
+
+    def register_libspecs_changed_callback(self, callback):
+        """
+        :param callable callback:
+            Called as `callback(libnames)` when a libspec is added, changed or
+            removed in the folders tracked (i.e.: a libspec created by this or
+            some other process or a .libspec file in the workspace).
+
+            Note: called in the thread which created the libspec when it's
+            created by this manager or in a background thread otherwise.
+        """
+        self._on_libspecs_changed_callbacks.append(callback)
+
+    def _on_lib_info_invalidated(self, lib_info):
+        """
+        Called when the sources of a library change (so, its libspec is
+        regenerated right away instead of waiting for it to be requested).
+        """
+        creation_args = self._spec_filename_to_creation_args.get(
+            _norm_filename(lib_info.canonical_spec_filename)
+        )
+        if creation_args is None:
+            # i.e.: created in a previous session (or by another process).
+            creation_args = _load_spec_filename_additional_info(
+                lib_info.canonical_spec_filename
+            ).get(_CREATION_ARGS)
+            if not creation_args or len(creation_args) != 3:
+                return
+            libname, additional_path, cwd = creation_args
+            if cwd and not os.path.isdir(cwd):
+                return
+            creation_args = (libname, additional_path, cwd)
+
+        self._schedule_libspec_regeneration(*creation_args)
+
+    def _schedule_libspec_regeneration(
+        self, libname, additional_path, cwd, lib_args=()
+    ):
+        """
+        :param tuple(str) lib_args:
+            The arguments used to import the library (if any).
+
+        :return bool:
+            Whether the libspec regeneration was scheduled (or was already
+            scheduled).
+        """
+        from concurrent import futures
+
+        key = (libname, additional_path, cwd, sys.executable)
+        if lib_args:
+            key += (lib_args,)
+        with self._libspec_creation_lock:
+            if self._disposed:
+                return False
+
+            if key in self._regeneration_scheduled_keys:
+                return True
+
+            if self._regeneration_executor is None:
+                self._regeneration_executor = futures.ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENT_LIBSPEC_GENERATIONS,
+                    thread_name_prefix="LibspecRegeneration",
+                )
+            self._regeneration_scheduled_keys.add(key)
+            try:
+                self._regeneration_executor.submit(
+                    self._regenerate_libspec,
+                    key,
+                    libname,
+                    additional_path,
+                    cwd,
+                    lib_args,
+                )
+            except Exception:
+                self._regeneration_scheduled_keys.discard(key)
+                log.exception("Unable to schedule libspec regeneration.")
+                return False
+        log.debug("Scheduled libspec regeneration for: %s", libname)
+        return True
+
+    def _regenerate_libspec(self, key, libname, additional_path, cwd, lib_args=()):
+        created = False
+        try:
+            created = self._create_libspec_single_flight(
+                libname, additional_path, cwd, lib_args
+            )
+            if created and lib_args:
+                # The libspecs with args are kept in memory separately.
+                self._get_lib_info_with_args(
+                    self._get_libspec_filename(libname, lib_args), reload=True
+                )
+                self._evict_libspecs_with_args()
+        except Exception:
+            log.exception("Error regenerating libspec for: %s", libname)
+        finally:
+            with self._libspec_creation_lock:
+                self._regeneration_scheduled_keys.discard(key)
+
+        if created and not self._disposed:
+            for callback in list(self._on_libspecs_regenerated_callbacks):
+                try:
+                    callback([libname])
+                except Exception:
+                    log.exception("Error notifying libspec regeneration.")
+
+    def _evict_libspecs_with_args(self):
+        """
+        Removes the libspecs of libraries imported with arguments which were
+        least recently used (or generated) if there are more than
+        MAX_LIBSPECS_WITH_ARGS.
+        """
+        libspec_dir = self._user_libspec_with_args_dir
+        try:
+            filenames = [
+                os.path.join(libspec_dir, filename)
+                for filename in os.listdir(libspec_dir)
+                if filename.endswith(".libspec")
+                and not _is_tmp_libspec_filename(filename)
+            ]
+        except Exception:
+            log.exception("Unable to list: %s", libspec_dir)
+            return
+
+        remove_count = len(filenames) - MAX_LIBSPECS_WITH_ARGS
+        if remove_count <= 0:
+            return
+
+        def get_mtime(filename):
+            try:
+                return os.path.getmtime(filename)
+            except Exception:
+                return 0
+
+        with self._libspec_with_args_lock:
+            # The ones in memory are the most recently used (in order).
+            in_memory = list(self._libspec_with_args_filename_to_lib_info.keys())
+
+        recency = dict((filename, i) for i, filename in enumerate(in_memory))
+        filenames.sort(
+            key=lambda filename: (
+                recency.get(_norm_filename(filename), -1),
+                get_mtime(filename),
+            )
+        )
+        for filename in filenames[:remove_count]:
+            log.debug("Removing libspec (too many libspecs with args): %s", filename)
+            with self._libspec_with_args_lock:
+                self._libspec_with_args_filename_to_lib_info.pop(
+                    _norm_filename(filename), None
+                )
+            _remove_libspec(filename)
+
+    def _get_lib_info_with_args(self, spec_filename, reload):
+        """
+        :param reload:
+            If True, the libspec is always reloaded from the disk.
+
+        :rtype: _LibInfo|NoneType
+        """
+        key = _norm_filename(spec_filename)
+        with self._libspec_with_args_lock:
+            filename_to_lib_info = self._libspec_with_args_filename_to_lib_info
+            lib_info = filename_to_lib_info.get(key)
+            if lib_info is not None and not reload:
+                filename_to_lib_info.move_to_end(key)
+                return lib_info
+
+        if not os.path.exists(spec_filename):
+            return None
+        lib_info = _load_lib_info(spec_filename, can_regenerate=True)
+        if lib_info is None:
+            return None
+
+        with self._libspec_with_args_lock:
+            filename_to_lib_info[key] = lib_info
+            filename_to_lib_info.move_to_end(key)
+            while len(filename_to_lib_info) > MAX_LIBSPECS_WITH_ARGS:
+                filename_to_lib_info.popitem(last=False)
+        return lib_info
+
+    def _library_doc_depends_on_args(self, library_doc):
+        keyword_names = self._args_independent_spec_filename_to_keyword_names.get(
+            library_doc.filename
+        )
+        if keyword_names is not None and keyword_names == [
+            k.name for k in library_doc.keywords
+        ]:
+            return False
+        # If the library doesn't accept arguments, there's nothing to do.
+        return any(init.args for init in library_doc.inits)
+
+    def _get_library_info_with_args(
+        self, libname, lib_args, library_doc, create, current_doc_uri
+    ):
+        """
+        :param LibraryDoc library_doc:
+            The library doc for the library without arguments (returned if the
+            libspec with the given arguments isn't available).
+        """
+        libname, additional_path, cwd = self._get_libspec_creation_args(
+            libname, current_doc_uri
+        )
+        spec_filename = self._get_libspec_filename(libname, lib_args)
+        lib_info = self._get_lib_info_with_args(spec_filename, reload=False)
+        if lib_info is None or not lib_info.verify_sources_sync(
+            self._library_sources_tracker
+        ):
+            if not create:
+                return library_doc
+
+            # If found but not in sync, serve the stale version and regenerate
+            # it in the background (listeners are notified when the new
+            # version is available).
+            if lib_info is None or not self._schedule_libspec_regeneration(
+                libname, additional_path, cwd, lib_args
+            ):
+                if not self._create_libspec_single_flight(
+                    libname, additional_path, cwd, lib_args
+                ):
+                    return library_doc
+                lib_info = self._get_lib_info_with_args(spec_filename, reload=True)
+                self._evict_libspecs_with_args()
+                if lib_info is None:
+                    return library_doc
+
+        with_args_doc = lib_info.library_doc
+        keyword_names = [k.name for k in library_doc.keywords]
+        if [k.name for k in with_args_doc.keywords] == keyword_names:
+            # The keywords don't depend on the arguments (i.e.: static library
+            # which accepts arguments): other imports with different arguments
+            # can use the libspec without arguments.
+            with self._libspec_with_args_lock:
+                cp = self._args_independent_spec_filename_to_keyword_names.copy()
+                cp[library_doc.filename] = keyword_names
+                self._args_independent_spec_filename_to_keyword_names = cp
+            return library_doc
+        return with_args_doc
+
+    def _get_normalized_libname(self, libname):
+        return get_normalized_libname(libname)
+
+    def _has_library_info(self, libname):
+        """
+        :return bool:
+            Whether there's some libspec for the given library (even if it's
+            out of date).
+        """
+        libname_lower = self._get_normalized_libname(libname)
+        for lib_info in self._iter_lib_info_for_name(libname_lower):
+            name = lib_info.library_doc.name
+            if name and name.lower() == libname_lower:
+                return True
         return False
 
-    def get_library_info(self, libname, create=True, current_doc_uri=None):
+    def get_library_info(
+        self, libname, create=True, current_doc_uri=None, lib_args=None
+    ):
         """
         :param libname:
             It may be a library name, a relative path to a .py file or an
             absolute path to a .py file.
 
+        :param tuple(str) lib_args:
+            The arguments used to import the library (the keywords of dynamic
+            libraries may depend on those).
+
         :rtype: LibraryDoc
         """
-        libname_lower = libname.lower()
-        if libname_lower.endswith((".py", ".class", ".java")):
-            libname_lower = os.path.splitext(libname_lower)[0]
+        if lib_args:
+            library_doc = self.get_library_info(
+                libname, create=create, current_doc_uri=current_doc_uri
+            )
+            if library_doc is None or not self._library_doc_depends_on_args(
+                library_doc
+            ):
+                return library_doc
+            return self._get_library_info_with_args(
+                libname, tuple(lib_args), library_doc, create, current_doc_uri
+            )
 
-        if "/" in libname_lower or "\\" in libname_lower:
-            libname_lower = os.path.basename(libname_lower)
+        library_doc, found = self._get_library_info(libname, create, current_doc_uri)
+        with self._stats_lock:
+            self._get_library_info_stats[found] += 1
+        return library_doc
 
-        for lib_info in self._iter_lib_info():
+    def _get_library_info(self, libname, create, current_doc_uri):
+        """
+        :return tuple(LibraryDoc|NoneType, str):
+            The library doc and how it was found: "hits" (available and in
+            sync), "staleHits" (out of date and being regenerated in the
+            background) or "misses" (it had to be generated or wasn't found).
+        """
+        libname_lower = self._get_normalized_libname(libname)
+        for lib_info in self._iter_lib_info_for_name(libname_lower):
             library_doc = lib_info.library_doc
             if library_doc.name and library_doc.name.lower() == libname_lower:
-                if not lib_info.verify_sources_sync():
+                if not lib_info.verify_sources_sync(self._library_sources_tracker):
                     if create:
-                        # Found but it's not in sync. Try to regenerate (don't proceed
-                        # because we don't want to match a lower priority item, so,
-                        # regenerate and get from the cache without creating).
+                        # Found but it's not in sync: serve the stale version and
+                        # regenerate it in the background (listeners are notified
+                        # when the new version is available).
+                        if self._schedule_libspec_regeneration(
+                            *self._get_libspec_creation_args(libname, current_doc_uri)
+                        ):
+                            return library_doc, "staleHits"
+
+                        # Unable to regenerate in the background. Try to regenerate
+                        # (don't proceed because we don't want to match a lower
+                        # priority item, so, regenerate and get from the cache
+                        # without creating).
                         self._do_create_libspec_on_get(libname, current_doc_uri)
 
                         # Note: get even if it if was not created (we may match
                         # a lower priority library).
-                        return self.get_library_info(
-                            libname, create=False, current_doc_uri=current_doc_uri
+                        library_doc, _found = self._get_library_info(
+                            libname, False, current_doc_uri
                         )
+                        return library_doc, "misses"
                     else:
                         # Not in sync and it should not be created, just skip it.
                         continue
                 else:
-                    return library_doc
+                    return library_doc, "hits"
 
         if create:
             if self._do_create_libspec_on_get(libname, current_doc_uri):
-                return self.get_library_info(
-                    libname, create=False, current_doc_uri=current_doc_uri
+                library_doc, _found = self._get_library_info(
+                    libname, False, current_doc_uri
                 )
+                return library_doc, "misses"
 
         log.debug("Unable to find library named: %s", libname)
-        return None
+        return None, "misses"
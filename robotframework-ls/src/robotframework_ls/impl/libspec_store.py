@@ -0,0 +1,326 @@
+"""
+Content-addressed store for .libspec files.
+
+The libspecs generated for the user libraries are also saved in a store which
+is keyed by the library name, the version of the distribution which provides
+it, the robot version and the hash of the library sources (so, the same
+library found in different interpreters -- or machines -- may reuse the same
+libspec instead of running libdoc again).
+
+Layout:
+
+    <store>/<libname>/<distribution version>_<robot version>_<hash>.libspec
+    <store>/<libname>/<distribution version>_<robot version>_<hash>.sources.json
+
+The sources in the stored .libspec which are inside the folder where the
+library module was found are saved relative to that folder (so that they can
+be rebased to the folder where the library is found when the libspec is
+fetched). The `.sources.json` has the hash of each source referenced by the
+libspec (so, a libspec is only reused if all those sources are the same).
+
+Besides the local store (which is writable), read-only stores (i.e.: a folder
+shared by a team or a folder pre-seeded in a CI image) may be used to fetch
+libspecs.
+"""
+import os
+import json
+from functools import lru_cache
+from typing import Optional, Dict, List, Callable, Sequence, Tuple
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+_MODULE_ROOT = "${module_root}"
+
+
+class LibspecStoreKey(object):
+    __slots__ = ["libname", "entry_name", "module_root"]
+
+    def __init__(self, libname: str, entry_name: str, module_root: str):
+        self.libname = libname
+        self.entry_name = entry_name
+        self.module_root = module_root
+
+    def __str__(self):
+        return "LibspecStoreKey(%s/%s)" % (self.libname, self.entry_name)
+
+    __repr__ = __str__
+
+
+def _hash_file(
+    filename: str, filename_to_hash_info: Dict[str, Tuple[int, int, str]]
+) -> Optional[str]:
+    """
+    :param filename_to_hash_info:
+        Cache with the hashes already computed (filename -> (mtime, size, hash)),
+        so, a file is only read again if its mtime or size changed.
+    """
+    import hashlib
+
+    try:
+        stat = os.stat(filename)
+        hash_info = filename_to_hash_info.get(filename)
+        if hash_info is not None and hash_info[:2] == (stat.st_mtime_ns, stat.st_size):
+            return hash_info[2]
+
+        with open(filename, "rb") as stream:
+            file_hash = hashlib.sha256(stream.read()).hexdigest()
+        filename_to_hash_info[filename] = (stat.st_mtime_ns, stat.st_size, file_hash)
+        return file_hash
+    except Exception:
+        return None
+
+
+def _iter_package_sources(package_dir: str):
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for filename in sorted(files):
+            if filename.endswith(".py"):
+                yield os.path.join(root, filename)
+
+
+def _get_packages_distributions_func():
+    try:
+        from importlib import metadata  # @UnresolvedImport
+
+        if hasattr(metadata, "packages_distributions"):  # Python 3.10 onwards
+            return metadata.packages_distributions, metadata.version
+    except ImportError:
+        pass
+
+    try:
+        import importlib_metadata  # @UnresolvedImport
+
+        if hasattr(importlib_metadata, "packages_distributions"):
+            return importlib_metadata.packages_distributions, importlib_metadata.version
+    except ImportError:
+        pass
+
+    return None
+
+
+def _get_pkg_resources_distribution_version(module_name: str) -> Optional[str]:
+    try:
+        import pkg_resources
+    except ImportError:
+        return None
+
+    for dist in pkg_resources.working_set:
+        try:
+            if not dist.has_metadata("top_level.txt"):
+                continue
+            if module_name in dist.get_metadata_lines("top_level.txt"):
+                return dist.version
+        except Exception:
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_distribution_version(module_name: str) -> str:
+    """
+    Note: the key already has the hash of the sources, so, this is just
+    an additional safeguard (i.e.: "0" is returned if the version can't be
+    found) and it's computed only once per module in the process (as getting
+    it requires a scan of all the installed distributions).
+    """
+    try:
+        funcs = _get_packages_distributions_func()
+        if funcs is not None:
+            packages_distributions, get_version = funcs
+            distributions = packages_distributions().get(module_name)
+            if distributions:
+                return get_version(distributions[0])
+        else:
+            version = _get_pkg_resources_distribution_version(module_name)
+            if version:
+                return version
+    except Exception:
+        log.debug("Unable to get distribution version for: %s", module_name)
+    return "0"
+
+
+def _map_sources(contents: str, on_source: Callable[[str], str]) -> str:
+    """
+    Calls `on_source` for each `source` in the libspec contents and replaces
+    it with the returned value.
+    """
+    import re
+    from xml.sax.saxutils import escape, unescape
+
+    def _on_match(match):
+        source = on_source(unescape(match.group(1), {"&quot;": '"'}))
+        return 'source="%s"' % (escape(source, {'"': "&quot;"}),)
+
+    return re.sub(r'source="([^"]*)"', _on_match, contents)
+
+
+def _write_atomic(filename: str, contents: str) -> None:
+    import threading
+
+    # Note: the thread id is needed because the same file may be written by
+    # multiple threads in the same process.
+    tmp_filename = "%s.%s.%s.tmp" % (filename, os.getpid(), threading.get_ident())
+    with open(tmp_filename, "w", encoding="utf-8") as stream:
+        stream.write(contents)
+    os.replace(tmp_filename, filename)
+
+
+class LibspecStore(object):
+    def __init__(self, store_dir: str, robot_version: str):
+        self._store_dir = store_dir
+        self._robot_version = robot_version
+        self.read_only_store_dirs: Sequence[str] = ()
+        # Note: a dict is thread-safe for the get/set done in _hash_file.
+        self._filename_to_hash_info: Dict[str, Tuple[int, int, str]] = {}
+
+    def compute_key(
+        self, libname: str, search_paths: List[str]
+    ) -> Optional[LibspecStoreKey]:
+        """
+        :param libname:
+            The name of the library (i.e.: `module` or `module.ClassName`).
+
+        :param search_paths:
+            The paths where the library module should be searched (in order).
+
+        :return:
+            The key for the library or None if its sources couldn't be found
+            (i.e.: the module couldn't be found or isn't a python module).
+        """
+        import hashlib
+        from importlib.machinery import PathFinder
+
+        module_name = libname.split(".")[0]
+        try:
+            spec = PathFinder.find_spec(module_name, search_paths)
+        except Exception:
+            log.debug("Unable to find module: %s", module_name)
+            return None
+
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            return None
+
+        if spec.submodule_search_locations:
+            package_dir = os.path.dirname(spec.origin)
+            module_root = os.path.dirname(package_dir)
+            sources = list(_iter_package_sources(package_dir))
+        else:
+            module_root = os.path.dirname(spec.origin)
+            sources = [spec.origin]
+
+        sha256 = hashlib.sha256()
+        for source in sources:
+            file_hash = _hash_file(source, self._filename_to_hash_info)
+            if file_hash is None:
+                return None
+            sha256.update(os.path.relpath(source, module_root).encode("utf-8"))
+            sha256.update(file_hash.encode("ascii"))
+
+        entry_name = "%s_%s_%s" % (
+            _get_distribution_version(module_name),
+            self._robot_version,
+            sha256.hexdigest()[:32],
+        )
+        return LibspecStoreKey(libname, entry_name, module_root)
+
+    def _iter_entry_dirs(self, key: LibspecStoreKey):
+        for store_dir in list(self.read_only_store_dirs) + [self._store_dir]:
+            yield os.path.join(store_dir, key.libname)
+
+    def fetch(self, key: LibspecStoreKey, libspec_filename: str) -> bool:
+        """
+        Writes the libspec for the given key (if available in some store) to
+        the given filename.
+
+        :return:
+            Whether the libspec was found in some store.
+        """
+        for entry_dir in self._iter_entry_dirs(key):
+            stored_libspec = os.path.join(entry_dir, key.entry_name + ".libspec")
+            if not os.path.isfile(stored_libspec):
+                continue
+
+            try:
+                with open(
+                    os.path.join(entry_dir, key.entry_name + ".sources.json"), "r"
+                ) as stream:
+                    source_to_hash: Dict[str, str] = json.load(stream)
+
+                with open(stored_libspec, "r", encoding="utf-8") as stream:
+                    contents = stream.read()
+            except Exception:
+                log.exception("Error reading libspec from store: %s", stored_libspec)
+                continue
+
+            def to_local(source):
+                if source.startswith(_MODULE_ROOT):
+                    parts = source[len(_MODULE_ROOT) + 1 :].split("/")
+                    return os.path.join(key.module_root, *parts)
+                return source
+
+            if any(
+                _hash_file(to_local(source), self._filename_to_hash_info) != file_hash
+                for source, file_hash in source_to_hash.items()
+            ):
+                log.debug("Sources differ from the ones in: %s", stored_libspec)
+                continue
+
+            try:
+                _write_atomic(libspec_filename, _map_sources(contents, to_local))
+            except Exception:
+                log.exception("Error writing libspec: %s", libspec_filename)
+                return False
+
+            log.debug("Libspec for %s fetched from: %s", key.libname, stored_libspec)
+            return True
+        return False
+
+    def publish(self, key: LibspecStoreKey, libspec_filename: str) -> None:
+        """
+        Saves the given libspec (generated for the library with the given key)
+        in the local store.
+        """
+        entry_dir = os.path.join(self._store_dir, key.libname)
+        libspec_dir = os.path.dirname(libspec_filename)
+        module_root = os.path.normcase(os.path.normpath(key.module_root))
+        source_to_hash: Dict[str, Optional[str]] = {}
+
+        def to_stored(source):
+            if not os.path.isabs(source):
+                source = os.path.join(libspec_dir, source)
+            source = os.path.normpath(source)
+
+            stored = source
+            if os.path.normcase(source).startswith(module_root + os.sep):
+                relative = os.path.relpath(source, key.module_root)
+                stored = _MODULE_ROOT + "/" + relative.replace(os.sep, "/")
+
+            source_to_hash[stored] = _hash_file(source, self._filename_to_hash_info)
+            return stored
+
+        try:
+            with open(libspec_filename, "r", encoding="utf-8") as stream:
+                contents = _map_sources(stream.read(), to_stored)
+
+            if None in source_to_hash.values():
+                # Some source couldn't be read (so, it can't be validated later).
+                return
+
+            try:
+                os.makedirs(entry_dir)
+            except Exception:
+                pass  # Ignore if it's already there.
+
+            # Note: the libspec is written last (if it's there the sources are
+            # also there).
+            _write_atomic(
+                os.path.join(entry_dir, key.entry_name + ".sources.json"),
+                json.dumps(source_to_hash, indent=2, sort_keys=True),
+            )
+            _write_atomic(
+                os.path.join(entry_dir, key.entry_name + ".libspec"), contents
+            )
+        except Exception:
+            log.exception("Error saving libspec to store: %s", libspec_filename)
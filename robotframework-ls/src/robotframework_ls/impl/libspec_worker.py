@@ -0,0 +1,417 @@
+"""
+Pool of long-lived processes used to generate libspec files.
+
+Each worker is a `libspec_worker__main__.py` process which keeps `robot` (and
+the libraries which don't change) imported, so, generating a libspec doesn't
+need to pay for the interpreter startup and imports each time.
+"""
+import os
+import sys
+import threading
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+__file__ = os.path.abspath(__file__)
+if __file__.endswith((".pyc", ".pyo")):
+    __file__ = __file__[:-1]
+
+_WORKER_MAIN = os.path.join(os.path.dirname(__file__), "libspec_worker__main__.py")
+
+# A worker is recycled after running this number of jobs.
+MAX_JOBS_PER_WORKER = 50
+
+# A worker is recycled if its memory grows more than this amount.
+MAX_MEMORY_GROWTH_PER_WORKER = 500 * 1024 * 1024  # 500 MB
+
+
+class LibdocWorkerError(Exception):
+    """
+    Raised when it's not possible to communicate with the worker (i.e.: the
+    process couldn't be started or it died).
+    """
+
+
+class LibdocWorkerTimeoutError(LibdocWorkerError):
+    """
+    Raised when a job didn't finish in the given timeout (in which case the
+    worker and its subprocesses are killed).
+    """
+
+
+def _stderr_reader(pid, stream):
+    # Note: the output of the libraries is captured by the worker, so, what's
+    # written here are errors from the worker itself (i.e.: crash tracebacks).
+    try:
+        while True:
+            line = stream.readline()
+            if not line:
+                break
+            log.info(
+                "Libdoc worker (pid: %s) stderr: %s",
+                pid,
+                line.decode("utf-8", "replace").rstrip(),
+            )
+    except:
+        log.exception("Error reading stderr from libdoc worker (pid: %s).", pid)
+    finally:
+        try:
+            stream.close()
+        except Exception:
+            pass
+
+
+class _LibdocWorker(object):
+    def __init__(self, python_exe, env):
+        from robocorp_ls_core.subprocess_wrapper import subprocess
+
+        self.jobs_run = 0
+        self.initial_maxrss = -1
+        self.maxrss = -1
+        self._timed_out = False
+
+        try:
+            self._process = subprocess.Popen(
+                [python_exe, "-u", _WORKER_MAIN],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+            )
+        except Exception as e:
+            raise LibdocWorkerError("Unable to start libdoc worker: %s" % (e,))
+
+        t = threading.Thread(
+            target=_stderr_reader, args=(self._process.pid, self._process.stderr)
+        )
+        t.name = "Stderr from libdoc worker (%s)" % (self._process.pid,)
+        t.daemon = True
+        t.start()
+
+        log.debug("Started libdoc worker (pid: %s).", self._process.pid)
+
+    @property
+    def pid(self):
+        return self._process.pid
+
+    def _on_timeout(self):
+        from robocorp_ls_core.basic import kill_process_and_subprocesses
+
+        self._timed_out = True
+        try:
+            kill_process_and_subprocesses(self._process.pid)
+        except Exception:
+            log.exception("Error killing libdoc worker (pid: %s).", self._process.pid)
+
+    def _send(self, job):
+        import json
+
+        process = self._process
+        try:
+            process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+            process.stdin.flush()
+        except (IOError, OSError) as e:
+            raise LibdocWorkerError("Error communicating with libdoc worker: %s" % (e,))
+
+    def _read_result(self, args, timeout):
+        """
+        Reads the result of the job with the given args (the worker is killed
+        if it's not available in the given timeout).
+        """
+        import json
+
+        process = self._process
+        timer = None
+        if timeout:
+            timer = threading.Timer(timeout, self._on_timeout)
+            timer.daemon = True
+            timer.start()
+        try:
+            try:
+                line = process.stdout.readline()
+            except (IOError, OSError) as e:
+                if self._timed_out:
+                    line = b""
+                else:
+                    raise LibdocWorkerError(
+                        "Error communicating with libdoc worker: %s" % (e,)
+                    )
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        if self._timed_out:
+            raise LibdocWorkerTimeoutError(
+                "Libdoc worker timed out after %ss (args: %s)."
+                % (timeout, " ".join(args))
+            )
+
+        if not line:
+            raise LibdocWorkerError(
+                "Libdoc worker exited (returncode: %s)." % (process.poll(),)
+            )
+
+        result = json.loads(line.decode("utf-8"))
+        self.jobs_run += 1
+        maxrss = result.get("maxrss", -1)
+        if self.initial_maxrss == -1:
+            self.initial_maxrss = maxrss
+        self.maxrss = maxrss
+        return result
+
+    def run(self, job, timeout=None):
+        """
+        :param dict job:
+        :param float timeout:
+            If given, the worker (and its subprocesses) is killed if the job
+            doesn't finish in this amount of seconds.
+
+        :return dict:
+            The result from the worker.
+        """
+        self._send(job)
+        return self._read_result(job["args"], timeout)
+
+    def run_batch(self, jobs, timeout=None):
+        """
+        :param list(dict) jobs:
+        :param float timeout:
+            If given, the worker (and its subprocesses) is killed if some job
+            doesn't finish in this amount of seconds.
+
+        :return iterator(dict):
+            The result from the worker for each job (as soon as it finishes).
+        """
+        self._send({"jobs": jobs})
+        for job in jobs:
+            yield self._read_result(job["args"], timeout)
+
+    def should_recycle(self):
+        if self.jobs_run >= MAX_JOBS_PER_WORKER:
+            return True
+
+        if self.initial_maxrss != -1 and self.maxrss != -1:
+            if self.maxrss - self.initial_maxrss > MAX_MEMORY_GROWTH_PER_WORKER:
+                return True
+
+        return False
+
+    def dispose(self):
+        process = self._process
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+
+        try:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        except Exception:
+            log.exception("Error killing libdoc worker (pid: %s).", process.pid)
+
+        try:
+            process.stdout.close()
+        except Exception:
+            pass
+
+
+class LibdocWorkerPool(object):
+    """
+    Pool of libdoc workers for a given interpreter/environment.
+
+    To be used as:
+
+        pool = LibdocWorkerPool(sys.executable)
+        returncode, output = pool.run_libdoc(["MyLib", "/out/MyLib.libspec"])
+        ...
+        pool.dispose()
+    """
+
+    def __init__(self, python_exe=None, env=None, max_workers=None):
+        self._python_exe = python_exe or sys.executable
+        self._env = env
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self._max_workers = max_workers
+
+        self._condition = threading.Condition()
+        self._idle_workers = []
+        self._workers_count = 0
+        self._disposed = False
+
+    def _acquire_worker(self):
+        with self._condition:
+            while True:
+                if self._disposed:
+                    raise LibdocWorkerError("Libdoc worker pool already disposed.")
+
+                if self._idle_workers:
+                    return self._idle_workers.pop()
+
+                if self._workers_count < self._max_workers:
+                    self._workers_count += 1
+                    break
+
+                self._condition.wait()
+
+        # Create the worker without holding the lock.
+        try:
+            return _LibdocWorker(self._python_exe, self._env)
+        except:
+            with self._condition:
+                self._workers_count -= 1
+                self._condition.notify()
+            raise
+
+    def _release_worker(self, worker, dispose):
+        with self._condition:
+            if dispose or self._disposed or worker.should_recycle():
+                self._workers_count -= 1
+                dispose = True
+            else:
+                self._idle_workers.append(worker)
+            self._condition.notify()
+
+        if dispose:
+            log.debug(
+                "Disposing libdoc worker (pid: %s, jobs run: %s).",
+                worker.pid,
+                worker.jobs_run,
+            )
+            worker.dispose()
+
+    def run_libdoc(self, args, cwd=None, reload_paths=(), timeout=None):
+        """
+        :param list(str) args:
+            The arguments to pass to libdoc.
+
+        :param list(str) reload_paths:
+            Modules loaded from those paths are always re-imported in the
+            next job.
+
+        :param float timeout:
+            The timeout (in seconds) for the job (None means no timeout).
+
+        :return tuple(int, str):
+            The libdoc return code and its output.
+
+        :raise LibdocWorkerTimeoutError:
+            If the job didn't finish in the given timeout.
+
+        :raise LibdocWorkerError:
+            If it was not possible to run the job in a worker.
+        """
+        worker = self._acquire_worker()
+        dispose = True
+        try:
+            result = worker.run(
+                {"args": list(args), "cwd": cwd, "reload_paths": list(reload_paths)},
+                timeout=timeout,
+            )
+            dispose = False
+        finally:
+            self._release_worker(worker, dispose)
+
+        return result.get("returncode", -1), result.get("output", "")
+
+    def run_libdoc_batch(self, jobs, timeout=None, monitor=None):
+        """
+        Runs multiple libdoc jobs in a single worker job.
+
+        If some job times out (or its worker dies), it's reported as a failure
+        and the jobs after it are run in a new worker (the jobs which already
+        finished aren't run again).
+
+        :param list(dict) jobs:
+            Each job is a dict with `args`, `cwd` and `reload_paths` (as the
+            parameters of `run_libdoc`).
+
+        :param float timeout:
+            The timeout (in seconds) for each job (None means no timeout).
+
+        :param IMonitor monitor:
+            Checked after each job: if cancelled, the jobs still not finished
+            aren't run (the worker running them is disposed).
+
+        :return list(tuple(int, str, float, bool)|NoneType):
+            The libdoc return code, its output, the time (in seconds) it
+            took and whether it timed out for each job (None for the jobs
+            not run because the monitor was cancelled).
+
+        :raise LibdocWorkerError:
+            If it was not possible to run the batch in a worker.
+        """
+        from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+
+        jobs = [
+            {
+                "args": list(job["args"]),
+                "cwd": job.get("cwd"),
+                "reload_paths": list(job.get("reload_paths", ())),
+            }
+            for job in jobs
+        ]
+
+        def is_cancelled():
+            if monitor is not None:
+                try:
+                    monitor.check_cancelled()
+                except JsonRpcRequestCancelled:
+                    return True
+            return False
+
+        results = []
+        while len(results) < len(jobs):
+            pending_jobs = jobs[len(results) :]
+            if is_cancelled():
+                log.debug(
+                    "Libdoc batch cancelled (%s jobs not run).", len(pending_jobs)
+                )
+                results.extend(None for _job in pending_jobs)
+                break
+
+            try:
+                worker = self._acquire_worker()
+            except LibdocWorkerError as e:
+                if not results:
+                    raise
+                results.extend((-1, str(e), -1, False) for _job in pending_jobs)
+                break
+
+            dispose = True
+            try:
+                for result in worker.run_batch(pending_jobs, timeout=timeout):
+                    results.append(
+                        (
+                            result.get("returncode", -1),
+                            result.get("output", ""),
+                            result.get("elapsed", -1),
+                            False,
+                        )
+                    )
+                    if len(results) < len(jobs) and is_cancelled():
+                        # Note: the worker is still running the other jobs,
+                        # so, it's disposed.
+                        break
+                else:
+                    dispose = False
+            except LibdocWorkerTimeoutError as e:
+                results.append((-1, str(e), timeout, True))
+            except LibdocWorkerError as e:
+                results.append((-1, str(e), -1, False))
+            finally:
+                self._release_worker(worker, dispose)
+        return results
+
+    def dispose(self):
+        with self._condition:
+            self._disposed = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+            self._workers_count -= len(idle_workers)
+            self._condition.notify_all()
+
+        for worker in idle_workers:
+            worker.dispose()
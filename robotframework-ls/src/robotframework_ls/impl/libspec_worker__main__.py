@@ -0,0 +1,225 @@
+"""
+Worker used to generate libspec files (through `robot.libdoc`) without having
+to start a new process for each library.
+
+It's started by the LibspecManager as:
+
+    python -u libspec_worker__main__.py
+
+and then it receives jobs (one json per line) in its stdin and writes the
+result of each job (one json per line) to its stdout.
+
+i.e.:
+
+    stdin:  {"args": ["-P", "/my/path", "MyLib", "/out/MyLib.libspec"], "cwd": "/my", "reload_paths": ["/my/path"]}
+    stdout: {"returncode": 0, "output": "/out/MyLib.libspec\n", "maxrss": 43024384, "elapsed": 0.4}
+
+Multiple libspecs may be generated in a single job (the result of each job in
+the batch is written in a separate line as soon as it finishes, so, the
+timeout may be applied to each job):
+
+    stdin:  {"jobs": [{"args": ["LibA", "/out/LibA.libspec"]}, {"args": ["LibB", "/out/LibB.libspec"]}]}
+    stdout: {"returncode": 0, "output": ..., "maxrss": 43024384, "elapsed": 0.4}
+    stdout: {"returncode": 1, "output": ..., "maxrss": 43024384, "elapsed": 0.1}
+
+Note: this module runs standalone in the target interpreter (so, it may only
+import robot and the standard library).
+"""
+import json
+import os
+import sys
+import traceback
+
+
+def _get_maxrss():
+    """
+    :return int:
+        The max resident memory (in bytes) used by this process or -1 if it
+        can't be gotten.
+    """
+    try:
+        import resource
+    except ImportError:
+        return -1
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return maxrss
+    return maxrss * 1024  # In linux it's in kilobytes.
+
+
+def _get_module_filename(module):
+    filename = getattr(module, "__file__", None)
+    if not filename or not isinstance(filename, str):
+        return None
+    return filename
+
+
+class _ModulesTracker(object):
+    """
+    Helper to track the modules loaded so that they can be re-imported
+    when changed (robot and the already imported libraries are kept loaded
+    across jobs).
+    """
+
+    def __init__(self):
+        self._module_name_to_mtime = {}
+
+    def update(self):
+        for name, module in list(sys.modules.items()):
+            if name not in self._module_name_to_mtime:
+                filename = _get_module_filename(module)
+                mtime = None
+                if filename:
+                    try:
+                        mtime = os.path.getmtime(filename)
+                    except Exception:
+                        pass
+                self._module_name_to_mtime[name] = mtime
+
+    def _remove(self, name):
+        self._module_name_to_mtime.pop(name, None)
+        if name == "robot" or name.startswith("robot."):
+            return
+        sys.modules.pop(name, None)
+
+    def remove_changed(self):
+        """
+        Removes the top-level packages with some changed module (the parent
+        packages and the sibling modules may have references to the
+        changed module, so, the whole package must be imported again).
+        """
+        changed_packages = set()
+        for name, mtime in list(self._module_name_to_mtime.items()):
+            module = sys.modules.get(name)
+            if module is None:
+                self._module_name_to_mtime.pop(name, None)
+                continue
+
+            if mtime is None:
+                continue
+
+            filename = _get_module_filename(module)
+            try:
+                changed = os.path.getmtime(filename) != mtime
+            except Exception:
+                changed = True
+            if changed:
+                changed_packages.add(name.split(".")[0])
+
+        if not changed_packages:
+            return
+
+        for name in list(sys.modules):
+            if name.split(".")[0] in changed_packages:
+                self._remove(name)
+
+    def remove_from_paths(self, paths):
+        paths = tuple(
+            os.path.normcase(os.path.join(os.path.abspath(p), "")) for p in paths if p
+        )
+        if not paths:
+            return
+
+        for name, module in list(sys.modules.items()):
+            filename = _get_module_filename(module)
+            if filename:
+                if os.path.normcase(os.path.abspath(filename)).startswith(paths):
+                    self._remove(name)
+
+
+def _run_job(job, modules_tracker):
+    import time
+    from robot.libdoc import LibDoc
+
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+
+    initial_time = time.time()
+    modules_tracker.remove_changed()
+
+    initial_sys_path = list(sys.path)
+    initial_cwd = os.getcwd()
+    initial_stdout = sys.stdout
+    initial_stderr = sys.stderr
+
+    output = StringIO()
+    sys.stdout = sys.stderr = output
+    try:
+        cwd = job.get("cwd")
+        if cwd:
+            os.chdir(cwd)
+        try:
+            returncode = LibDoc().execute_cli(job["args"], exit=False)
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            output.write(traceback.format_exc())
+            returncode = 1
+    finally:
+        sys.stdout = initial_stdout
+        sys.stderr = initial_stderr
+        sys.path[:] = initial_sys_path
+        try:
+            os.chdir(initial_cwd)
+        except Exception:
+            pass
+
+        # The modules from the paths given by the user are always re-imported
+        # (the same name may map to different modules depending on the
+        # paths used in each job).
+        modules_tracker.remove_from_paths(job.get("reload_paths", ()))
+        modules_tracker.update()
+
+    return {
+        "returncode": returncode,
+        "output": output.getvalue(),
+        "maxrss": _get_maxrss(),
+        "elapsed": time.time() - initial_time,
+    }
+
+
+def main():
+    # The original stdin/stdout are used for the communication with the
+    # LibspecManager (fds 0 and 1 are redirected to devnull because libraries
+    # could read/write to those when imported).
+    read_from = os.fdopen(os.dup(0), "rb")
+    write_to = os.fdopen(os.dup(1), "wb")
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    # Pre-import what's needed to run libdoc.
+    import robot.libdoc  # noqa
+
+    modules_tracker = _ModulesTracker()
+    modules_tracker.update()
+
+    def write_result(result):
+        write_to.write((json.dumps(result) + "\n").encode("utf-8"))
+        write_to.flush()
+
+    while True:
+        line = read_from.readline()
+        if not line:
+            break
+
+        try:
+            job = json.loads(line.decode("utf-8"))
+        except Exception:
+            write_result({"returncode": -1, "output": traceback.format_exc()})
+            continue
+
+        for j in job["jobs"] if "jobs" in job else [job]:
+            try:
+                result = _run_job(j, modules_tracker)
+            except Exception:
+                result = {"returncode": -1, "output": traceback.format_exc()}
+            write_result(result)
+
+
+if __name__ == "__main__":
+    main()
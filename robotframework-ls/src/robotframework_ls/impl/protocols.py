@@ -27,6 +27,7 @@ T = TypeVar("T")
 NodeInfo = namedtuple("NodeInfo", "stack, node")
 TokenInfo = namedtuple("TokenInfo", "stack, node, token")
 KeywordUsageInfo = namedtuple("KeywordUsageInfo", "stack, node, token, name")
+VariableDefinitionInfo = namedtuple("VariableDefinitionInfo", "node, token, name")
 
 
 class IRobotDocument(IDocument, Protocol):
@@ -36,9 +37,22 @@ class IRobotDocument(IDocument, Protocol):
     def get_ast(self) -> Any:
         pass
 
+    def get_library_imports(self) -> Sequence[Any]:
+        pass
+
+    def get_resource_imports(self) -> Sequence[Any]:
+        pass
+
+    def get_variables_imports(self) -> Sequence[Any]:
+        pass
+
+    def get_variables(self) -> Sequence[VariableDefinitionInfo]:
+        pass
+
 
 class IRobotWorkspace(IWorkspace, Protocol):
     libspec_manager: Any
+    keyword_index: Any
 
 
 class IKeywordFound(Protocol):
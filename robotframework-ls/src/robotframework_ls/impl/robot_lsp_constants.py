@@ -14,6 +14,10 @@ OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_PLURAL = "plural"
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_SINGULAR = "singular"
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_BOTH = "both"
 
+OPTION_ROBOT_LIBDOC_TIMEOUT = "robot.libdoc.timeout"
+OPTION_ROBOT_LIBDOC_SHARED_STORE = "robot.libdoc.sharedStore"
+OPTION_ROBOT_LIBDOC_SCAN_EXCLUDES = "robot.libdoc.scanExcludes"
+
 # Options which must be set as environment variables.
 ENV_OPTION_ROBOT_DAP_TIMEOUT = "ROBOT_DAP_TIMEOUT"
 
@@ -27,5 +31,8 @@ ALL_ROBOT_OPTIONS = frozenset(
         OPTION_ROBOT_VARIABLES,
         OPTION_ROBOT_PYTHONPATH,
         OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM,
+        OPTION_ROBOT_LIBDOC_TIMEOUT,
+        OPTION_ROBOT_LIBDOC_SHARED_STORE,
+        OPTION_ROBOT_LIBDOC_SCAN_EXCLUDES,
     )
 )
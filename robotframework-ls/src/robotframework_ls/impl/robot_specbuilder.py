@@ -35,16 +35,30 @@ def markdown_doc(obj):
         return ""
 
     if obj.doc_format.lower() == "html":
-        try:
-            return obj.__md_doc__
-        except AttributeError:
+        # The markdown is usually precomputed when the libspec is compiled
+        # (only convert it if it's not available).
+        md_doc = _get_lazy(obj._md_doc, None)
+        if md_doc is None:
             from robotframework_ls import html_to_markdown
 
-            obj.__md_doc__ = html_to_markdown.convert(obj.doc)
-        return obj.__md_doc__
+            md_doc = obj._md_doc = html_to_markdown.convert(obj.doc)
+        return md_doc
     return obj.doc
 
 
+def _get_lazy(value, default):
+    """
+    Helper for attributes which may be loaded on demand (i.e.: the docs may be
+    read from the compiled libspec only when requested so that those don't need
+    to be kept in memory).
+    """
+    if callable(value):
+        value = value()
+        if value is None:
+            return default
+    return value
+
+
 def docs_and_format(obj):
     doc_format = obj.doc_format
     if doc_format.lower() == "html":
@@ -68,6 +82,7 @@ class LibraryDoc(object):
         doc_format="",
         source=None,
         lineno=-1,
+        md_doc=None,
     ):
         assert filename
         self.filename = filename
@@ -81,9 +96,22 @@ class LibraryDoc(object):
         self.doc_format = doc_format or "ROBOT"
         self._source = source
         self.lineno = lineno
+        self._md_doc = md_doc
         self.inits = []
         self.keywords = []
 
+    @property
+    def doc(self):
+        return _get_lazy(self._doc, "")
+
+    @doc.setter
+    def doc(self, doc):
+        """
+        :param str|callable doc:
+            The doc (or a callable which provides the doc on demand).
+        """
+        self._doc = doc
+
     @property
     @instance_cache
     def source(self):
@@ -131,6 +159,51 @@ class LibraryDoc(object):
     __str__ = __repr__
 
 
+class LibraryDocHeader(object):
+    """
+    Information on a library which is available just from the spec file
+    `keywordspec` attributes along with the number of keywords (it doesn't
+    really contain the keywords).
+    """
+
+    __slots__ = [
+        "filename",
+        "name",
+        "type",
+        "specversion",
+        "doc_format",
+        "source",
+        "keyword_count",
+    ]
+
+    def __init__(
+        self,
+        filename,
+        name="",
+        type="library",
+        specversion="",
+        doc_format="",
+        source=None,
+        keyword_count=0,
+    ):
+        self.filename = filename
+        self.name = name
+        self.type = type
+        self.specversion = specversion
+        self.doc_format = doc_format or "ROBOT"
+        self.source = source
+        self.keyword_count = keyword_count
+
+    def __repr__(self):
+        return "LibraryDocHeader(%s, %s, keywords:%s)" % (
+            self.filename,
+            self.name,
+            self.keyword_count,
+        )
+
+    __str__ = __repr__
+
+
 class KeywordArg(object):
 
     _is_keyword_arg = False
@@ -200,15 +273,50 @@ class KeywordArg(object):
 
 class KeywordDoc(object):
     def __init__(
-        self, weak_libdoc, name="", args=(), doc="", tags=(), source=None, lineno=-1
+        self,
+        weak_libdoc,
+        name="",
+        args=(),
+        doc="",
+        tags=(),
+        source=None,
+        lineno=-1,
+        md_doc=None,
     ):
+        """
+        :param str|callable doc:
+            The doc (or a callable which provides the doc on demand).
+        :param str|callable|NoneType md_doc:
+            The doc converted to markdown (or a callable which provides it on
+            demand) -- only used for the html doc format (if not given it's
+            computed when requested).
+        :param tuple|callable tags:
+            The tags (or a callable which provides the tags on demand).
+        """
         self._weak_libdoc = weak_libdoc
         self.name = name
         self._args = args
-        self.doc = doc
-        self.tags = tags
+        self._doc = doc
+        self._tags = tags
         self._source = source
         self.lineno = lineno
+        self._md_doc = md_doc
+
+    @property
+    def doc(self):
+        return _get_lazy(self._doc, "")
+
+    @doc.setter
+    def doc(self, doc):
+        self._doc = doc
+
+    @property
+    def tags(self):
+        return _get_lazy(self._tags, ())
+
+    @tags.setter
+    def tags(self, tags):
+        self._tags = tags
 
     @property
     def deprecated(self):
@@ -276,6 +384,53 @@ class SpecDocBuilder(object):
             libdoc.keywords = self._create_keywords_v2(weakref.ref(libdoc), spec, "kw")
         return libdoc
 
+    def build_header(self, path):
+        """
+        Provides the library header (the `keywordspec` attributes and the
+        number of keywords) without loading the keywords/docs.
+
+        Only the start of the `keywordspec` element is parsed (for its
+        attributes). The keywords are counted by searching for the `kw` tags
+        in the raw contents (the docs are escaped in the xml, so, a `<kw` is
+        always a keyword element), so, the docs are never parsed (note: in V2
+        the keywords are the last elements, so, stopping the parsing after
+        those wouldn't help).
+
+        :rtype: LibraryDocHeader
+        """
+        try:
+            from xml.etree import cElementTree as ET
+        except ImportError:
+            from xml.etree import ElementTree as ET
+
+        if not os.path.isfile(path):
+            raise IOError("Spec file '%s' does not exist." % path)
+
+        attrib = None
+        for _event, elem in ET.iterparse(path, events=("start",)):
+            if elem.tag != "keywordspec":
+                raise RuntimeError("Invalid spec file '%s'." % path)
+            attrib = dict(elem.attrib)
+            break
+
+        with open(path, "rb") as stream:
+            contents = stream.read()
+        keyword_count = contents.count(b"<kw ") + contents.count(b"<kw>")
+
+        if attrib is None:
+            raise RuntimeError("Invalid spec file '%s'." % path)
+
+        specversion = attrib.get("specversion")
+        return LibraryDocHeader(
+            path,
+            name=attrib.get("name"),
+            type=attrib.get("type"),
+            specversion=specversion if specversion is not None else "",
+            doc_format=attrib.get("format", "ROBOT"),
+            source=attrib.get("source"),
+            keyword_count=keyword_count,
+        )
+
     def _get_scope(self, spec):
         # RF >= 3.2 has "scope" attribute w/ value 'GLOBAL', 'SUITE, or 'TEST'.
         if "scope" in spec.attrib:
@@ -3,7 +3,12 @@ from robocorp_ls_core.basic import overrides
 from robocorp_ls_core.cache import instance_cache
 from robotframework_ls.constants import NULL
 from robocorp_ls_core.robotframework_log import get_logger
-from robotframework_ls.impl.protocols import IRobotWorkspace, IRobotDocument
+from robotframework_ls.impl.protocols import (
+    IRobotWorkspace,
+    IRobotDocument,
+    VariableDefinitionInfo,
+)
+from typing import Tuple, Any
 from robocorp_ls_core.protocols import check_implements
 
 log = get_logger(__name__)
@@ -13,7 +18,10 @@ class RobotWorkspace(Workspace):
     def __init__(
         self, root_uri, workspace_folders=None, libspec_manager=NULL, generate_ast=True
     ):
+        from robotframework_ls.impl.keyword_index import KeywordIndex
+
         self.libspec_manager = libspec_manager
+        self.keyword_index = KeywordIndex()
 
         Workspace.__init__(self, root_uri, workspace_folders=workspace_folders)
         self._generate_ast = generate_ast
@@ -42,15 +50,25 @@ class RobotDocument(Document):
     TYPE_RESOURCE = "resource"
 
     def __init__(self, uri, source=None, version=None, generate_ast=True):
+        import threading
+
         Document.__init__(self, uri, source=source, version=version)
 
         self._generate_ast = generate_ast
         self._ast = None
+        # Note: the AST may be requested at the same time by different threads
+        # (i.e.: lint and import prefetch), so, make sure that it's only
+        # parsed once.
+        self.get_ast.set_lock(self, threading.Lock())
 
     @overrides(Document._clear_caches)
     def _clear_caches(self):
         Document._clear_caches(self)
         self.get_ast.cache_clear(self)  # noqa (clear the instance_cache).
+        self.get_library_imports.cache_clear(self)  # noqa
+        self.get_resource_imports.cache_clear(self)  # noqa
+        self.get_variables_imports.cache_clear(self)  # noqa
+        self.get_variables.cache_clear(self)  # noqa
 
     def get_type(self):
         path = self.path
@@ -97,6 +115,67 @@ class RobotDocument(Document):
             log.critical("Unrecognized section: %s", t)
             return get_model(source)
 
+    # Note: the symbols exported by the document are cached in the document
+    # (which is shared by all the requests and all the documents importing it
+    # while it's not changed in the editor or in the filesystem).
+
+    @instance_cache
+    def get_library_imports(self) -> Tuple[Any, ...]:
+        """
+        :return tuple(LibraryImport):
+        """
+        from robotframework_ls.impl import ast_utils
+
+        return tuple(
+            node_info.node
+            for node_info in ast_utils.iter_library_imports(self.get_ast())
+        )
+
+    @instance_cache
+    def get_resource_imports(self) -> Tuple[Any, ...]:
+        """
+        :return tuple(ResourceImport):
+        """
+        from robotframework_ls.impl import ast_utils
+
+        return tuple(
+            node_info.node
+            for node_info in ast_utils.iter_resource_imports(self.get_ast())
+        )
+
+    @instance_cache
+    def get_variables_imports(self) -> Tuple[Any, ...]:
+        """
+        :return tuple(VariablesImport):
+        """
+        from robotframework_ls.impl import ast_utils
+
+        return tuple(
+            node_info.node
+            for node_info in ast_utils.iter_variables_imports(self.get_ast())
+        )
+
+    @instance_cache
+    def get_variables(self) -> Tuple[VariableDefinitionInfo, ...]:
+        """
+        :return:
+            The variables defined in the `*** Variables ***` section.
+        """
+        from robotframework_ls.impl import ast_utils
+        from robot.api import Token
+
+        ret = []
+        for variable_node_info in ast_utils.iter_variables(self.get_ast()):
+            variable_node = variable_node_info.node
+            token = variable_node.get_token(Token.VARIABLE)
+            if token is None:
+                continue
+            name = token.value
+            if name.endswith("="):
+                name = name[:-1].rstrip()
+            ret.append(VariableDefinitionInfo(variable_node, token, name))
+        return tuple(ret)
+
     def find_line_with_contents(self, contents: str) -> int:
         """
         :param contents:
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 class TextUtilities(object):
     def __init__(self, text):
         self.text = text
@@ -35,7 +38,7 @@ def is_variable_text(text):
     return False
 
 
-def matches_robot_keyword(keyword_name_call_text, keyword_name, _re_cache={}):
+def matches_robot_keyword(keyword_name_call_text, keyword_name):
     """
     Checks if a given text matches a given keyword. 
     
@@ -48,32 +51,135 @@ def matches_robot_keyword(keyword_name_call_text, keyword_name, _re_cache={}):
     :param str keyword_name:
         The keyword (which has variables -- i.e.: '{').
     """
+    return _compile_robot_keyword_regexp(keyword_name).match(keyword_name_call_text)
+
+
+# Max number of compiled regexps for keyword names with embedded arguments
+# kept in memory.
+MAX_COMPILED_KEYWORD_REGEXPS = 1000
+
+# Max number of EmbeddedArgsMatcher (one for each set of keyword names with
+# embedded arguments -- i.e.: the keywords available in some scope) kept in
+# memory.
+MAX_EMBEDDED_ARGS_MATCHERS = 100
+
+
+def _split_embedded_args(keyword_name):
+    """
+    :return tuple:
+        The parts of the keyword name where the literal parts are strings and
+        the embedded arguments are None.
+    """
+    from robotframework_ls.impl import ast_utils
 
     try:
-        compiled = _re_cache[keyword_name]
-    except KeyError:
-        from robotframework_ls.impl import ast_utils
-        import re
+        tokenized_vars = ast_utils.tokenize_variables_from_name(keyword_name)
+    except:
+        return (keyword_name,)
 
-        try:
-            tokenized_vars = ast_utils.tokenize_variables_from_name(keyword_name)
-        except:
-            regexp = [re.escape(keyword_name)]
+    return tuple(None if t.type == t.VARIABLE else t.value for t in tokenized_vars)
+
+
+@lru_cache(maxsize=MAX_COMPILED_KEYWORD_REGEXPS)
+def _compile_robot_keyword_regexp(keyword_name):
+    import re
+
+    regexp = []
+    for part in _split_embedded_args(keyword_name):
+        if part is None:
+            regexp.append("(.*)")
         else:
-            regexp = []
-            for t in tokenized_vars:
-                if t.type == t.VARIABLE:
-                    regexp.append("(.*)")
+            regexp.append(re.escape(part))
+
+    regexp.append("$")
+    return re.compile("".join(regexp))
+
+
+# Keys in the trie of the EmbeddedArgsMatcher (the other keys are chars).
+_EMBEDDED_ARG = object()
+_END = object()
+
+
+def _trie_to_regexp(trie):
+    import re
+
+    alternatives = []
+    for key, child in trie.items():
+        if key is _END:
+            alternatives.append("$")
+            continue
+
+        if key is _EMBEDDED_ARG:
+            regexp = [".*"]
+        else:
+            # Path compression: consume the chars while there's a single
+            # path in the trie.
+            regexp = [re.escape(key)]
+            while len(child) == 1:
+                ((next_key, next_child),) = child.items()
+                if next_key is _END or next_key is _EMBEDDED_ARG:
+                    break
+                regexp.append(re.escape(next_key))
+                child = next_child
+
+        regexp.append(_trie_to_regexp(child))
+        alternatives.append("".join(regexp))
+
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return "(?:%s)" % ("|".join(alternatives),)
+
+
+class EmbeddedArgsMatcher(object):
+    """
+    Matches a keyword call against a set of keywords with embedded arguments
+    in a single pass.
+
+    The keyword names are put in a trie (where each literal char and each
+    embedded argument is a node) which is then compiled to a single regexp,
+    so, the common prefixes of the names are only checked once.
+
+    Note: the names must be already normalized.
+    """
+
+    __slots__ = ["_compiled"]
+
+    def __init__(self, normalized_names):
+        import re
+
+        trie = {}
+        for keyword_name in normalized_names:
+            node = trie
+            for part in _split_embedded_args(keyword_name):
+                if part is None:
+                    node = node.setdefault(_EMBEDDED_ARG, {})
                 else:
-                    regexp.append(re.escape(t.value))
+                    for c in part:
+                        node = node.setdefault(c, {})
+            node[_END] = {}
 
-        regexp.append("$")
+        if trie:
+            self._compiled = re.compile(_trie_to_regexp(trie))
+        else:
+            self._compiled = None
 
-        regexp = "".join(regexp)
-        _re_cache[keyword_name] = re.compile(regexp)
-        compiled = _re_cache[keyword_name]
+    def matches(self, normalized_keyword_name_call_text):
+        if self._compiled is None:
+            return False
+        return self._compiled.match(normalized_keyword_name_call_text) is not None
 
-    return compiled.match(keyword_name_call_text)
+
+@lru_cache(maxsize=MAX_EMBEDDED_ARGS_MATCHERS)
+def get_embedded_args_matcher(normalized_names):
+    """
+    :param frozenset normalized_names:
+        The normalized names of the keywords with embedded arguments.
+
+    :return EmbeddedArgsMatcher:
+        A matcher for the given names (shared among the callers which ask for
+        the same names).
+    """
+    return EmbeddedArgsMatcher(normalized_names)
 
 
 def iter_dotted_names(text):
@@ -151,40 +151,25 @@ class _Collector(object):
         )
 
 
-def _collect_completions_from_ast(
-    ast, completion_context: ICompletionContext, collector
-):
+def _collect_current_doc_variables(completion_context: ICompletionContext, collector):
+    """
+    :param CompletionContext completion_context:
+    """
+    # Get variables defined in the file itself
     completion_context.check_cancelled()
-    from robotframework_ls.impl import ast_utils
-    from robot.api import Token
-
-    ast = completion_context.get_ast()
-    for variable_node_info in ast_utils.iter_variables(ast):
-        variable_node = variable_node_info.node
-        token = variable_node.get_token(Token.VARIABLE)
-        if token is None:
-            continue
-        name = token.value
-        if name.endswith("="):
-            name = name[:-1].rstrip()
 
+    for variable_info in completion_context.doc.get_variables():
+        name = variable_info.name
         if collector.accepts(name):
             variable_found = _VariableFoundFromToken(
-                completion_context, token, variable_node.value, variable_name=name
+                completion_context,
+                variable_info.token,
+                variable_info.node.value,
+                variable_name=name,
             )
             collector.on_variable(variable_found)
 
 
-def _collect_current_doc_variables(completion_context, collector):
-    """
-    :param CompletionContext completion_context:
-    """
-    # Get keywords defined in the file itself
-
-    ast = completion_context.get_ast()
-    _collect_completions_from_ast(ast, completion_context, collector)
-
-
 def _collect_resource_imports_variables(completion_context, collector):
     """
     :param CompletionContext completion_context:
@@ -4,7 +4,7 @@ import os
 import time
 from robotframework_ls.constants import DEFAULT_COMPLETIONS_TIMEOUT
 from robocorp_ls_core.robotframework_log import get_logger
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 from robocorp_ls_core.protocols import (
     IMessageMatcher,
     IConfig,
@@ -23,6 +23,7 @@ from robocorp_ls_core.jsonrpc.endpoint import require_monitor
 from robocorp_ls_core.jsonrpc.monitor import Monitor
 from functools import partial
 import itertools
+import threading
 
 
 log = get_logger(__name__)
@@ -40,7 +41,7 @@ class _CurrLintInfo(object):
     ) -> None:
         from robocorp_ls_core.lsp import LSPMessages
 
-        self._rf_lint_api_client = rf_lint_api_client
+        self.rf_lint_api_client = rf_lint_api_client
         self.lsp_messages: LSPMessages = lsp_messages
         self.doc_uri = doc_uri
         self.is_saved = is_saved
@@ -55,12 +56,12 @@ class _CurrLintInfo(object):
             doc_uri = self.doc_uri
             self._monitor.check_cancelled()
             found = []
-            message_matcher = self._rf_lint_api_client.request_lint(doc_uri)
+            message_matcher = self.rf_lint_api_client.request_lint(doc_uri)
             if message_matcher is not None:
                 if wait_for_message_matcher(
                     message_matcher,
                     monitor=self._monitor,
-                    request_cancel=self._rf_lint_api_client.request_cancel,
+                    request_cancel=self.rf_lint_api_client.request_cancel,
                     timeout=60 * 3,
                 ):
                     diagnostics_msg = message_matcher.msg
@@ -96,6 +97,9 @@ class _LintManager(object):
         self._lsp_messages = lsp_messages
 
         self._next_id = partial(next, itertools.count())
+        # Note: besides the main thread, may also be accessed when an api
+        # notifies that libraries changed (so, access is synchronized).
+        self._lock = threading.Lock()
         self._doc_id_to_info: Dict[str, _CurrLintInfo] = {}
 
     def schedule_lint(self, doc_uri: str, is_saved: bool) -> None:
@@ -108,15 +112,67 @@ class _LintManager(object):
         curr_info = _CurrLintInfo(
             rf_lint_api_client, self._lsp_messages, doc_uri, is_saved
         )
+        self._schedule(curr_info)
+
+    def _schedule(
+        self, curr_info: _CurrLintInfo, replace: Optional[_CurrLintInfo] = None
+    ) -> None:
+        """
+        :param replace:
+            If given, the lint is only scheduled if the current lint for the
+            document is still this one.
+        """
         from robocorp_ls_core.timeouts import TimeoutTracker
 
+        with self._lock:
+            old_info = self._doc_id_to_info.get(curr_info.doc_uri)
+            if replace is not None and old_info is not replace:
+                return
+            if old_info is not None:
+                old_info.cancel()
+            self._doc_id_to_info[curr_info.doc_uri] = curr_info
+
         timeout_tracker = TimeoutTracker.get_singleton()
         timeout_tracker.call_on_timeout(
-            LINT_DEBOUNCE_S, partial(run_in_new_thread, curr_info, f"Lint: {doc_uri}")
+            LINT_DEBOUNCE_S,
+            partial(run_in_new_thread, curr_info, f"Lint: {curr_info.doc_uri}"),
         )
 
+    def relint(self, doc_uris: List[str]) -> None:
+        """
+        Lints again the given documents (the ones which weren't linted are
+        skipped -- i.e.: documents not opened).
+
+        :param doc_uris:
+            The documents to be linted again (in priority order).
+        """
+        with self._lock:
+            relint = []
+            for doc_uri in doc_uris:
+                curr_info = self._doc_id_to_info.get(doc_uri)
+                if curr_info is not None:
+                    relint.append(curr_info)
+
+        self._relint(relint)
+
+    def _relint(self, relint: List[_CurrLintInfo]) -> None:
+        # Note: scheduled in order (so, the lint requests are done in that
+        # order).
+        for curr_info in relint:
+            log.debug("Scheduling lint again for: %s", curr_info.doc_uri)
+            self._schedule(
+                _CurrLintInfo(
+                    curr_info.rf_lint_api_client,
+                    self._lsp_messages,
+                    curr_info.doc_uri,
+                    curr_info.is_saved,
+                ),
+                replace=curr_info,
+            )
+
     def cancel_lint(self, doc_uri: str) -> None:
-        curr_info = self._doc_id_to_info.pop(doc_uri, None)
+        with self._lock:
+            curr_info = self._doc_id_to_info.pop(doc_uri, None)
         if curr_info is not None:
             curr_info.cancel()
 
@@ -219,7 +275,11 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
             "documentSymbolProvider": False,
             "definitionProvider": True,
             "executeCommandProvider": {
-                "commands": ["robot.addPluginsDir", "robot.resolveInterpreter"]
+                "commands": [
+                    "robot.addPluginsDir",
+                    "robot.resolveInterpreter",
+                    "robot.getLibspecManagerStatus",
+                ]
             },
             "hoverProvider": False,
             "referencesProvider": False,
@@ -271,6 +331,50 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
             except:
                 log.exception(f"Error resolving interpreter. Args: {arguments}")
 
+        elif command == "robot.getLibspecManagerStatus":
+            # The uri of a document may be passed to get the status for the
+            # interpreter used for that document.
+            doc_uri: Optional[str] = arguments[0] if arguments else None
+            rf_api_clients = self._server_manager.get_regular_and_lint_rf_api_clients(
+                doc_uri
+            )
+            func = partial(self._threaded_libspec_manager_status, rf_api_clients)
+            func = require_monitor(func)
+            return func
+
+    @log_and_silence_errors(log, return_on_error={})
+    def _threaded_libspec_manager_status(
+        self,
+        rf_api_clients: Tuple[
+            Optional[IRobotFrameworkApiClient], Optional[IRobotFrameworkApiClient]
+        ],
+        monitor: IMonitor,
+    ) -> dict:
+        """
+        :return dict:
+            The status of the LibspecManager of the regular and of the lint
+            apis (see: LibspecManager.get_status).
+        """
+        from robocorp_ls_core.client_base import wait_for_message_matcher
+
+        ret = {}
+        for name, rf_api_client in zip(("api", "lintApi"), rf_api_clients):
+            if rf_api_client is None:
+                continue
+            message_matcher = rf_api_client.request_libspec_manager_status()
+            if message_matcher is None:
+                continue
+            if wait_for_message_matcher(
+                message_matcher,
+                rf_api_client.request_cancel,
+                DEFAULT_COMPLETIONS_TIMEOUT,
+                monitor,
+            ):
+                msg = message_matcher.msg
+                if msg is not None:
+                    ret[name] = msg.get("result")
+        return ret
+
     @overrides(PythonLanguageServer.m_workspace__did_change_configuration)
     @log_and_silence_errors(log)
     def m_workspace__did_change_configuration(self, **kwargs):
@@ -379,6 +483,16 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
     def cancel_lint(self, doc_uri) -> None:
         self._lint_manager.cancel_lint(doc_uri)
 
+    def on_dependents_changed(
+        self, api: IRobotFrameworkApiClient, doc_uris: List[str]
+    ) -> None:
+        """
+        Called (from the api reader thread) when some document changed and the
+        given documents (which import it) should be linted again.
+        """
+        log.debug("Dependents changed: %s", doc_uris)
+        self._lint_manager.relint(doc_uris)
+
     def m_text_document__definition(self, **kwargs):
         doc_uri = kwargs["textDocument"]["uri"]
         # Note: 0-based
@@ -170,6 +170,12 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
             self._build_msg("signatureHelp", doc_uri=doc_uri, line=line, col=col)
         )
 
+    def request_libspec_manager_status(self) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(self._build_msg("libspecManagerStatus"))
+
     def request_cancel(self, message_id):
         self._check_process_alive()
         self.write(
@@ -0,0 +1,251 @@
+"""
+Keeps which documents import which resources/libraries/variable files (so
+that the documents which depend on a document which changed can be linted
+again).
+
+The symbols exported by each document (keywords, variables and imports) are
+also kept, so that the dependents of a document are only linted again when
+those change (and not when only the contents of a test/keyword change).
+"""
+import os.path
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional, Set
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.protocols import ICompletionContext
+
+log = get_logger(__name__)
+
+
+# Note: frozensets with the imports of a document.
+DocImports = namedtuple("DocImports", "resource_uris, library_names, variables_uris")
+
+
+def _get_variables_import_uri(
+    completion_context: ICompletionContext, variables_import
+) -> Optional[str]:
+    from robocorp_ls_core import uris
+    from robot.api import Token
+
+    token = variables_import.get_token(Token.NAME)
+    if token is None:
+        return None
+
+    name = completion_context.token_value_resolving_variables(token)
+    if not os.path.isabs(name):
+        doc_path = completion_context.doc.path
+        if not doc_path:
+            return None
+        name = os.path.join(os.path.dirname(doc_path), name)
+
+    if not os.path.isfile(name):
+        # i.e.: it may be a module in the PYTHONPATH.
+        return None
+    return uris.from_fs_path(os.path.normpath(name))
+
+
+def _collect_doc_imports(completion_context: ICompletionContext) -> DocImports:
+    resource_uris = frozenset(
+        resource_doc.uri
+        for resource_doc in completion_context.get_resource_imports_as_docs()
+    )
+    library_names = frozenset(
+        library.name
+        for library in completion_context.get_imported_libraries()
+        if library.name
+    )
+
+    variables_uris = set()
+    for variables_import in completion_context.doc.get_variables_imports():
+        uri = _get_variables_import_uri(completion_context, variables_import)
+        if uri:
+            variables_uris.add(uri)
+
+    return DocImports(resource_uris, library_names, frozenset(variables_uris))
+
+
+def _get_library_key(library_name: str) -> str:
+    """
+    Note: the library names are kept as they're used to find the libspecs
+    (so, `../my_lib.py` and the `my_lib` libspec match).
+    """
+    from robotframework_ls.impl.libspec_manager import get_normalized_libname
+
+    return get_normalized_libname(library_name)
+
+
+def _collect_doc_exports(
+    completion_context: ICompletionContext, doc_imports: DocImports
+) -> tuple:
+    """
+    :return:
+        A key with what the document provides to the documents importing it
+        (the keywords along with their arguments, the variables along with
+        their values and its imports).
+    """
+    keyword_index = completion_context.workspace.keyword_index
+    doc_keywords = keyword_index.get_doc_keywords(completion_context.doc)
+    keywords = tuple(
+        (
+            keyword.normalized_name,
+            tuple(arg.original_arg for arg in keyword.keyword_args),
+        )
+        for keyword in doc_keywords.keywords
+    )
+    variables = tuple(
+        (variable.name, tuple(getattr(variable.node, "value", ())))
+        for variable in completion_context.doc.get_variables()
+    )
+    return (keywords, variables, doc_imports)
+
+
+class ImportGraph(object):
+    """
+    The imports of the documents analyzed (document -> resources, libraries and
+    variable files) along with the reverse edges.
+
+    Note: thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._doc_uri_to_imports: Dict[str, DocImports] = {}
+
+        # Reverse edges: resource/variable file uri -> importers.
+        self._uri_to_importers: Dict[str, Set[str]] = {}
+
+        # Reverse edges: library key -> importers.
+        self._library_key_to_importers: Dict[str, Set[str]] = {}
+
+        # doc uri -> key with the symbols exported by the document.
+        self._doc_uri_to_exports: Dict[str, tuple] = {}
+
+    def update(self, completion_context: ICompletionContext) -> List[str]:
+        """
+        Updates the imports of the document in the given completion context
+        and of the resources it (transitively) imports.
+
+        :return:
+            The documents whose exported symbols changed since those were
+            last seen (so, their dependents must be linted again).
+        """
+        changed = []
+        seen_uris = set()
+        contexts = [completion_context]
+        while contexts:
+            ctx = contexts.pop()
+            ctx.check_cancelled()
+            if ctx.doc.uri in seen_uris:
+                continue
+            seen_uris.add(ctx.doc.uri)
+
+            doc_imports = _collect_doc_imports(ctx)
+            self.set_imports(ctx.doc.uri, doc_imports)
+            if self.set_exports(ctx.doc.uri, _collect_doc_exports(ctx, doc_imports)):
+                changed.append(ctx.doc.uri)
+
+            for resource_doc in ctx.get_resource_imports_as_docs():
+                contexts.append(ctx.create_copy(resource_doc))
+        return changed
+
+    def set_imports(self, doc_uri: str, doc_imports: DocImports) -> None:
+        with self._lock:
+            old = self._doc_uri_to_imports.get(doc_uri)
+            if old == doc_imports:
+                return
+            if old is not None:
+                self._remove_reverse_edges(doc_uri, old)
+
+            self._doc_uri_to_imports[doc_uri] = doc_imports
+            for uri in doc_imports.resource_uris | doc_imports.variables_uris:
+                self._uri_to_importers.setdefault(uri, set()).add(doc_uri)
+            for library_name in doc_imports.library_names:
+                self._library_key_to_importers.setdefault(
+                    _get_library_key(library_name), set()
+                ).add(doc_uri)
+
+    def set_exports(self, doc_uri: str, exports: tuple) -> bool:
+        """
+        :return:
+            Whether the exports of the document changed (note: the first time
+            the exports of a document are set isn't considered a change).
+        """
+        with self._lock:
+            old = self._doc_uri_to_exports.get(doc_uri)
+            self._doc_uri_to_exports[doc_uri] = exports
+            return old is not None and old != exports
+
+    def remove_document(self, doc_uri: str) -> None:
+        with self._lock:
+            self._doc_uri_to_exports.pop(doc_uri, None)
+            old = self._doc_uri_to_imports.pop(doc_uri, None)
+            if old is not None:
+                self._remove_reverse_edges(doc_uri, old)
+
+    def _remove_reverse_edges(self, doc_uri: str, doc_imports: DocImports) -> None:
+        for uri in doc_imports.resource_uris | doc_imports.variables_uris:
+            importers = self._uri_to_importers.get(uri)
+            if importers is not None:
+                importers.discard(doc_uri)
+                if not importers:
+                    del self._uri_to_importers[uri]
+
+        for library_name in doc_imports.library_names:
+            library_key = _get_library_key(library_name)
+            importers = self._library_key_to_importers.get(library_key)
+            if importers is not None:
+                importers.discard(doc_uri)
+                if not importers:
+                    del self._library_key_to_importers[library_key]
+
+    def get_imports(self, doc_uri: str) -> Optional[DocImports]:
+        with self._lock:
+            return self._doc_uri_to_imports.get(doc_uri)
+
+    def get_dependents(self, uri: str) -> List[str]:
+        """
+        :param uri:
+            The uri of a resource/variable file.
+
+        :return:
+            The documents which (transitively) import the given uri, ordered
+            by priority (the documents importing it directly first).
+        """
+        with self._lock:
+            return self._get_dependents(self._uri_to_importers.get(uri, ()), {uri})
+
+    def get_library_dependents(self, library_name: str) -> List[str]:
+        """
+        :param library_name:
+            The name of the library (as imported or as the name of its libspec).
+
+        :return:
+            The documents which (transitively) import the given library, ordered
+            by priority (the documents importing it directly first).
+        """
+        from robotframework_ls.impl.robot_constants import BUILTIN_LIB
+
+        library_key = _get_library_key(library_name)
+        with self._lock:
+            if library_key == BUILTIN_LIB.lower():
+                # i.e.: implicitly imported by all the documents.
+                return sorted(self._doc_uri_to_imports)
+
+            return self._get_dependents(
+                self._library_key_to_importers.get(library_key, ()), set()
+            )
+
+    def _get_dependents(self, importers, seen: Set[str]) -> List[str]:
+        ret = []
+        level = sorted(importers)
+        while level:
+            next_level = set()
+            for doc_uri in level:
+                if doc_uri in seen:
+                    continue
+                seen.add(doc_uri)
+                ret.append(doc_uri)
+                next_level.update(self._uri_to_importers.get(doc_uri, ()))
+            level = sorted(next_level.difference(seen))
+        return ret
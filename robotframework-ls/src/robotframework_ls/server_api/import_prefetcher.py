@@ -0,0 +1,175 @@
+"""
+Prefetches the imports of the documents opened in the editor (so that the
+first completion/lint request in a new document doesn't have to wait for the
+libspecs/resources to be loaded).
+"""
+import threading
+import time
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robocorp_ls_core.protocols import IMonitor
+
+log = get_logger(__name__)
+
+PREFETCH_DEBOUNCE_S = 0.4  # 400 ms
+
+
+class ImportPrefetcher(object):
+    """
+    Walks the `Library`/`Resource` imports of a document (and the imports of
+    its resources) in a background thread, warming the AST, resource document
+    and libspec caches.
+
+    Only one document is processed at a time (documents opened while another
+    document is being processed are queued) and the prefetch of a document is
+    cancelled when it's closed.
+
+    The prefetch only starts after the client is idle for some time (so that
+    the changes/settings sent right after a document is opened are already
+    applied when the libspecs are generated).
+    """
+
+    def __init__(self, create_completion_context, debounce=PREFETCH_DEBOUNCE_S):
+        """
+        :param callable create_completion_context:
+            Called as `create_completion_context(doc_uri, monitor)` to create
+            the completion context for a document (may return None).
+
+        :param float debounce:
+            The time (in seconds) without activity from the client to wait
+            for before starting to prefetch.
+        """
+        from collections import OrderedDict
+
+        self._create_completion_context = create_completion_context
+        self._debounce = debounce
+        self._last_activity_time = 0.0
+        self._condition = threading.Condition()
+        # doc_uri -> Monitor (documents waiting to be prefetched).
+        self._pending = OrderedDict()
+        # (doc_uri, Monitor) of the document being prefetched.
+        self._current = None
+        self._thread = None
+        self._disposed = False
+
+    def prefetch(self, doc_uri):
+        from robocorp_ls_core.jsonrpc.monitor import Monitor
+
+        with self._condition:
+            if self._disposed:
+                return
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ImportPrefetcher"
+                )
+                self._thread.daemon = True
+                self._thread.start()
+
+            self._pending.pop(doc_uri, None)
+            self._pending[doc_uri] = Monitor()
+            self._last_activity_time = time.time()
+            self._condition.notify()
+
+    def postpone(self):
+        """
+        Postpones the start of the pending prefetches (should be called when
+        a document or the settings are changed).
+        """
+        with self._condition:
+            self._last_activity_time = time.time()
+
+    def cancel(self, doc_uri):
+        with self._condition:
+            monitor = self._pending.pop(doc_uri, None)
+            if monitor is not None:
+                monitor.cancel()
+
+            current = self._current
+            if current is not None and current[0] == doc_uri:
+                current[1].cancel()
+
+    def dispose(self):
+        with self._condition:
+            self._disposed = True
+            for monitor in self._pending.values():
+                monitor.cancel()
+            self._pending.clear()
+            if self._current is not None:
+                self._current[1].cancel()
+            self._condition.notify()
+
+    def _run(self):
+        from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+
+        while True:
+            with self._condition:
+                while not self._disposed:
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+
+                    remaining = self._last_activity_time + self._debounce - time.time()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if self._disposed:
+                    return
+                doc_uri, monitor = self._pending.popitem(last=False)
+                self._current = (doc_uri, monitor)
+
+            try:
+                self._prefetch(doc_uri, monitor)
+            except JsonRpcRequestCancelled:
+                log.debug("Import prefetch cancelled for: %s", doc_uri)
+            except Exception:
+                log.exception("Error prefetching imports for: %s", doc_uri)
+            finally:
+                with self._condition:
+                    self._current = None
+
+    def _prefetch(self, doc_uri, monitor: IMonitor):
+        from robotframework_ls.impl.collect_keywords import get_library_import_args
+
+        completion_context = self._create_completion_context(doc_uri, monitor)
+        if completion_context is None:
+            return
+
+        log.debug("Prefetching imports for: %s", doc_uri)
+
+        # list(tuple(LibraryImport, CompletionContext))
+        libraries = []
+        seen_uris = set()
+        contexts = [completion_context]
+        while contexts:
+            ctx = contexts.pop()
+            monitor.check_cancelled()
+            if ctx.doc.uri in seen_uris:
+                continue
+            seen_uris.add(ctx.doc.uri)
+
+            ctx.get_ast()
+            for library in ctx.get_imported_libraries():
+                if library.name:
+                    libraries.append((library, ctx))
+
+            for resource_doc in ctx.get_resource_imports_as_docs():
+                contexts.append(ctx.create_copy(resource_doc))
+
+        libspec_manager = completion_context.workspace.libspec_manager
+        monitor.check_cancelled()
+        libspec_manager.create_libspecs(
+            [(library.name, ctx.doc.uri) for library, ctx in libraries], monitor
+        )
+
+        # Load the library docs (and create the ones imported with arguments).
+        for library, ctx in libraries:
+            monitor.check_cancelled()
+            libspec_manager.get_library_info(
+                library.name,
+                create=True,
+                current_doc_uri=ctx.doc.uri,
+                lib_args=get_library_import_args(ctx, library),
+            )
+        log.debug("Finished prefetching imports for: %s", doc_uri)
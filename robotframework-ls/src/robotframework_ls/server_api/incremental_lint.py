@@ -0,0 +1,285 @@
+"""
+Lints documents reusing the diagnostics of the blocks (test cases, keywords,
+comments, ...) which didn't change since the last time the document was linted.
+
+The diagnostics of a block only depend on its contents and on its scope (the
+settings and variables of the document, the keywords defined in it and the
+resources/libraries it imports), so, the diagnostics are kept per block
+contents (with the lines relative to the start of the block) and all the blocks
+are analyzed again only when the scope changes.
+
+Note: as only the first `MAX_ERRORS` errors are reported, the blocks after those
+are only analyzed when needed (so, linting a document with many errors isn't
+slower than analyzing the whole document at once).
+"""
+import threading
+from collections import namedtuple
+from typing import Dict, List
+
+from robocorp_ls_core.lsp import Error
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.ast_utils import MAX_ERRORS
+from robotframework_ls.impl.protocols import ICompletionContext
+
+log = get_logger(__name__)
+
+# Note: the blocks in these sections are a part of the scope of the other
+# blocks (so, if some of those change, all the blocks are analyzed again).
+_SCOPE_SECTIONS = frozenset(("SettingSection", "VariableSection"))
+
+# key: (section class name, block contents)
+# start_line: 0-based line where the block starts
+_Block = namedtuple("_Block", "block_info, key, start_line")
+
+# Note: the lines of the errors are relative to the start of the block.
+_BlockErrors = namedtuple("_BlockErrors", "ast_errors, analysis_errors")
+
+_DocLintInfo = namedtuple(
+    "_DocLintInfo", "scope_key, library_error_msgs, block_key_to_errors"
+)
+
+
+def _iter_doc_blocks(completion_context: ICompletionContext):
+    from robotframework_ls.impl import ast_utils
+
+    block_infos = list(ast_utils.iter_blocks(completion_context.get_ast()))
+    lines = completion_context.doc.get_internal_lines()
+
+    # Note: the blocks are contiguous, so, a block ends where the next one
+    # starts.
+    start_lines = []
+    last_start_line = 0
+    for block_info in block_infos:
+        node = block_info.node
+        # Note: the lineno of a block (i.e.: a keyword) is computed visiting
+        # its nodes, so, get it from its header (when available).
+        header = getattr(node, "header", None)
+        lineno = header.lineno if header is not None else node.lineno
+        start_line = max(lineno - 1, last_start_line)
+        start_lines.append(start_line)
+        last_start_line = start_line
+    start_lines.append(max(len(lines), last_start_line))
+
+    for i, block_info in enumerate(block_infos):
+        start_line = start_lines[i]
+        contents = "".join(lines[start_line : start_lines[i + 1]])
+        key = (block_info.stack[0].__class__.__name__, contents)
+        yield _Block(block_info, key, start_line)
+
+
+def _compute_scope_key(completion_context: ICompletionContext, blocks: List[_Block]):
+    """
+    :return tuple:
+        A key which changes when something which may change the diagnostics
+        of a block (other than the contents of the block itself) changes.
+    """
+    scope_blocks = tuple(
+        block.key for block in blocks if block.key[0] in _SCOPE_SECTIONS
+    )
+
+    keyword_index = completion_context.workspace.keyword_index
+    doc_keywords = keyword_index.get_doc_keywords(completion_context.doc)
+    keyword_names = tuple(keyword.normalized_name for keyword in doc_keywords.keywords)
+
+    # Note: a new document is created when a resource changes (with a new
+    # version if it's opened in the editor or with a new mtime otherwise).
+    resources = []
+    seen_uris = set([completion_context.doc.uri])
+    contexts = [completion_context]
+    while contexts:
+        ctx = contexts.pop()
+        ctx.check_cancelled()
+        for resource_doc in ctx.get_resource_imports_as_docs():
+            if resource_doc.uri in seen_uris:
+                continue
+            seen_uris.add(resource_doc.uri)
+            resources.append(
+                (resource_doc.uri, resource_doc.version, resource_doc.source_mtime)
+            )
+            contexts.append(ctx.create_copy(resource_doc))
+
+    return (scope_blocks, keyword_names, tuple(resources))
+
+
+def _visit_blocks(completion_context: ICompletionContext, blocks: List[_Block]):
+    """
+    :return tuple(dict, collector):
+        The syntax errors and keyword usages for each block key and a
+        collector with the keywords which may match those usages.
+    """
+    from robotframework_ls.impl import code_analysis
+    from robotframework_ls.impl import ast_utils
+
+    block_key_to_visited = {}
+    keyword_usages = []
+    for block in blocks:
+        if block.key not in block_key_to_visited:
+            completion_context.check_cancelled()
+            ast_errors, usages = ast_utils.collect_block_errors_and_keyword_usages(
+                block.block_info
+            )
+            usages = code_analysis.normalize_keyword_usages(usages)
+            block_key_to_visited[block.key] = (ast_errors, usages)
+            keyword_usages.extend(usages)
+
+    collector = code_analysis.collect_keywords_for_usages(
+        completion_context, keyword_usages
+    )
+    return block_key_to_visited, collector
+
+
+def _create_new_completion_context(
+    completion_context: ICompletionContext,
+) -> ICompletionContext:
+    """
+    Note: a new completion context is needed to collect the keywords again (the
+    memo of the completion context prevents collecting from the same imports
+    more than once).
+    """
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    return CompletionContext(
+        completion_context.doc,
+        workspace=completion_context.workspace,
+        config=completion_context.config,
+        monitor=completion_context.monitor,
+    )
+
+
+def _to_relative(errors, start_line: int):
+    return tuple(
+        (
+            error.msg,
+            (error.start[0] - start_line, error.start[1]),
+            (error.end[0] - start_line, error.end[1]),
+        )
+        for error in errors
+    )
+
+
+def _iter_absolute(relative_errors, start_line: int):
+    for msg, start, end in relative_errors:
+        yield Error(
+            msg, (start[0] + start_line, start[1]), (end[0] + start_line, end[1])
+        )
+
+
+class IncrementalLinter(object):
+    """
+    Note: thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._doc_uri_to_lint_info: Dict[str, _DocLintInfo] = {}
+
+    def lint(self, completion_context: ICompletionContext) -> List[Error]:
+        """
+        :return:
+            The errors found in the document of the given completion context
+            (the same errors which would be found with `ast_utils.collect_errors`
+            followed by `code_analysis.collect_analysis_errors`).
+        """
+        from robotframework_ls.impl import code_analysis
+
+        doc_uri = completion_context.doc.uri
+        completion_context.check_cancelled()
+        blocks = list(_iter_doc_blocks(completion_context))
+        completion_context.check_cancelled()
+        scope_key = _compute_scope_key(completion_context, blocks)
+
+        with self._lock:
+            doc_lint_info = self._doc_uri_to_lint_info.get(doc_uri)
+
+        block_key_to_errors: Dict[tuple, _BlockErrors] = {}
+        if doc_lint_info is not None and doc_lint_info.scope_key == scope_key:
+            block_key_to_errors = doc_lint_info.block_key_to_errors
+
+        changed_blocks = [
+            block for block in blocks if block.key not in block_key_to_errors
+        ]
+        block_key_to_visited, collector = _visit_blocks(
+            completion_context, changed_blocks
+        )
+
+        # Note: computed after the keywords are collected (which is when the
+        # libspecs are created).
+        library_errors = code_analysis.collect_library_import_errors(completion_context)
+        library_error_msgs = tuple(error.msg for error in library_errors)
+        if (
+            block_key_to_errors
+            and doc_lint_info is not None
+            and doc_lint_info.library_error_msgs != library_error_msgs
+        ):
+            # Some library which couldn't be loaded is now available (or
+            # vice-versa): analyze all the blocks again.
+            log.debug("Lint: library errors changed (analyzing all blocks).")
+            block_key_to_errors = {}
+            changed_blocks = blocks
+            block_key_to_visited, collector = _visit_blocks(
+                _create_new_completion_context(completion_context), changed_blocks
+            )
+
+        errors: List[Error] = []
+        analysis_errors: List[Error] = list(library_errors)
+        max_analysis_errors = max(MAX_ERRORS, len(library_errors))
+
+        new_block_key_to_errors: Dict[tuple, _BlockErrors] = {}
+        analyzed = 0
+        for block in blocks:
+            block_errors = new_block_key_to_errors.get(block.key)
+            if block_errors is None:
+                block_errors = block_key_to_errors.get(block.key)
+
+            if block_errors is None:
+                if (
+                    len(errors) >= MAX_ERRORS
+                    and len(analysis_errors) >= max_analysis_errors
+                ):
+                    # The errors of this block wouldn't be reported (it's
+                    # analyzed when some of the errors before it are fixed).
+                    continue
+
+                completion_context.check_cancelled()
+                analyzed += 1
+                ast_errors, usages = block_key_to_visited[block.key]
+                block_analysis_errors = code_analysis.collect_undefined_keyword_errors(
+                    completion_context, collector, usages
+                )
+                block_errors = _BlockErrors(
+                    _to_relative(ast_errors, block.start_line),
+                    _to_relative(block_analysis_errors, block.start_line),
+                )
+            new_block_key_to_errors[block.key] = block_errors
+
+            if len(errors) < MAX_ERRORS:
+                errors.extend(_iter_absolute(block_errors.ast_errors, block.start_line))
+            if len(analysis_errors) < max_analysis_errors:
+                analysis_errors.extend(
+                    _iter_absolute(block_errors.analysis_errors, block.start_line)
+                )
+
+        log.debug("Lint: analyzed %s of %s blocks.", analyzed, len(blocks))
+
+        with self._lock:
+            self._doc_uri_to_lint_info[doc_uri] = _DocLintInfo(
+                scope_key, library_error_msgs, new_block_key_to_errors
+            )
+
+        del errors[MAX_ERRORS:]
+        del analysis_errors[max_analysis_errors:]
+        errors.extend(analysis_errors)
+        return errors
+
+    def remove_document(self, doc_uri: str) -> None:
+        with self._lock:
+            self._doc_uri_to_lint_info.pop(doc_uri, None)
+
+    def clear(self) -> None:
+        """
+        Forgets the diagnostics of all the documents (i.e.: when something
+        which isn't tracked in the scope, such as the configuration or the
+        libraries, changes).
+        """
+        with self._lock:
+            self._doc_uri_to_lint_info = {}
@@ -19,6 +19,9 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
     def __init__(self, read_from, write_to, libspec_manager=None):
         from robotframework_ls.impl.libspec_manager import LibspecManager
+        from robotframework_ls.server_api.import_prefetcher import ImportPrefetcher
+        from robotframework_ls.server_api.import_graph import ImportGraph
+        from robotframework_ls.server_api.incremental_lint import IncrementalLinter
 
         if libspec_manager is None:
             try:
@@ -30,6 +33,41 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         self.libspec_manager = libspec_manager
         PythonLanguageServer.__init__(self, read_from, write_to)
         self._version = None
+        libspec_manager.register_libspecs_changed_callback(self._on_libspecs_changed)
+        self._import_prefetcher = ImportPrefetcher(
+            lambda doc_uri, monitor: self._create_completion_context(
+                doc_uri, 0, 0, monitor
+            )
+        )
+        # Note: only filled with the documents linted.
+        self._import_graph = ImportGraph()
+        self._incremental_linter = IncrementalLinter()
+
+    def _on_libspecs_changed(self, libnames):
+        # The diagnostics of the documents which import the libraries changed
+        # (i.e.: libspecs regenerated, created by the import prefetch or
+        # changed in the workspace) must be computed again.
+        dependents = []
+        for libname in libnames:
+            for doc_uri in self._import_graph.get_library_dependents(libname):
+                if doc_uri not in dependents:
+                    dependents.append(doc_uri)
+
+        for doc_uri in dependents:
+            self._incremental_linter.remove_document(doc_uri)
+
+        if dependents:
+            # Let the client know that those must be linted again.
+            self._endpoint.notify("dependentsChanged", {"uris": dependents})
+
+    def _notify_dependents_changed(self, doc_uri, skip_uri=None):
+        # Let the client know that the documents which import the given
+        # document must be linted again.
+        dependents = self._import_graph.get_dependents(doc_uri)
+        if skip_uri is not None:
+            dependents = [uri for uri in dependents if uri != skip_uri]
+        if dependents:
+            self._endpoint.notify("dependentsChanged", {"uris": dependents})
 
     @overrides(PythonLanguageServer._create_config)
     def _create_config(self) -> IConfig:
@@ -66,6 +104,41 @@ class RobotFrameworkServerApi(PythonLanguageServer):
     def m_workspace__did_change_configuration(self, **kwargs):
         PythonLanguageServer.m_workspace__did_change_configuration(self, **kwargs)
         self.libspec_manager.config = self.config
+        self._import_prefetcher.postpone()
+        self._incremental_linter.clear()
+
+    @overrides(PythonLanguageServer.m_text_document__did_open)
+    def m_text_document__did_open(self, textDocument=None, **_kwargs) -> None:
+        PythonLanguageServer.m_text_document__did_open(
+            self, textDocument=textDocument, **_kwargs
+        )
+        # Warm the caches for the imports of the new document in the
+        # background.
+        self._import_prefetcher.prefetch(textDocument["uri"])
+
+    @overrides(PythonLanguageServer.m_text_document__did_change)
+    def m_text_document__did_change(
+        self, contentChanges=None, textDocument=None, **_kwargs
+    ):
+        PythonLanguageServer.m_text_document__did_change(
+            self, contentChanges=contentChanges, textDocument=textDocument, **_kwargs
+        )
+        self._import_prefetcher.postpone()
+        # Note: the dependents are only notified when the document is linted
+        # and the symbols it exports changed (see: _threaded_lint).
+
+    @overrides(PythonLanguageServer.m_text_document__did_close)
+    def m_text_document__did_close(self, textDocument=None, **_kwargs) -> None:
+        self._import_prefetcher.cancel(textDocument["uri"])
+        self._incremental_linter.remove_document(textDocument["uri"])
+        PythonLanguageServer.m_text_document__did_close(
+            self, textDocument=textDocument, **_kwargs
+        )
+        # i.e.: the contents are now the ones in the filesystem.
+        self._notify_dependents_changed(textDocument["uri"])
+        # Note: only its own imports/exports are removed (the documents which
+        # import it are still notified if it changes).
+        self._import_graph.remove_document(textDocument["uri"])
 
     @overrides(PythonLanguageServer.lint)
     def lint(self, *args, **kwargs):
@@ -103,23 +176,20 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
 
         try:
-            from robotframework_ls.impl.ast_utils import collect_errors
-            from robotframework_ls.impl import code_analysis
-
             log.debug("Lint: starting (in thread).")
 
             completion_context = self._create_completion_context(doc_uri, 0, 0, monitor)
             if completion_context is None:
                 return []
 
-            ast = completion_context.get_ast()
-            monitor.check_cancelled()
-            errors = collect_errors(ast)
-            log.debug("Collected AST errors (in thread): %s", len(errors))
-            monitor.check_cancelled()
-            analysis_errors = code_analysis.collect_analysis_errors(completion_context)
-            log.debug("Collected analysis errors (in thread): %s", len(analysis_errors))
-            errors.extend(analysis_errors)
+            # Note: only the blocks which changed since the last lint are
+            # analyzed again.
+            errors = self._incremental_linter.lint(completion_context)
+            log.debug("Collected errors (in thread): %s", len(errors))
+            for changed_uri in self._import_graph.update(completion_context):
+                # i.e.: the keywords/variables/imports of the document (or of
+                # some resource it imports) changed.
+                self._notify_dependents_changed(changed_uri, skip_uri=doc_uri)
             return [error.to_lsp_diagnostic() for error in errors]
         except JsonRpcRequestCancelled:
             raise JsonRpcRequestCancelled("Lint cancelled (inside lint)")
@@ -299,10 +369,17 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
         return signature_help(completion_context)
 
+    def m_libspec_manager_status(self):
+        # Note: computed in a thread (the memory size of the loaded libraries
+        # is computed on each request).
+        return self.libspec_manager.get_status
+
     def m_shutdown(self, **_kwargs):
         PythonLanguageServer.m_shutdown(self, **_kwargs)
+        self._import_prefetcher.dispose()
         self.libspec_manager.dispose()
 
     def m_exit(self, **_kwargs):
         PythonLanguageServer.m_exit(self, **_kwargs)
+        self._import_prefetcher.dispose()
         self.libspec_manager.dispose()
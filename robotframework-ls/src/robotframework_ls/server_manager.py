@@ -67,6 +67,13 @@ class _ServerApi(object):
                 f"This may only be called at the thread: {self._main_thread}. Current thread: {curr_thread}"
             )
 
+    def _on_dependents_changed(self, api, msg):
+        # Note: called in the api reader thread.
+        language_server = self._language_server_ref()
+        if language_server is not None:
+            doc_uris = msg.get("params", {}).get("uris", [])
+            language_server.on_dependents_changed(api, doc_uris)
+
     @property
     def robot_framework_language_server(self):
         return self._language_server_ref()
@@ -263,6 +270,9 @@ class _ServerApi(object):
                 api = self._robotframework_api_client = RobotFrameworkApiClient(
                     w, r, server_process
                 )
+                api.register_notification_handler(
+                    "dependentsChanged", partial(self._on_dependents_changed, api)
+                )
 
                 log.debug(
                     "Initializing api... (this pid: %s, api pid: %s).",
@@ -568,6 +578,22 @@ class ServerManager(object):
             return api.get_robotframework_api_client()
         return None
 
+    def get_regular_and_lint_rf_api_clients(
+        self, doc_uri: Optional[str] = None
+    ) -> Tuple[Optional[IRobotFrameworkApiClient], Optional[IRobotFrameworkApiClient]]:
+        """
+        :param doc_uri:
+            If not given, the clients for the default interpreter are returned.
+        """
+        if doc_uri:
+            apis = self._get_apis_for_doc_uri(doc_uri)
+        else:
+            apis = self._get_default_apis()
+        return (
+            apis.api.get_robotframework_api_client(),
+            apis.lint_api.get_robotframework_api_client(),
+        )
+
     def get_source_format_rf_api_client(self) -> Optional[IRobotFrameworkApiClient]:
         api = self._get_source_format_api()
         if api is not None:
@@ -55,15 +55,19 @@ def verify_changes(model=10):
 """
     with open(library_py, "w") as stream:
         stream.write(contents)
-    completions = keyword_completions.complete(
-        CompletionContext(doc, workspace=workspace.ws)
-    )
 
-    assert sorted(completion["label"] for completion in completions) == [
-        "Verify Another Model",
-        "Verify Changes",
-        "Verify Model",
-    ]
+    # The stale version may be served while the libspec is regenerated in
+    # the background.
+    timeout_at = time.time() + 20
+    while True:
+        completions = keyword_completions.complete(
+            CompletionContext(doc, workspace=workspace.ws)
+        )
+        labels = sorted(completion["label"] for completion in completions)
+        if labels == ["Verify Another Model", "Verify Changes", "Verify Model"]:
+            break
+        assert time.time() < timeout_at, "Found: %s" % (labels,)
+        time.sleep(0.1)
 
 
 @pytest.mark.parametrize(
@@ -481,3 +485,48 @@ Can use resource keywords
     )
 
     data_regression.check(completions)
+
+
+def test_keyword_completions_library_args(libspec_manager, workspace, workspace_dir):
+    from os.path import os
+    from robocorp_ls_core import uris
+    from robotframework_ls.impl import keyword_completions
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robocorp_ls_core.lsp import TextDocumentItem
+
+    os.makedirs(workspace_dir)
+    with open(os.path.join(workspace_dir, "dynamic_lib.py"), "w") as stream:
+        stream.write(
+            """
+class dynamic_lib(object):
+    def __init__(self, *names):
+        self._names = list(names) or ["Dynamic Default"]
+
+    def get_keyword_names(self):
+        return self._names
+
+    def run_keyword(self, name, args):
+        pass
+"""
+        )
+
+    workspace.set_root(workspace_dir, libspec_manager=libspec_manager)
+    doc = workspace.ws.put_document(
+        TextDocumentItem(
+            uris.from_fs_path(os.path.join(workspace_dir, "temp_doc.robot")), text=""
+        )
+    )
+    doc.source = """*** Settings ***
+Library    dynamic_lib    Dynamic First    Dynamic Second
+
+*** Test Cases ***
+Can use dynamic keywords
+    Dynamic"""
+
+    completions = keyword_completions.complete(
+        CompletionContext(doc, workspace=workspace.ws)
+    )
+    assert sorted(completion["label"] for completion in completions) == [
+        "Dynamic First",
+        "Dynamic Second",
+    ]
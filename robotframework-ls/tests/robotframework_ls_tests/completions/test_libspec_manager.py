@@ -1,4 +1,5 @@
 import os
+import time
 from pathlib import Path
 
 
@@ -140,3 +141,1288 @@ def test_libspec_manager_caches(libspec_manager, workspace_dir):
 
     # Updating is done in a thread.
     wait_for_test_condition(check_spec_2_a, sleep=1 / 5.0)
+
+
+def test_libspec_manager_libspecs_changed(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+    import os.path
+    import threading
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+
+    changed = []
+    lock = threading.Lock()
+
+    def on_libspecs_changed(libnames):
+        with lock:
+            changed.extend(libnames)
+
+    libspec_manager.register_libspecs_changed_callback(on_libspecs_changed)
+
+    workspace_dir_a = os.path.join(workspace_dir, "workspace_dir_a")
+    os.makedirs(workspace_dir_a)
+    libspec_manager.add_workspace_folder(uris.from_fs_path(workspace_dir_a))
+
+    with open(os.path.join(workspace_dir_a, "my.libspec"), "w") as stream:
+        stream.write(LIBSPEC_1)
+
+    def check_changed():
+        with lock:
+            return "my" in changed
+
+    wait_for_test_condition(check_changed, msg=lambda: str(changed), sleep=1 / 5.0)
+
+    with lock:
+        del changed[:]
+    os.remove(os.path.join(workspace_dir_a, "my.libspec"))
+    wait_for_test_condition(check_changed, msg=lambda: str(changed), sleep=1 / 5.0)
+
+
+def test_libspec_manager_name_index(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+    from robotframework_ls_tests.fixtures import LIBSPEC_2
+    from robotframework_ls.impl.libspec_manager import _norm_filename
+
+    os.makedirs(workspace_dir)
+    with open(os.path.join(workspace_dir, "my.libspec"), "w") as stream:
+        stream.write(LIBSPEC_1)
+    with open(os.path.join(workspace_dir, "my2.libspec"), "w") as stream:
+        stream.write(LIBSPEC_2)
+
+    workspace_uri = uris.from_fs_path(workspace_dir)
+    libspec_manager.add_workspace_folder(workspace_uri)
+    library_info = libspec_manager.get_library_info("CASE1_LIBRARY", create=False)
+    assert library_info is not None
+    assert library_info.name == "case1_library"
+
+    # Only the spec which was requested should've been loaded.
+    folder_info = libspec_manager._workspace_folder_uri_to_folder_info[workspace_uri]
+    filename_to_info = folder_info.libspec_canonical_filename_to_info
+    assert filename_to_info[_norm_filename(os.path.join(workspace_dir, "my.libspec"))]
+    assert (
+        filename_to_info[_norm_filename(os.path.join(workspace_dir, "my2.libspec"))]
+        is None
+    )
+
+
+def test_libspec_manager_libdoc_worker(libspec_manager, workspace_dir):
+    from robotframework_ls.impl.libspec_worker import LibdocWorkerPool
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "worker_lib.py"
+    path.write_text(
+        """
+def method():
+    pass
+"""
+    )
+
+    library_info = libspec_manager.get_library_info("worker_lib")
+    assert [k.name for k in library_info.keywords] == ["Method"]
+
+    pool: LibdocWorkerPool = libspec_manager._get_libdoc_worker_pool(None)
+    assert len(pool._idle_workers) == 1
+    pid = pool._idle_workers[0].pid
+
+    # The worker must pick up the changes in the library.
+    path.write_text(
+        """
+def method():
+    pass
+
+def method2():
+    pass
+"""
+    )
+    assert libspec_manager._create_libspec("worker_lib")
+    libspec_manager.synchronize_internal_libspec_folders()
+
+    library_info = libspec_manager.get_library_info("worker_lib", create=False)
+    assert [k.name for k in library_info.keywords] == ["Method", "Method 2"]
+    assert [w.pid for w in pool._idle_workers] == [pid]
+
+
+def test_libdoc_worker_reloads_changed_package(tmpdir):
+    from robotframework_ls.impl.libspec_worker import LibdocWorkerPool
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+
+    # The package isn't in the reload paths (i.e.: it's installed in the
+    # site-packages), so, it's only reloaded when some module changes.
+    site_packages = Path(str(tmpdir.join("site-packages")))
+    package_dir = site_packages / "worker_pkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("from worker_pkg._impl import *\n")
+    impl = package_dir / "_impl.py"
+    impl.write_text("def method_a():\n    pass\n")
+
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(site_packages)
+    pool = LibdocWorkerPool(env=env, max_workers=1)
+    try:
+
+        def get_keyword_names():
+            libspec_filename = str(tmpdir.join("worker_pkg.libspec"))
+            returncode, output = pool.run_libdoc(
+                ["--format", "XML:HTML", "worker_pkg", libspec_filename]
+            )
+            assert returncode == 0, output
+            library_doc = SpecDocBuilder().build(libspec_filename)
+            return [k.name for k in library_doc.keywords]
+
+        assert get_keyword_names() == ["Method A"]
+
+        impl.write_text("def method_b():\n    pass\n")
+        mtime = os.path.getmtime(str(impl)) + 10
+        os.utime(str(impl), (mtime, mtime))
+        assert get_keyword_names() == ["Method B"]
+    finally:
+        pool.dispose()
+
+
+def test_libspec_manager_single_flight(libspec_manager, workspace_dir):
+    import threading
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "single_flight_lib.py"
+    path.write_text(
+        """
+def method():
+    pass
+"""
+    )
+
+    original_create_libspec = libspec_manager._create_libspec
+    started = threading.Event()
+    proceed = threading.Event()
+    calls = []
+
+    def _create_libspec(*args, **kwargs):
+        calls.append(args)
+        started.set()
+        assert proceed.wait(10)
+        return original_create_libspec(*args, **kwargs)
+
+    libspec_manager._create_libspec = _create_libspec
+
+    results = []
+
+    def get_library_info():
+        results.append(libspec_manager.get_library_info("single_flight_lib"))
+
+    threads = [threading.Thread(target=get_library_info) for _i in range(4)]
+    for t in threads:
+        t.start()
+
+    assert started.wait(10)
+    # Give the other threads some time to reach the in-flight generation.
+    while len(libspec_manager._libspec_creation_key_to_future) != 1:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    proceed.set()
+
+    for t in threads:
+        t.join(10)
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(r is not None and r.name == "single_flight_lib" for r in results)
+    assert not libspec_manager._libspec_creation_key_to_future
+
+
+def test_libspec_manager_failure_backoff(libspec_manager, workspace_dir):
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "failing_lib.py"
+    path.write_text(
+        """
+import failing_lib_dependency
+
+def method():
+    pass
+"""
+    )
+
+    assert libspec_manager.get_library_info("failing_lib") is None
+    error = libspec_manager.get_library_creation_error("failing_lib")
+    assert "failing_lib_dependency" in error
+
+    original_create_libspec = libspec_manager._create_libspec
+    calls = []
+
+    def _create_libspec(*args, **kwargs):
+        calls.append(args)
+        return original_create_libspec(*args, **kwargs)
+
+    libspec_manager._create_libspec = _create_libspec
+
+    # It's not retried while in the backoff.
+    assert libspec_manager.get_library_info("failing_lib") is None
+    assert not calls
+
+    # Unrelated changes in the pythonpath folders don't invalidate the failure.
+    (Path(workspace_dir) / "failing_lib_dependency.py").write_text("")
+    assert libspec_manager.get_library_info("failing_lib") is None
+    assert not calls
+
+    # Changes in the library itself invalidate the failure.
+    path.write_text(path.read_text() + "\n")
+    mtime = os.path.getmtime(str(path)) + 2
+    os.utime(str(path), (mtime, mtime))
+    library_info = libspec_manager.get_library_info("failing_lib")
+    assert library_info is not None
+    assert [k.name for k in library_info.keywords] == ["Method"]
+    assert len(calls) == 1
+    assert libspec_manager.get_library_creation_error("failing_lib") is None
+
+
+def test_libspec_manager_failure_backoff_fingerprint(
+    libspec_manager, workspace_dir, tmpdir, monkeypatch
+):
+    import sys
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    package_dir = Path(workspace_dir) / "failing_package"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("from failing_package.sub import method\n")
+    submodule = package_dir / "sub.py"
+    submodule.write_text("import failing_package_dependency\n")
+
+    site_packages = tmpdir.join("site-packages")
+    site_packages.ensure(dir=True)
+    monkeypatch.setattr(sys, "path", sys.path + [str(site_packages)])
+
+    assert libspec_manager.get_library_info("failing_package") is None
+
+    original_create_libspec = libspec_manager._create_libspec
+    calls = []
+
+    def _create_libspec(*args, **kwargs):
+        calls.append(args)
+        return original_create_libspec(*args, **kwargs)
+
+    libspec_manager._create_libspec = _create_libspec
+
+    def touch(path):
+        mtime = os.path.getmtime(str(path)) + 2
+        os.utime(str(path), (mtime, mtime))
+
+    assert libspec_manager.get_library_info("failing_package") is None
+    assert not calls
+
+    # Something installed in the sys.path (i.e.: pip install) invalidates it.
+    site_packages.join("failing_package_dependency").ensure(dir=True)
+    touch(site_packages)
+    assert libspec_manager.get_library_info("failing_package") is None
+    assert len(calls) == 1
+
+    # Fixing the broken submodule also invalidates it.
+    submodule.write_text("def method():\n    pass\n")
+    touch(submodule)
+    library_info = libspec_manager.get_library_info("failing_package")
+    assert library_info is not None
+    assert [k.name for k in library_info.keywords] == ["Method"]
+    assert len(calls) == 2
+
+
+def test_libspec_manager_timeout(libspec_manager, workspace_dir):
+    from robotframework_ls.robot_config import RobotConfig
+    from robotframework_ls.impl.robot_lsp_constants import OPTION_ROBOT_LIBDOC_TIMEOUT
+    from robotframework_ls.impl.robot_lsp_constants import OPTION_ROBOT_PYTHONPATH
+    from robocorp_ls_core.basic import is_process_alive
+
+    os.makedirs(workspace_dir)
+    pid_file = Path(workspace_dir) / "child.pid"
+    path = Path(workspace_dir) / "hanging_lib.py"
+    path.write_text(
+        """
+import subprocess
+import sys
+import time
+
+_process = subprocess.Popen([sys.executable, "-c", "import time;time.sleep(60)"])
+with open(%r, "w") as stream:
+    stream.write(str(_process.pid))
+time.sleep(60)
+
+def method():
+    pass
+"""
+        % (str(pid_file),)
+    )
+
+    config = RobotConfig()
+    config.update(
+        {OPTION_ROBOT_LIBDOC_TIMEOUT: 5, OPTION_ROBOT_PYTHONPATH: [workspace_dir]}
+    )
+    libspec_manager.config = config
+
+    initial_time = time.time()
+    assert libspec_manager.get_library_info("hanging_lib") is None
+    assert time.time() - initial_time < 30
+
+    error = libspec_manager.get_library_creation_error("hanging_lib")
+    assert "timed out" in error
+
+    # The whole process tree must be killed.
+    child_pid = int(pid_file.read_text())
+    timeout_at = time.time() + 5
+    while is_process_alive(child_pid):
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+
+
+def test_libspec_manager_sources_tracked(libspec_manager, workspace_dir):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    import shutil
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "tracked_lib.py"
+    path.write_text(
+        """
+def method():
+    pass
+"""
+    )
+
+    library_info = libspec_manager.get_library_info("tracked_lib")
+    assert [k.name for k in library_info.keywords] == ["Method"]
+    (lib_info,) = libspec_manager._iter_lib_info_for_name("tracked_lib")
+
+    original = libspec_manager_module._create_updated_source_to_mtime
+    calls = []
+
+    def _create_updated_source_to_mtime(library_doc):
+        calls.append(library_doc)
+        return original(library_doc)
+
+    libspec_manager_module._create_updated_source_to_mtime = (
+        _create_updated_source_to_mtime
+    )
+    try:
+        # Sources are not checked again in the hot path.
+        for _i in range(3):
+            assert libspec_manager.get_library_info("tracked_lib") is library_info
+        assert not calls
+    finally:
+        libspec_manager_module._create_updated_source_to_mtime = original
+
+    path.write_text(
+        """
+def method():
+    pass
+
+def method2():
+    pass
+"""
+    )
+
+    # The watcher must invalidate it (and the libspec is regenerated in the
+    # background).
+    timeout_at = time.time() + 10
+    while True:
+        library_info = libspec_manager.get_library_info("tracked_lib")
+        if [k.name for k in library_info.keywords] == ["Method", "Method 2"]:
+            break
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+    assert not lib_info.verify_sources_sync()
+
+
+def test_libspec_manager_stale_while_revalidate(libspec_manager, workspace_dir):
+    import threading
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "stale_lib.py"
+    path.write_text(
+        """
+def method():
+    pass
+"""
+    )
+
+    library_info = libspec_manager.get_library_info("stale_lib")
+    assert [k.name for k in library_info.keywords] == ["Method"]
+    (lib_info,) = libspec_manager._iter_lib_info_for_name("stale_lib")
+
+    regenerated = []
+    regenerated_event = threading.Event()
+
+    def on_libspecs_regenerated(libnames):
+        regenerated.append(libnames)
+        regenerated_event.set()
+
+    libspec_manager.register_libspecs_regenerated_callback(on_libspecs_regenerated)
+
+    # Don't let the regeneration finish until we check that the stale version
+    # is served.
+    original_create_libspec = libspec_manager._create_libspec
+    can_create_event = threading.Event()
+
+    def _create_libspec(*args, **kwargs):
+        can_create_event.wait(10)
+        return original_create_libspec(*args, **kwargs)
+
+    libspec_manager._create_libspec = _create_libspec
+
+    path.write_text(
+        """
+def method():
+    pass
+
+def method2():
+    pass
+"""
+    )
+    timeout_at = time.time() + 10
+    while lib_info.verify_sources_sync():
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+
+    # The stale version is served right away.
+    library_info = libspec_manager.get_library_info("stale_lib")
+    assert [k.name for k in library_info.keywords] == ["Method"]
+    assert not regenerated
+
+    can_create_event.set()
+    assert regenerated_event.wait(10)
+    assert regenerated == [["stale_lib"]]
+
+    library_info = libspec_manager.get_library_info("stale_lib")
+    assert [k.name for k in library_info.keywords] == ["Method", "Method 2"]
+
+
+def test_libspec_manager_regenerate_from_previous_session(
+    libspec_manager, workspace_dir
+):
+    import json
+    import threading
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "session_lib.py"
+    path.write_text("def method():\n    pass\n")
+
+    library_info = libspec_manager.get_library_info("session_lib")
+    assert [k.name for k in library_info.keywords] == ["Method"]
+
+    # The creation args are saved with the libspec.
+    (lib_info,) = libspec_manager._iter_lib_info_for_name("session_lib")
+    with open(lib_info.canonical_spec_filename + ".m", "r") as stream:
+        assert json.load(stream)["creation_args"][0] == "session_lib"
+
+    # i.e.: the libspec was created in a previous session.
+    libspec_manager._spec_filename_to_creation_args.clear()
+
+    regenerated_event = threading.Event()
+    libspec_manager.register_libspecs_regenerated_callback(
+        lambda libnames: regenerated_event.set()
+    )
+
+    path.write_text("def method():\n    pass\n\ndef method2():\n    pass\n")
+    timeout_at = time.time() + 10
+    while lib_info.verify_sources_sync():
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+
+    # It's regenerated in the background (without being requested).
+    assert regenerated_event.wait(10)
+    library_info = libspec_manager.get_library_info("session_lib", create=False)
+    assert [k.name for k in library_info.keywords] == ["Method", "Method 2"]
+
+
+def test_libspec_manager_prebuilt_builtins(tmpdir, cases, monkeypatch):
+    import shutil
+    import robot
+    from robotframework_ls.impl import robot_constants
+    from robotframework_ls.impl.libspec_manager import LibspecManager
+    from robotframework_ls.impl.libspec_manager import ENV_PREBUILT_LIBSPECS_DIR
+
+    prebuilt_dir = tmpdir.join("prebuilt")
+    version_dir = prebuilt_dir.join(LibspecManager.get_robot_version())
+    version_dir.ensure(dir=True)
+    builtin_libs = cases.get_path("builtin_libs")
+    for libname in robot_constants.STDLIBS:
+        shutil.copyfile(
+            os.path.join(builtin_libs, libname + ".libspec"),
+            str(version_dir.join(libname + ".libspec")),
+        )
+    monkeypatch.setenv(ENV_PREBUILT_LIBSPECS_DIR, str(prebuilt_dir))
+
+    def _create_libspec(*args, **kwargs):
+        raise AssertionError("libdoc should not be run for the builtins.")
+
+    monkeypatch.setattr(LibspecManager, "_create_libspec", _create_libspec)
+
+    libspec_manager = LibspecManager(
+        builtin_libspec_dir=str(tmpdir.join("builtins")),
+        user_libspec_dir=str(tmpdir.join("user")),
+    )
+    try:
+        library_doc = libspec_manager.get_library_info("BuiltIn", create=False)
+        assert library_doc is not None
+        assert library_doc.keywords
+
+        # The sources must point to the robot package available.
+        assert library_doc.source == os.path.join(
+            os.path.dirname(robot.__file__), "libraries", "BuiltIn.py"
+        )
+    finally:
+        libspec_manager.dispose()
+
+
+def test_libspec_manager_store(tmpdir, monkeypatch):
+    from robotframework_ls.impl.libspec_manager import LibspecManager
+    from robotframework_ls.robot_config import RobotConfig
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_LIBDOC_SHARED_STORE,
+    )
+
+    contents = """
+def method():
+    pass
+"""
+    workspace1 = tmpdir.join("workspace1")
+    workspace1.join("store_lib.py").write(contents, ensure=True)
+    workspace2 = tmpdir.join("workspace2")
+    workspace2.join("store_lib.py").write(contents, ensure=True)
+
+    def create_libspec_manager(name, store_dir):
+        libspec_manager = LibspecManager(
+            user_libspec_dir=str(tmpdir.join(name)), libspec_store_dir=store_dir
+        )
+        libspec_manager.add_additional_pythonpath_folder(str(workspace1))
+        return libspec_manager
+
+    store_dir = str(tmpdir.join("store"))
+    libspec_manager = create_libspec_manager("user1", store_dir)
+    try:
+        library_doc = libspec_manager.get_library_info("store_lib")
+        assert [k.name for k in library_doc.keywords] == ["Method"]
+    finally:
+        libspec_manager.dispose()
+
+    # Same sources in another folder: libdoc must not be run (and the sources
+    # must point to the new folder).
+    def _run_libdoc(*args, **kwargs):
+        raise AssertionError("libdoc should not be run.")
+
+    monkeypatch.setattr(LibspecManager, "_run_libdoc", _run_libdoc)
+
+    libspec_manager = create_libspec_manager("user2", store_dir)
+    libspec_manager.remove_additional_pythonpath_folder(str(workspace1))
+    libspec_manager.add_additional_pythonpath_folder(str(workspace2))
+    try:
+        library_doc = libspec_manager.get_library_info("store_lib")
+        assert [k.name for k in library_doc.keywords] == ["Method"]
+        assert library_doc.source == str(workspace2.join("store_lib.py"))
+    finally:
+        libspec_manager.dispose()
+
+    # Use the store as a read-only store (with an empty local store).
+    libspec_manager = create_libspec_manager("user3", str(tmpdir.join("store3")))
+    try:
+        config = RobotConfig()
+        config.update(
+            {
+                OPTION_ROBOT_LIBDOC_SHARED_STORE: [store_dir],
+                "robot.pythonpath": [str(workspace1)],
+            }
+        )
+        libspec_manager.config = config
+        library_doc = libspec_manager.get_library_info("store_lib")
+        assert [k.name for k in library_doc.keywords] == ["Method"]
+
+        # If the sources differ, the stored libspec isn't used.
+        workspace1.join("store_lib.py").write(contents + "\ndef method2():\n    pass\n")
+        key = libspec_manager._libspec_store.compute_key("store_lib", [str(workspace1)])
+        assert not libspec_manager._libspec_store.fetch(
+            key, str(tmpdir.join("fetched.libspec"))
+        )
+    finally:
+        libspec_manager.dispose()
+
+
+def test_libspec_store_distribution_version(monkeypatch):
+    from robotframework_ls.impl import libspec_store
+    import robot
+
+    libspec_store._get_distribution_version.cache_clear()
+    version = libspec_store._get_distribution_version("robot")
+    assert version == robot.get_version(naked=True)
+
+    # It's computed only once per module.
+    monkeypatch.setattr(libspec_store, "_get_packages_distributions_func", None)
+    assert libspec_store._get_distribution_version("robot") == version
+
+    # i.e.: Python < 3.10 without the importlib_metadata backport.
+    libspec_store._get_distribution_version.cache_clear()
+    monkeypatch.setattr(libspec_store, "_get_packages_distributions_func", lambda: None)
+    try:
+        pkg_resources_version = libspec_store._get_distribution_version("robot")
+        assert pkg_resources_version in (version, "0")
+        assert libspec_store._get_distribution_version("not_there_module") == "0"
+    finally:
+        libspec_store._get_distribution_version.cache_clear()
+
+
+def test_libspec_store_key_hashes_cached(tmpdir, monkeypatch):
+    from robotframework_ls.impl import libspec_store
+
+    package_dir = tmpdir.join("hashed_package")
+    package_dir.join("__init__.py").write("from .sub import *\n", ensure=True)
+    package_dir.join("sub.py").write("def method():\n    pass\n")
+
+    store = libspec_store.LibspecStore(str(tmpdir.join("store")), "3.2")
+    key = store.compute_key("hashed_package", [str(tmpdir)])
+    assert key is not None
+
+    # The sources are only read again if their mtime/size changes.
+    def _open(*args, **kwargs):
+        raise AssertionError("Sources should not be read again.")
+
+    monkeypatch.setattr(libspec_store, "open", _open, raising=False)
+    assert store.compute_key("hashed_package", [str(tmpdir)]).entry_name == (
+        key.entry_name
+    )
+    monkeypatch.undo()
+
+    package_dir.join("sub.py").write("def method2():\n    pass\n")
+    assert store.compute_key("hashed_package", [str(tmpdir)]).entry_name != (
+        key.entry_name
+    )
+
+
+def test_libspec_manager_publish_compiled_in_use(
+    libspec_manager, workspace_dir, monkeypatch
+):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    import shutil
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    Path(workspace_dir, "in_use_lib.py").write_text("def method():\n    pass\n")
+    assert libspec_manager.get_library_info("in_use_lib") is not None
+
+    user_libspec_dir = libspec_manager.user_libspec_dir
+    libspec_filename = os.path.join(user_libspec_dir, "in_use_lib.libspec")
+    tmp_filename = os.path.join(user_libspec_dir, ".tmp_0_0_in_use_lib.libspec")
+    shutil.copyfile(libspec_filename, tmp_filename)
+
+    # i.e.: on Windows a compiled file which is mapped can't be replaced.
+    original_replace = os.replace
+
+    def replace(src, dst):
+        if dst == libspec_filename + ".bin":
+            raise PermissionError("In use: %s" % (dst,))
+        return original_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+    libspec_manager_module._publish_libspec(tmp_filename, libspec_filename, False)
+    monkeypatch.undo()
+
+    # The libspec is still published (and the temporary files are removed).
+    assert not [f for f in os.listdir(user_libspec_dir) if f.startswith(".tmp_")]
+    library_doc = libspec_manager_module._load_library_doc_and_mtime(
+        libspec_filename, use_compiled=True
+    )[0]
+    assert [k.name for k in library_doc.keywords] == ["Method"]
+
+
+def test_libspec_manager_publish_builtin_compiled(libspec_manager, tmpdir, monkeypatch):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    from robotframework_ls.impl import libspec_compiled
+    from robotframework_ls.impl.robot_specbuilder import markdown_doc
+    from robotframework_ls import html_to_markdown
+    import shutil
+
+    (lib_info,) = libspec_manager._iter_lib_info_for_name("builtin")
+    libspec_filename = str(tmpdir.join("BuiltIn.libspec"))
+    tmp_filename = str(tmpdir.join(".tmp_0_0_BuiltIn.libspec"))
+    shutil.copyfile(lib_info.library_doc.filename, tmp_filename)
+
+    libspec_manager_module._publish_libspec(tmp_filename, libspec_filename, True)
+    assert os.path.exists(libspec_compiled.get_compiled_filename(libspec_filename))
+
+    # The markdown for the builtins is also computed when it's published.
+    def convert(html):
+        raise AssertionError("The markdown should've been precomputed.")
+
+    library_doc = libspec_manager_module._load_library_doc_and_mtime(
+        libspec_filename, use_compiled=True
+    )[0]
+    monkeypatch.setattr(html_to_markdown, "convert", convert)
+    assert markdown_doc(library_doc.keywords[0])
+
+
+def test_libspec_manager_atomic_publish(libspec_manager, workspace_dir):
+    import shutil
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir) / "atomic_lib.py"
+    path.write_text(
+        """
+def method():
+    pass
+"""
+    )
+    assert libspec_manager.get_library_info("atomic_lib") is not None
+
+    user_libspec_dir = libspec_manager.user_libspec_dir
+    assert sorted(
+        f for f in os.listdir(user_libspec_dir) if f.startswith("atomic_lib")
+    ) == ["atomic_lib.libspec", "atomic_lib.libspec.bin", "atomic_lib.libspec.m"]
+
+    # Temporary libspecs are not indexed.
+    libspec_filename = os.path.join(user_libspec_dir, "atomic_lib.libspec")
+    tmp_filename = os.path.join(user_libspec_dir, ".tmp_0_0_other_lib.libspec")
+    shutil.copyfile(libspec_filename, tmp_filename)
+    libspec_manager.synchronize_internal_libspec_folders()
+    assert [
+        lib_info.library_doc.filename
+        for lib_info in libspec_manager._iter_lib_info_for_name("atomic_lib")
+    ] == [libspec_filename]
+
+    # A libspec moved to its place (by another process) must be noticed.
+    shutil.copyfile(
+        libspec_filename, os.path.join(user_libspec_dir, ".tmp_0_0_atomic_lib.libspec")
+    )
+    os.remove(libspec_filename)
+    libspec_manager.synchronize_internal_libspec_folders()
+    assert libspec_manager.get_library_info("atomic_lib", create=False) is None
+    time.sleep(1)  # Let the removal be notified.
+
+    os.replace(
+        os.path.join(user_libspec_dir, ".tmp_0_0_atomic_lib.libspec"), libspec_filename
+    )
+    timeout_at = time.time() + 10
+    while libspec_manager.get_library_info("atomic_lib", create=False) is None:
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+
+
+def test_libspec_manager_library_args(libspec_manager, workspace_dir):
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    Path(workspace_dir, "dynamic_lib.py").write_text(
+        """
+class dynamic_lib(object):
+    def __init__(self, *names):
+        self._names = list(names) or ["Default Keyword"]
+
+    def get_keyword_names(self):
+        return self._names
+
+    def run_keyword(self, name, args):
+        pass
+"""
+    )
+    Path(workspace_dir, "static_lib.py").write_text(
+        """
+class static_lib(object):
+    def __init__(self, mode="slow"):
+        pass
+
+    def method(self):
+        pass
+"""
+    )
+
+    def keyword_names(library_doc):
+        return [k.name for k in library_doc.keywords]
+
+    library_doc = libspec_manager.get_library_info("dynamic_lib")
+    assert keyword_names(library_doc) == ["Default Keyword"]
+
+    library_doc = libspec_manager.get_library_info(
+        "dynamic_lib", lib_args=("Keyword A", "Keyword B")
+    )
+    assert keyword_names(library_doc) == ["Keyword A", "Keyword B"]
+
+    library_doc = libspec_manager.get_library_info("dynamic_lib", lib_args=("Other",))
+    assert keyword_names(library_doc) == ["Other"]
+
+    # Cached (not generated again).
+    assert (
+        libspec_manager.get_library_info(
+            "dynamic_lib", lib_args=("Keyword A", "Keyword B"), create=False
+        )
+        is not None
+    )
+    assert keyword_names(libspec_manager.get_library_info("dynamic_lib")) == [
+        "Default Keyword"
+    ]
+
+    # When the keywords don't depend on the arguments the libspec without
+    # arguments is used (and other arguments don't generate a new libspec).
+    static_doc = libspec_manager.get_library_info("static_lib")
+    library_doc = libspec_manager.get_library_info(
+        "static_lib", lib_args=("mode=fast",)
+    )
+    assert library_doc.filename == static_doc.filename
+
+    created = []
+    original_create_libspec = libspec_manager._create_libspec
+
+    def _create_libspec(*args, **kwargs):
+        created.append(args)
+        return original_create_libspec(*args, **kwargs)
+
+    libspec_manager._create_libspec = _create_libspec
+    library_doc = libspec_manager.get_library_info("static_lib", lib_args=("mode=x",))
+    assert library_doc.filename == static_doc.filename
+    assert not created
+
+
+def test_libspec_manager_library_args_stale_while_revalidate(
+    libspec_manager, workspace_dir
+):
+    import threading
+
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    path = Path(workspace_dir, "stale_args_lib.py")
+    path.write_text(
+        """
+class stale_args_lib(object):
+    def __init__(self, *names):
+        self._names = list(names) or ["Default Keyword"]
+
+    def get_keyword_names(self):
+        return self._names
+
+    def run_keyword(self, name, args):
+        pass
+"""
+    )
+
+    def keyword_names(library_doc):
+        return [k.name for k in library_doc.keywords]
+
+    library_doc = libspec_manager.get_library_info("stale_args_lib", lib_args=("A",))
+    assert keyword_names(library_doc) == ["A"]
+    (lib_info,) = libspec_manager._libspec_with_args_filename_to_lib_info.values()
+
+    # Don't let the regeneration finish until we check that the stale version
+    # is served.
+    original_create_libspec = libspec_manager._create_libspec
+    can_create_event = threading.Event()
+
+    def _create_libspec(*args, **kwargs):
+        can_create_event.wait(10)
+        return original_create_libspec(*args, **kwargs)
+
+    libspec_manager._create_libspec = _create_libspec
+
+    path.write_text(
+        """
+class stale_args_lib(object):
+    def __init__(self, *names):
+        self._names = [n + " Changed" for n in names] or ["Default Keyword"]
+
+    def get_keyword_names(self):
+        return self._names
+
+    def run_keyword(self, name, args):
+        pass
+"""
+    )
+    timeout_at = time.time() + 10
+    while lib_info.verify_sources_sync():
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+
+    # The stale version is served right away.
+    library_doc = libspec_manager.get_library_info("stale_args_lib", lib_args=("A",))
+    assert keyword_names(library_doc) == ["A"]
+
+    can_create_event.set()
+    timeout_at = time.time() + 20
+    while True:
+        library_doc = libspec_manager.get_library_info(
+            "stale_args_lib", lib_args=("A",), create=False
+        )
+        if keyword_names(library_doc) == ["A Changed"]:
+            break
+        assert time.time() < timeout_at
+        time.sleep(0.1)
+
+
+def test_libspec_manager_library_args_eviction(
+    libspec_manager, workspace_dir, monkeypatch
+):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+
+    monkeypatch.setattr(libspec_manager_module, "MAX_LIBSPECS_WITH_ARGS", 2)
+    os.makedirs(workspace_dir)
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    Path(workspace_dir, "dynamic_lib.py").write_text(
+        """
+class dynamic_lib(object):
+    def __init__(self, *names):
+        self._names = list(names) or ["Default Keyword"]
+
+    def get_keyword_names(self):
+        return self._names
+
+    def run_keyword(self, name, args):
+        pass
+"""
+    )
+
+    for name in ("A", "B", "C"):
+        library_doc = libspec_manager.get_library_info("dynamic_lib", lib_args=(name,))
+        assert [k.name for k in library_doc.keywords] == [name]
+
+    libspecs = [
+        f
+        for f in os.listdir(libspec_manager._user_libspec_with_args_dir)
+        if f.endswith(".libspec")
+    ]
+    assert len(libspecs) == 2
+
+    # The least recently used was removed.
+    assert (
+        libspec_manager.get_library_info("dynamic_lib", lib_args=("A",), create=False)
+        .keywords[0]
+        .name
+        == "Default Keyword"
+    )
+    assert (
+        libspec_manager.get_library_info("dynamic_lib", lib_args=("C",), create=False)
+        .keywords[0]
+        .name
+        == "C"
+    )
+
+
+def _by_libname(key_to_created):
+    return {key[0]: created for key, created in key_to_created.items()}
+
+
+def test_libspec_manager_create_libspecs_batch(
+    libspec_manager, workspace_dir, monkeypatch
+):
+    from robocorp_ls_core import uris
+    from robotframework_ls.impl.libspec_worker import LibdocWorkerPool
+
+    os.makedirs(workspace_dir)
+    for name in ("batch_lib_a", "batch_lib_b"):
+        Path(workspace_dir, name + ".py").write_text(
+            """
+def %s_method():
+    pass
+"""
+            % (name,)
+        )
+    Path(workspace_dir, "batch_lib_fail.py").write_text("raise RuntimeError('Fail')")
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+
+    calls = []
+    original_run_libdoc_batch = LibdocWorkerPool.run_libdoc_batch
+
+    def run_libdoc_batch(self, jobs, timeout=None, monitor=None):
+        calls.append(("batch", len(jobs)))
+        return original_run_libdoc_batch(self, jobs, timeout, monitor)
+
+    def run_libdoc(self, *args, **kwargs):
+        raise AssertionError("Libspecs should be generated in batch.")
+
+    monkeypatch.setattr(LibdocWorkerPool, "run_libdoc_batch", run_libdoc_batch)
+    monkeypatch.setattr(LibdocWorkerPool, "run_libdoc", run_libdoc)
+
+    libraries = [
+        ("batch_lib_a", doc_uri),
+        ("batch_lib_b", doc_uri),
+        ("batch_lib_fail", doc_uri),
+        ("BuiltIn", doc_uri),
+    ]
+    assert _by_libname(libspec_manager.create_libspecs(libraries)) == {
+        "batch_lib_a": True,
+        "batch_lib_b": True,
+        "batch_lib_fail": False,
+    }
+    assert calls == [("batch", 3)]
+
+    for name in ("batch_lib_a", "batch_lib_b"):
+        library_doc = libspec_manager.get_library_info(name, create=False)
+        assert [k.name for k in library_doc.keywords] == [
+            name.replace("_", " ").title() + " Method"
+        ]
+    assert "Fail" in libspec_manager.get_library_creation_error(
+        "batch_lib_fail", current_doc_uri=doc_uri
+    )
+
+    # Available libraries aren't generated again (and the failure is only
+    # retried after the backoff).
+    assert _by_libname(libspec_manager.create_libspecs(libraries)) == {
+        "batch_lib_fail": False
+    }
+    assert calls == [("batch", 3)]
+
+
+def test_libspec_manager_create_libspecs_cancelled(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+
+    os.makedirs(workspace_dir)
+    for name in ("cancel_lib_a", "cancel_lib_b"):
+        Path(workspace_dir, name + ".py").write_text(
+            """
+def %s_method():
+    pass
+"""
+            % (name,)
+        )
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+    libraries = [("cancel_lib_a", doc_uri), ("cancel_lib_b", doc_uri)]
+
+    class _CancelAfterFirstLibrary(object):
+        def __init__(self):
+            self.checks = 0
+
+        def check_cancelled(self):
+            self.checks += 1
+            if self.checks > 1:
+                raise JsonRpcRequestCancelled("Cancelled")
+
+    # The libraries after the cancellation are not created (and that's not
+    # a failure).
+    assert _by_libname(
+        libspec_manager.create_libspecs(libraries, _CancelAfterFirstLibrary())
+    ) == {"cancel_lib_a": True, "cancel_lib_b": False}
+    assert (
+        libspec_manager.get_library_creation_error(
+            "cancel_lib_b", current_doc_uri=doc_uri
+        )
+        is None
+    )
+
+    assert _by_libname(libspec_manager.create_libspecs(libraries)) == {
+        "cancel_lib_b": True
+    }
+
+
+def test_libspec_manager_create_libspecs_callback_error(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+
+    os.makedirs(workspace_dir)
+    Path(workspace_dir, "callback_error_lib.py").write_text("def method():\n    pass\n")
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+
+    def _on_libspec_creation_finished(*args, **kwargs):
+        raise RuntimeError("Error in callback.")
+
+    libspec_manager._on_libspec_creation_finished = _on_libspec_creation_finished
+
+    # The other threads waiting for the same libraries must be released even
+    # if some callback fails.
+    assert _by_libname(
+        libspec_manager.create_libspecs([("callback_error_lib", doc_uri)])
+    ) == {"callback_error_lib": True}
+    assert not libspec_manager._libspec_creation_key_to_future
+
+
+def test_libspec_manager_create_libspecs_same_name(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+
+    for dirname in ("a", "b"):
+        os.makedirs(os.path.join(workspace_dir, dirname))
+        Path(workspace_dir, dirname, "lib.py").write_text(
+            """
+def method_%s():
+    pass
+"""
+            % (dirname,)
+        )
+    os.makedirs(os.path.join(workspace_dir, "c"))
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "c", "case.robot"))
+
+    key_to_created = libspec_manager.create_libspecs(
+        [("../a/lib.py", doc_uri), ("../b/lib.py", doc_uri)]
+    )
+    assert sorted(
+        (os.path.basename(key[1]), created) for key, created in key_to_created.items()
+    ) == [("a", True), ("b", True)]
+
+
+def test_libspec_manager_create_libspecs_batch_timeout(
+    libspec_manager, workspace_dir, monkeypatch
+):
+    from robocorp_ls_core import uris
+    from robotframework_ls.robot_config import RobotConfig
+    from robotframework_ls.impl.robot_lsp_constants import OPTION_ROBOT_LIBDOC_TIMEOUT
+    from robotframework_ls.impl.libspec_worker import LibdocWorkerPool
+
+    os.makedirs(workspace_dir)
+    for name in ("batch_lib_a", "batch_lib_b"):
+        Path(workspace_dir, name + ".py").write_text(
+            """
+def %s_method():
+    pass
+"""
+            % (name,)
+        )
+    Path(workspace_dir, "batch_lib_hang.py").write_text("import time;time.sleep(60)")
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+
+    config = RobotConfig()
+    config.update({OPTION_ROBOT_LIBDOC_TIMEOUT: 3})
+    libspec_manager.config = config
+
+    def run_libdoc(self, *args, **kwargs):
+        raise AssertionError("Libspecs should not be generated separately.")
+
+    monkeypatch.setattr(LibdocWorkerPool, "run_libdoc", run_libdoc)
+
+    initial_time = time.time()
+    assert _by_libname(
+        libspec_manager.create_libspecs(
+            [
+                ("batch_lib_a", doc_uri),
+                ("batch_lib_hang", doc_uri),
+                ("batch_lib_b", doc_uri),
+            ]
+        )
+    ) == {"batch_lib_a": True, "batch_lib_hang": False, "batch_lib_b": True}
+    # The timeout applies to each library (not to the whole batch).
+    assert time.time() - initial_time < 20
+
+    assert "timed out" in libspec_manager.get_library_creation_error(
+        "batch_lib_hang", current_doc_uri=doc_uri
+    )
+
+
+def test_libspec_manager_scan_excludes(libspec_manager, workspace_dir, monkeypatch):
+    from robocorp_ls_core import uris
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+    from robotframework_ls_tests.fixtures import LIBSPEC_2
+    from robotframework_ls_tests.fixtures import LIBSPEC_3
+    from robotframework_ls.robot_config import RobotConfig
+
+    Path(workspace_dir, "specs").mkdir(parents=True)
+    Path(workspace_dir, "specs", "my.libspec").write_text(LIBSPEC_1)
+    Path(workspace_dir, "node_modules", "pkg").mkdir(parents=True)
+    Path(workspace_dir, "node_modules", "pkg", "my2.libspec").write_text(LIBSPEC_2)
+    # A virtual environment without a well-known name is also skipped.
+    Path(workspace_dir, "env1", "lib").mkdir(parents=True)
+    Path(workspace_dir, "env1", "pyvenv.cfg").write_text("")
+    Path(workspace_dir, "env1", "lib", "my3.libspec").write_text(LIBSPEC_3)
+
+    # Make the folders old enough for their listing to be reused.
+    old_mtime = time.time() - 60
+    for root, dirs, _files in os.walk(workspace_dir):
+        for d in dirs:
+            os.utime(os.path.join(root, d), (old_mtime, old_mtime))
+    os.utime(workspace_dir, (old_mtime, old_mtime))
+
+    workspace_uri = uris.from_fs_path(workspace_dir)
+    libspec_manager.add_workspace_folder(workspace_uri)
+    assert libspec_manager.get_library_info("case1_library", create=False)
+    assert libspec_manager.get_library_info("case2_library", create=False) is None
+    assert libspec_manager.get_library_info("case3_library", create=False) is None
+
+    # The folders which didn't change aren't listed again.
+    scanned = []
+    original_scandir = os.scandir
+
+    def scandir(path):
+        scanned.append(path)
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    libspec_manager.synchronize_workspace_folders()
+    assert scanned == []
+    assert libspec_manager.get_library_info("case1_library", create=False)
+
+    # Exclude patterns may also be configured.
+    config = RobotConfig()
+    config.update({"robot": {"libdoc": {"scanExcludes": ["spec*"]}}})
+    libspec_manager.config = config
+    assert libspec_manager.get_library_info("case1_library", create=False) is None
+
+    config = RobotConfig()
+    libspec_manager.config = config
+    assert libspec_manager.get_library_info("case1_library", create=False)
+
+
+def test_libspec_manager_status(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+
+    os.makedirs(workspace_dir)
+    Path(workspace_dir, "status_lib.py").write_text("def status_method():\n    pass\n")
+    Path(workspace_dir, "status_lib_fail.py").write_text("raise RuntimeError('Fail')")
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+
+    assert libspec_manager.get_library_info("status_lib", current_doc_uri=doc_uri)
+    assert libspec_manager.get_library_info("status_lib", current_doc_uri=doc_uri)
+    assert (
+        libspec_manager.get_library_info("status_lib_fail", current_doc_uri=doc_uri)
+        is None
+    )
+
+    # The (delayed) watcher event for the libspec we published must not
+    # discard the info already loaded from it.
+    (lib_info,) = libspec_manager._iter_lib_info_for_name("status_lib")
+    spec_filename = lib_info._canonical_spec_filename
+    (folder_info,) = [
+        folder_info
+        for folder_info, _can_regenerate in libspec_manager._iter_folder_infos()
+        if os.path.normcase(os.path.realpath(folder_info.folder_path))
+        == os.path.dirname(spec_filename)
+    ]
+    libspec_manager._on_spec_file_changed(spec_filename, folder_info._on_change_spec)
+    assert lib_info in libspec_manager._iter_lib_info_for_name("status_lib")
+
+    status = libspec_manager.get_status()
+    assert status["getLibraryInfo"] == {"hits": 1, "staleHits": 0, "misses": 2}
+
+    internal_folders = [f for f in status["folders"] if f["kind"] == "internal"]
+    assert internal_folders
+    assert sum(f["loadedLibspecs"] for f in internal_folders) >= 1
+
+    name_to_library = dict((lib["name"], lib) for lib in status["libraries"])
+    library = name_to_library["status_lib"]
+    assert library["generations"] == 1
+    assert library["lastGenerationTime"] > 0
+    (libspec,) = library["libspecs"]
+    assert libspec["loaded"]
+    assert libspec["loadTime"] > 0
+    assert libspec["memorySize"] > 0
+    assert name_to_library["status_lib_fail"]["libspecs"] == []
+
+    # The libspecs available but still not loaded are also reported.
+    (libspec,) = name_to_library["Collections"]["libspecs"]
+    assert not libspec["loaded"]
+
+    (failure,) = status["failures"]
+    assert failure["name"] == "status_lib_fail"
+    assert failure["failures"] == 1
+    assert "Fail" in failure["message"]
+
+
+def test_libspec_manager_environment_id(monkeypatch):
+    import sys
+    from robotframework_ls.impl.libspec_manager import LibspecManager
+    from robotframework_ls.impl.libspec_manager import ENV_LIBSPEC_ENVIRONMENT_ID
+
+    monkeypatch.delenv(ENV_LIBSPEC_ENVIRONMENT_ID, raising=False)
+    default_dir = LibspecManager.get_internal_libspec_dir()
+
+    # Interpreters with the same environment id share the same libspecs
+    # (regardless of the executable).
+    monkeypatch.setenv(ENV_LIBSPEC_ENVIRONMENT_ID, "env1")
+    env1_dir = LibspecManager.get_internal_libspec_dir()
+    assert env1_dir != default_dir
+
+    monkeypatch.setattr(sys, "executable", sys.executable + "_other")
+    assert LibspecManager.get_internal_libspec_dir() == env1_dir
+
+    monkeypatch.setenv(ENV_LIBSPEC_ENVIRONMENT_ID, "env2")
+    assert LibspecManager.get_internal_libspec_dir() not in (env1_dir, default_dir)
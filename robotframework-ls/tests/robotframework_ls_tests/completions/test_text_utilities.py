@@ -48,6 +48,50 @@ def test_matches_robot_keyword():
     )
 
 
+def test_embedded_args_matcher():
+    from robotframework_ls.impl.text_utilities import get_embedded_args_matcher
+    from robotframework_ls.impl.text_utilities import matches_robot_keyword
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    keyword_names = [
+        'I execute "${cmd:[^"]+}"',
+        'I execute "${cmd}" with ${args}',
+        "I execute ${cmd}",
+        "Add ${count} items",
+        "Add ${count} items to ${list}",
+        "${a} plus ${b}",
+        "rar{a",
+    ]
+    normalized_names = frozenset(normalize_robot_name(n) for n in keyword_names)
+    matcher = get_embedded_args_matcher(normalized_names)
+    assert get_embedded_args_matcher(frozenset(normalized_names)) is matcher
+
+    for call_text in [
+        'I execute "ls"',
+        'I execute "ls" with "-la"',
+        'I execute "ls" f',
+        "I execute",
+        "I execute ls",
+        'f I execute "ls"',
+        "Add 2 items",
+        "Add 2 items to my list",
+        "Add 2 items to",
+        "Add items",
+        "1 plus 2",
+        "plus",
+        "rar{a",
+        "rar{ab",
+        "Another",
+    ]:
+        call_text = normalize_robot_name(call_text)
+        expected = any(
+            matches_robot_keyword(call_text, name) for name in normalized_names
+        )
+        assert matcher.matches(call_text) == expected, call_text
+
+    assert not get_embedded_args_matcher(frozenset()).matches("iexecute")
+
+
 def test_iter_dotted_names():
     from robotframework_ls.impl.text_utilities import iter_dotted_names
 
@@ -0,0 +1,109 @@
+def test_import_graph():
+    from robotframework_ls.server_api.import_graph import ImportGraph
+    from robotframework_ls.server_api.import_graph import DocImports
+
+    def doc_imports(resource_uris=(), library_names=(), variables_uris=()):
+        return DocImports(
+            frozenset(resource_uris),
+            frozenset(library_names),
+            frozenset(variables_uris),
+        )
+
+    import_graph = ImportGraph()
+    import_graph.set_imports("suite_b", doc_imports(["res2"]))
+    import_graph.set_imports("suite_a", doc_imports(["res2"], ["Collections"]))
+    import_graph.set_imports("res2", doc_imports(["res1"], ["Collections"]))
+    import_graph.set_imports("res1", doc_imports(variables_uris=["vars"]))
+
+    # Direct importers come first.
+    assert import_graph.get_dependents("vars") == ["res1", "res2", "suite_a", "suite_b"]
+    assert import_graph.get_dependents("res2") == ["suite_a", "suite_b"]
+    assert import_graph.get_dependents("suite_a") == []
+    assert import_graph.get_library_dependents("Collections") == [
+        "res2",
+        "suite_a",
+        "suite_b",
+    ]
+
+    # Replacing the imports removes the old reverse edges.
+    import_graph.set_imports("suite_a", doc_imports(["res1"]))
+    assert import_graph.get_dependents("res2") == ["suite_b"]
+    assert import_graph.get_dependents("res1") == ["res2", "suite_a", "suite_b"]
+
+    import_graph.remove_document("res2")
+    assert import_graph.get_imports("res2") is None
+    assert import_graph.get_dependents("res1") == ["suite_a"]
+    assert import_graph.get_library_dependents("Collections") == []
+
+    # Cycles are ok.
+    import_graph.set_imports("res1", doc_imports(["suite_a"]))
+    assert import_graph.get_dependents("suite_a") == ["res1"]
+
+
+def test_import_graph_library_dependents():
+    from robotframework_ls.server_api.import_graph import ImportGraph
+    from robotframework_ls.server_api.import_graph import DocImports
+
+    import_graph = ImportGraph()
+    import_graph.set_imports(
+        "suite", DocImports(frozenset(), frozenset(["../x/My_Lib.py"]), frozenset())
+    )
+    import_graph.set_imports(
+        "other", DocImports(frozenset(), frozenset(["Collections"]), frozenset())
+    )
+
+    # The libraries match the name of their libspec.
+    assert import_graph.get_library_dependents("my_lib") == ["suite"]
+    assert import_graph.get_library_dependents("collections") == ["other"]
+
+    # BuiltIn is implicitly imported by all the documents.
+    assert import_graph.get_library_dependents("BuiltIn") == ["other", "suite"]
+
+    import_graph.remove_document("suite")
+    assert import_graph.get_library_dependents("my_lib") == []
+
+
+def test_import_graph_exports_changed(workspace, libspec_manager):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.server_api.import_graph import ImportGraph
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+    import_graph = ImportGraph()
+
+    def update(source):
+        doc.source = source
+        return import_graph.update(CompletionContext(doc, workspace=workspace.ws))
+
+    contents = """*** Settings ***
+Library           case1_library
+
+*** Variables ***
+${var}    1
+
+*** Test Cases ***
+Test
+    My Keyword    1
+
+*** Keywords ***
+My Keyword
+    [Arguments]    ${a}
+    Log    ${a}
+"""
+    # The first time the exports are seen isn't a change.
+    assert update(contents) == []
+
+    # Changing the contents of a test/keyword doesn't change the exports.
+    assert update(contents.replace("My Keyword    1", "My Keyword    2")) == []
+    assert update(contents.replace("Log    ${a}", "No Operation")) == []
+
+    # Changing keywords, arguments, variables or imports does.
+    assert update(contents.replace("My Keyword\n", "My Kw\n")) == [doc.uri]
+    assert update(contents) == [doc.uri]
+    assert update(contents.replace("[Arguments]    ${a}", "[Arguments]")) == [doc.uri]
+    assert update(contents) == [doc.uri]
+    assert update(contents.replace("${var}    1", "${var}    2")) == [doc.uri]
+    assert update(contents.replace("case1_library", "Collections")) == [doc.uri]
+
+    import_graph.remove_document(doc.uri)
+    assert update(contents) == []
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+
+def _create_prefetcher(workspace):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.server_api.import_prefetcher import ImportPrefetcher
+
+    def create_completion_context(doc_uri, monitor):
+        doc = workspace.ws.get_document(doc_uri, accept_from_file=True)
+        return CompletionContext(doc, workspace=workspace.ws, monitor=monitor)
+
+    return ImportPrefetcher(create_completion_context)
+
+
+def _write_case(workspace_dir):
+    from robocorp_ls_core import uris
+
+    os.makedirs(workspace_dir)
+    for name in ("prefetch_lib_a", "prefetch_lib_b"):
+        with open(os.path.join(workspace_dir, name + ".py"), "w") as stream:
+            stream.write("def %s_method():\n    pass\n" % (name,))
+
+    with open(os.path.join(workspace_dir, "my.resource"), "w") as stream:
+        stream.write("*** Settings ***\nLibrary    prefetch_lib_b\n")
+
+    robot_file = os.path.join(workspace_dir, "case.robot")
+    with open(robot_file, "w") as stream:
+        stream.write(
+            "*** Settings ***\nLibrary    prefetch_lib_a\nResource    my.resource\n"
+        )
+    return uris.from_fs_path(robot_file)
+
+
+def test_import_prefetcher(workspace, libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+
+    doc_uri = _write_case(workspace_dir)
+    workspace.set_root(workspace_dir, libspec_manager=libspec_manager)
+    prefetcher = _create_prefetcher(workspace)
+    try:
+        prefetcher.prefetch(doc_uri)
+
+        timeout_at = time.time() + 20
+        while (
+            libspec_manager.get_library_info("prefetch_lib_a", create=False) is None
+            or libspec_manager.get_library_info("prefetch_lib_b", create=False) is None
+        ):
+            assert time.time() < timeout_at
+            time.sleep(0.1)
+
+        # The resource was loaded in the workspace.
+        resource_uri = uris.from_fs_path(os.path.join(workspace_dir, "my.resource"))
+        assert resource_uri in workspace.ws._filesystem_docs
+    finally:
+        prefetcher.dispose()
+
+
+def test_import_prefetcher_cancel(workspace, libspec_manager, workspace_dir):
+    doc_uri = _write_case(workspace_dir)
+    workspace.set_root(workspace_dir, libspec_manager=libspec_manager)
+    prefetcher = _create_prefetcher(workspace)
+
+    started_event = threading.Event()
+    can_finish_event = threading.Event()
+    get_library_info_calls = []
+
+    def create_libspecs(libraries, monitor=None):
+        started_event.set()
+        can_finish_event.wait(10)
+        return {}
+
+    def get_library_info(*args, **kwargs):
+        get_library_info_calls.append(args)
+
+    libspec_manager.create_libspecs = create_libspecs
+    libspec_manager.get_library_info = get_library_info
+    try:
+        prefetcher.prefetch(doc_uri)
+        assert started_event.wait(10)
+
+        # Closing the document cancels its prefetch.
+        prefetcher.cancel(doc_uri)
+        can_finish_event.set()
+
+        timeout_at = time.time() + 10
+        while prefetcher._current is not None:
+            assert time.time() < timeout_at
+            time.sleep(0.05)
+        assert not get_library_info_calls
+    finally:
+        can_finish_event.set()
+        prefetcher.dispose()
+
+
+def test_import_prefetcher_debounce():
+    from robotframework_ls.server_api.import_prefetcher import ImportPrefetcher
+
+    called_at = []
+    called_event = threading.Event()
+
+    def create_completion_context(doc_uri, monitor):
+        called_at.append(time.time())
+        called_event.set()
+        return None
+
+    prefetcher = ImportPrefetcher(create_completion_context, debounce=0.3)
+    try:
+        prefetcher.prefetch("untitled:Untitled-1")
+        time.sleep(0.2)
+        # i.e.: the settings/document changed: wait some more.
+        postponed_at = time.time()
+        prefetcher.postpone()
+
+        assert called_event.wait(10)
+        assert called_at[0] - postponed_at >= 0.3
+    finally:
+        prefetcher.dispose()
@@ -0,0 +1,160 @@
+def _full_lint(completion_context):
+    from robotframework_ls.impl.ast_utils import collect_errors
+    from robotframework_ls.impl import code_analysis
+
+    errors = collect_errors(completion_context.get_ast())
+    errors.extend(code_analysis.collect_analysis_errors(completion_context))
+    return [error.to_lsp_diagnostic() for error in errors]
+
+
+def test_incremental_lint(workspace, libspec_manager, monkeypatch):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.server_api.incremental_lint import IncrementalLinter
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+
+    analyzed = []
+    original_collect = ast_utils.collect_block_errors_and_keyword_usages
+
+    def collect_block_errors_and_keyword_usages(block_info):
+        analyzed.append(block_info.node.__class__.__name__)
+        return original_collect(block_info)
+
+    monkeypatch.setattr(
+        ast_utils,
+        "collect_block_errors_and_keyword_usages",
+        collect_block_errors_and_keyword_usages,
+    )
+
+    incremental_linter = IncrementalLinter()
+
+    def check(source):
+        del analyzed[:]
+        doc.source = source
+        errors = [
+            error.to_lsp_diagnostic()
+            for error in incremental_linter.lint(
+                CompletionContext(doc, workspace=workspace.ws)
+            )
+        ]
+        assert errors == _full_lint(CompletionContext(doc, workspace=workspace.ws))
+        return errors
+
+    settings = """*** Settings ***
+Library           case1_library
+
+"""
+    test_cases = """*** Test Cases ***
+User can call library
+    verify model   1
+    Not there 1
+
+Another test
+    My Keyword    1
+
+"""
+    keywords = """*** Keywords ***
+My Keyword
+    [Arguments]    ${a}
+    Not there 2
+    Log    ${a}
+"""
+    errors = check(settings + test_cases + keywords)
+    assert [error["message"] for error in errors] == [
+        "Undefined keyword: Not there 1.",
+        "Undefined keyword: Not there 2.",
+    ]
+    assert sorted(analyzed) == [
+        "EmptyLine",
+        "Keyword",
+        "KeywordSectionHeader",
+        "LibraryImport",
+        "SettingSectionHeader",
+        "TestCase",
+        "TestCase",
+        "TestCaseSectionHeader",
+    ]
+
+    # Change only one test case: only it is analyzed again (and the errors of
+    # the blocks after it are moved).
+    new_test_cases = test_cases.replace(
+        "    Not there 1\n", "    Not there 1\n    Not there 3\n\n\n"
+    )
+    errors = check(settings + new_test_cases + keywords)
+    assert analyzed == ["TestCase"]
+    assert [error["message"] for error in errors] == [
+        "Undefined keyword: Not there 1.",
+        "Undefined keyword: Not there 3.",
+        "Undefined keyword: Not there 2.",
+    ]
+
+    # Fixing the error in the keyword only analyzes the keyword again.
+    errors = check(settings + new_test_cases + keywords.replace("Not there 2", "Log"))
+    assert analyzed == ["Keyword"]
+    assert len(errors) == 2
+
+    # Renaming a keyword changes the scope: all the blocks are analyzed again.
+    errors = check(
+        settings
+        + new_test_cases
+        + keywords.replace("Not there 2", "Log").replace("My Keyword", "My Kw")
+    )
+    assert len(analyzed) > 2
+    assert [error["message"] for error in errors] == [
+        "Undefined keyword: Not there 1.",
+        "Undefined keyword: Not there 3.",
+        "Undefined keyword: My Keyword.",
+    ]
+
+    # Changing the settings too.
+    errors = check(settings.replace("case1_library", "Collections") + test_cases)
+    assert "Undefined keyword: verify model." in [e["message"] for e in errors]
+
+    incremental_linter.remove_document(doc.uri)
+    assert not incremental_linter._doc_uri_to_lint_info
+
+
+def test_incremental_lint_max_errors(workspace, libspec_manager, monkeypatch):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.ast_utils import MAX_ERRORS
+    from robotframework_ls.server_api.incremental_lint import IncrementalLinter
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+
+    incremental_linter = IncrementalLinter()
+
+    def check(source):
+        doc.source = source
+        errors = [
+            error.to_lsp_diagnostic()
+            for error in incremental_linter.lint(
+                CompletionContext(doc, workspace=workspace.ws)
+            )
+        ]
+        assert errors == _full_lint(CompletionContext(doc, workspace=workspace.ws))
+        return errors
+
+    test_cases = ["*** Test Cases ***\n"]
+    for i in range(MAX_ERRORS + 20):
+        test_cases.append("Test %s\n    [Foo]\n    Not there %s\n\n" % (i, i))
+
+    errors = check("".join(test_cases))
+    assert len(errors) == MAX_ERRORS * 2
+    # The blocks whose errors wouldn't be reported aren't analyzed.
+    lint_info = incremental_linter._doc_uri_to_lint_info[doc.uri]
+    assert len(lint_info.block_key_to_errors) == MAX_ERRORS + 1
+
+    # Fixing some errors shows the errors of the blocks after those.
+    for i in range(10):
+        test_cases[i + 1] = "Test %s\n    Log    1\n\n" % (i,)
+    errors = check("".join(test_cases))
+    assert len(errors) == MAX_ERRORS * 2
+    lint_info = incremental_linter._doc_uri_to_lint_info[doc.uri]
+    assert len(lint_info.block_key_to_errors) == MAX_ERRORS + 11
+    assert errors[-1]["message"] == "Undefined keyword: Not there %s." % (
+        MAX_ERRORS + 9,
+    )
@@ -170,6 +170,25 @@ def test_check_version():
     assert api._check_min_version((3, 2))
 
 
+def test_server_did_close_removes_from_import_graph():
+    from robotframework_ls.server_api.import_graph import DocImports
+
+    api = _initialize_robotframework_server_api()
+    doc_uri = "untitled:Untitled-1"
+    api.m_text_document__did_open(
+        textDocument={"uri": doc_uri, "version": 1, "text": ""}
+    )
+    api._import_graph.set_imports(
+        doc_uri, DocImports(frozenset(["res"]), frozenset(["Collections"]), frozenset())
+    )
+    assert api._import_graph.get_dependents("res") == [doc_uri]
+
+    api.m_text_document__did_close(textDocument={"uri": doc_uri})
+    assert api._import_graph.get_imports(doc_uri) is None
+    assert api._import_graph.get_dependents("res") == []
+    assert api._import_graph.get_library_dependents("Collections") == []
+
+
 def check_no_robotframework():
     from robocorp_ls_core.basic import before
     import sys
@@ -148,8 +148,9 @@ Test
     from robotframework_ls.robot_config import RobotConfig
 
     config = RobotConfig()
-    # Note: we don't give errors if we can't resolve a resource.
-    _collect_errors(workspace, doc, data_regression, basename="no_error", config=config)
+    # Note: we don't give errors if we can't resolve a resource (but we do
+    # give errors for the libraries whose libspec couldn't be generated).
+    _collect_errors(workspace, doc, data_regression, config=config)
 
 
 def test_casing_on_filename(workspace, libspec_manager, data_regression):
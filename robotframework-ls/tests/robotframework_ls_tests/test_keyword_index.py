@@ -0,0 +1,72 @@
+def test_keyword_index_doc():
+    import gc
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl.keyword_index import KeywordIndex
+
+    doc = RobotDocument(
+        uri="unkwown",
+        source="""
+*** Keywords ***
+My Keyword
+    [Arguments]    ${a}    ${b}=10
+    Log    ${a}
+
+Another_keyword
+    No Operation
+
+Add ${count} items
+    No Operation
+""",
+    )
+    keyword_index = KeywordIndex()
+    doc_keywords = keyword_index.get_doc_keywords(doc)
+    assert keyword_index.get_doc_keywords(doc) is doc_keywords  # Check cache
+
+    assert [k.keyword_name for k in doc_keywords.iter_keywords()] == [
+        "My Keyword",
+        "Another_keyword",
+        "Add ${count} items",
+    ]
+    my_keyword = next(doc_keywords.iter_keywords(["mykeyword"]))
+    assert [arg.original_arg for arg in my_keyword.keyword_args] == [
+        "${a}",
+        "${b}=10",
+    ]
+
+    # Keywords with embedded arguments may match any name.
+    assert [k.keyword_name for k in doc_keywords.iter_keywords(["anotherkeyword"])] == [
+        "Another_keyword",
+        "Add ${count} items",
+    ]
+    assert [k.keyword_name for k in doc_keywords.iter_keywords(["notthere"])] == [
+        "Add ${count} items"
+    ]
+
+    # Changing the document changes the AST (so, it's indexed again).
+    doc.source = "*** Keywords ***\nNew Keyword\n    No Operation\n"
+    new_doc_keywords = keyword_index.get_doc_keywords(doc)
+    assert new_doc_keywords is not doc_keywords
+    assert [k.keyword_name for k in new_doc_keywords.iter_keywords()] == ["New Keyword"]
+
+    # The index doesn't keep the AST alive (the entry is removed when the
+    # document -- and its AST -- is no longer referenced).
+    gc.collect()
+    assert len(keyword_index._ast_to_doc_keywords) == 1
+    del doc
+    gc.collect()
+    assert not keyword_index._ast_to_doc_keywords
+
+
+def test_keyword_index_library(libspec_manager):
+    from robotframework_ls.impl.keyword_index import KeywordIndex
+
+    library_doc = libspec_manager.get_library_info("BuiltIn", create=False)
+    assert library_doc is not None
+
+    keyword_index = KeywordIndex()
+    library_keywords = keyword_index.get_library_keywords(library_doc)
+    assert keyword_index.get_library_keywords(library_doc) is library_keywords
+    assert len(library_keywords.keywords) == len(library_doc.keywords)
+
+    found = list(library_keywords.iter_keywords(["shouldbeequal", "log"]))
+    assert sorted(k.name for k in found) == ["Log", "Should Be Equal"]
@@ -67,3 +67,34 @@ def test_document_from_file(workspace, workspace_dir, cases):
 
     # The old one in memory doesn't change after the file is removed
     assert cached_doc3.source == "new contents"
+
+
+def test_exported_symbols_cache():
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    d = RobotDocument(
+        uri="unkwown",
+        source="""
+*** Settings ***
+Library    Collections
+Resource    my.resource
+
+*** Variables ***
+${NAME}         Robot Framework
+@{LIST}=        a    b
+""",
+    )
+    library_imports = d.get_library_imports()
+    assert [x.name for x in library_imports] == ["Collections"]
+    assert [x.name for x in d.get_resource_imports()] == ["my.resource"]
+    variables = d.get_variables()
+    assert [x.name for x in variables] == ["${NAME}", "@{LIST}"]
+
+    # Check cache
+    assert d.get_library_imports() is library_imports
+    assert d.get_variables() is variables
+
+    d.source = "*** Settings ***\nLibrary    String"
+    assert [x.name for x in d.get_library_imports()] == ["String"]
+    assert d.get_resource_imports() == ()
+    assert d.get_variables() == ()
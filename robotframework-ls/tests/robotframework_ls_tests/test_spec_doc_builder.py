@@ -26,6 +26,10 @@ def test_spec_doc_builder(
         assert library_doc, f"Unable to generate library doc for: {p}"
         assert len(library_doc.keywords) == 7
 
+        header = builder.build_header(str(p))
+        assert header.name == library_doc.name
+        assert header.keyword_count == 7
+
         check = {}
         for keyword in library_doc.keywords:
             args = keyword.args
@@ -44,3 +48,211 @@ def test_spec_doc_builder(
                 ]
             }
         data_regression.check(check, basename=f"{p.name}_expected")
+
+
+def test_spec_doc_builder_header(tmpdir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+
+    spec_filename = str(tmpdir.join("my.libspec"))
+    with open(spec_filename, "w") as stream:
+        stream.write(LIBSPEC_1)
+
+    header = SpecDocBuilder().build_header(spec_filename)
+    assert header.name == "case1_library"
+    assert header.keyword_count == 2
+
+
+def test_spec_doc_builder_header_v2_docs_not_parsed(tmpdir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+
+    # Note: the docs are broken after the header (so, those can't be parsed).
+    spec_filename = str(tmpdir.join("v2.libspec"))
+    with open(spec_filename, "w") as stream:
+        stream.write(
+            """<?xml version="1.0" encoding="UTF-8"?>
+<keywordspec name="v2_library" type="LIBRARY" format="ROBOT" specversion="2">
+<version></version>
+<scope>global</scope>
+<namedargs>yes</namedargs>
+<doc>Library &lt;kw&gt; docs.</doc>
+<kw name="First">
+<arguments>
+</arguments>
+<doc>&not_defined;</doc>
+</kw>
+<kw name="Second">
+<arguments>
+</arguments>
+<doc>Broken</wrong>
+</kw>
+</keywordspec>
+"""
+        )
+
+    header = SpecDocBuilder().build_header(spec_filename)
+    assert header.name == "v2_library"
+    assert header.specversion == "2"
+    assert header.keyword_count == 2
+
+
+def test_spec_doc_builder_compiled(original_datadir, tmpdir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl import libspec_compiled
+
+    def keyword_to_tuple(keyword):
+        return (
+            keyword.name,
+            keyword.doc,
+            tuple(keyword.tags),
+            keyword.source,
+            keyword.lineno,
+            tuple(
+                (
+                    arg.original_arg,
+                    arg.arg_name,
+                    arg.arg_type,
+                    arg.default_value,
+                    arg.is_star_arg,
+                    arg.is_keyword_arg,
+                )
+                for arg in keyword.args
+            ),
+        )
+
+    for p in original_datadir.glob("*.libspec"):
+        library_doc = SpecDocBuilder().build(str(p))
+        compiled_filename = str(tmpdir.join(p.name + ".bin"))
+        libspec_compiled.write_compiled_libspec(library_doc, 1.5, 10, compiled_filename)
+
+        assert libspec_compiled.CompiledLibspec.open(compiled_filename, 2, 10) is None
+
+        compiled = libspec_compiled.CompiledLibspec.open(compiled_filename, 1.5, 10)
+        assert compiled is not None
+        try:
+            assert compiled.name == library_doc.name
+            assert compiled.keyword_count == 7
+            loaded = libspec_compiled.load_library_doc(str(p), compiled)
+        finally:
+            compiled.close()
+
+        for attr in ("name", "doc", "version", "specversion", "type", "source"):
+            assert getattr(loaded, attr) == getattr(library_doc, attr)
+        assert [keyword_to_tuple(k) for k in loaded.keywords] == [
+            keyword_to_tuple(k) for k in library_doc.keywords
+        ]
+        assert [keyword_to_tuple(k) for k in loaded.inits] == [
+            keyword_to_tuple(k) for k in library_doc.inits
+        ]
+
+
+def test_spec_doc_builder_compiled_lazy_docs(original_datadir, tmpdir, monkeypatch):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl import libspec_compiled
+
+    p = next(iter(original_datadir.glob("*.libspec")))
+    library_doc = SpecDocBuilder().build(str(p))
+    compiled_filename = str(tmpdir.join(p.name + ".bin"))
+    libspec_compiled.write_compiled_libspec(library_doc, 1.5, 10, compiled_filename)
+
+    compiled = libspec_compiled.CompiledLibspec.open(compiled_filename, 1.5, 10)
+    try:
+        loaded = libspec_compiled.load_library_doc(str(p), compiled)
+    finally:
+        compiled.close()
+
+    def _open(*args, **kwargs):
+        raise AssertionError("The docs must be read from the mapping.")
+
+    monkeypatch.setattr(libspec_compiled, "open", _open, raising=False)
+
+    # The docs/tags are only read from the compiled file when requested.
+    for keyword in loaded.keywords:
+        assert callable(keyword._doc)
+        assert callable(keyword._tags)
+    assert [k.doc for k in loaded.keywords] == [k.doc for k in library_doc.keywords]
+    assert [k.tags for k in loaded.keywords] == [k.tags for k in library_doc.keywords]
+    assert loaded.doc == library_doc.doc
+    monkeypatch.undo()
+
+    # If the compiled file is replaced by one with the same contents (i.e.:
+    # the libspec was generated again by another process), the docs are
+    # still available.
+    libspec_compiled.write_compiled_libspec(library_doc, 2.5, 20, compiled_filename)
+    assert [k.doc for k in loaded.keywords] == [k.doc for k in library_doc.keywords]
+
+    # If the compiled file changes, the docs are still read from the contents
+    # mapped when the library doc was loaded (we must not read garbage from
+    # the new file).
+    expected_docs = [k.doc for k in library_doc.keywords]
+    expected_tags = [k.tags for k in library_doc.keywords]
+    expected_doc = library_doc.doc
+    library_doc.doc = "Changed"
+    library_doc.keywords = library_doc.keywords[:1]
+    library_doc.keywords[0].doc = "Changed"
+    libspec_compiled.write_compiled_libspec(library_doc, 2.5, 20, compiled_filename)
+    assert [k.doc for k in loaded.keywords] == expected_docs
+    assert [k.tags for k in loaded.keywords] == expected_tags
+    assert loaded.doc == expected_doc
+
+
+def test_spec_doc_builder_compiled_lazy_docs_removed(original_datadir, tmpdir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl import libspec_compiled
+    from robocorp_ls_core.constants import IS_WINDOWS
+    import pytest
+    import shutil
+    import os
+
+    if IS_WINDOWS:
+        pytest.skip("A file can't be removed while it's mapped on Windows.")
+
+    p = next(iter(original_datadir.glob("*.libspec")))
+    spec_filename = str(tmpdir.join(p.name))
+    shutil.copyfile(str(p), spec_filename)
+    library_doc = SpecDocBuilder().build(spec_filename)
+    compiled_filename = spec_filename + ".bin"
+    libspec_compiled.write_compiled_libspec(library_doc, 1.5, 10, compiled_filename)
+
+    compiled = libspec_compiled.CompiledLibspec.open(compiled_filename, 1.5, 10)
+    try:
+        loaded = libspec_compiled.load_library_doc(spec_filename, compiled)
+    finally:
+        compiled.close()
+
+    # The mapping is kept alive by the library doc (so, the docs are still
+    # available even if the files are removed).
+    os.remove(compiled_filename)
+    os.remove(spec_filename)
+    assert [k.doc for k in loaded.keywords] == [k.doc for k in library_doc.keywords]
+    assert [k.tags for k in loaded.keywords] == [k.tags for k in library_doc.keywords]
+    assert loaded.doc == library_doc.doc
+
+
+def test_spec_doc_builder_compiled_markdown(original_datadir, tmpdir, monkeypatch):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl.robot_specbuilder import markdown_doc
+    from robotframework_ls.impl import libspec_compiled
+    from robotframework_ls import html_to_markdown
+
+    p = next(iter(original_datadir.glob("*.libspec")))
+    library_doc = SpecDocBuilder().build(str(p))
+    assert library_doc.doc_format == "HTML"
+    expected = [markdown_doc(k) for k in library_doc.keywords]
+
+    compiled_filename = str(tmpdir.join(p.name + ".bin"))
+    library_doc = SpecDocBuilder().build(str(p))
+    libspec_compiled.write_compiled_libspec(library_doc, 1.5, 10, compiled_filename)
+
+    compiled = libspec_compiled.CompiledLibspec.open(compiled_filename, 1.5, 10)
+    try:
+        loaded = libspec_compiled.load_library_doc(str(p), compiled)
+    finally:
+        compiled.close()
+
+    def convert(html):
+        raise AssertionError("The markdown should've been precomputed.")
+
+    monkeypatch.setattr(html_to_markdown, "convert", convert)
+    assert [markdown_doc(k) for k in loaded.keywords] == expected
+    assert markdown_doc(loaded) == markdown_doc(library_doc)
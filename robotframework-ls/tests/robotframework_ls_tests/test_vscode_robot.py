@@ -149,6 +149,119 @@ Check It
     data_regression.check(request_completion())
 
 
+def test_libspec_manager_status_integrated(
+    language_server_tcp: ILanguageServerClient, ws_root_path
+):
+    from robocorp_ls_core.workspace import Document
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+
+    language_server = language_server_tcp
+    language_server.initialize(ws_root_path, process_id=os.getpid())
+    uri = "untitled:Untitled-1"
+    language_server.open_doc(uri, 1)
+    contents = """
+*** Settings ***
+Library    Collections
+
+*** Test Cases ***
+Check It
+    Append To"""
+    language_server.change_doc(uri, 2, contents)
+    doc = Document("", source=contents)
+    line, col = doc.get_last_line_col()
+    language_server.get_completions(uri, line, col)
+
+    def get_status():
+        result = language_server.execute_command("robot.getLibspecManagerStatus", [])[
+            "result"
+        ]
+        assert set(result.keys()) == {"api", "lintApi"}
+        return result["api"]
+
+    # Note: the builtin libspecs are created in a thread (so, wait for those
+    # to be available).
+    def check_builtin_available():
+        library_names = [lib["name"] for lib in get_status()["libraries"]]
+        return "BuiltIn" in library_names
+
+    wait_for_test_condition(check_builtin_available)
+
+    status = get_status()
+    assert status["getLibraryInfo"]["hits"] + status["getLibraryInfo"]["misses"] > 0
+
+
+def test_lint_dependents_on_resource_change(
+    language_server_tcp: ILanguageServerClient, ws_root_path
+):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.unittest_tools.fixtures import TIMEOUT
+    import threading
+    import time
+
+    language_server = language_server_tcp
+    os.makedirs(ws_root_path, exist_ok=True)
+    suite_path = os.path.join(ws_root_path, "suite.robot")
+    resource_path = os.path.join(ws_root_path, "my.resource")
+    suite_contents = """
+*** Settings ***
+Resource    my.resource
+
+*** Test Cases ***
+Check It
+    My Keyword
+"""
+    resource_contents = "*** Keywords ***\nAnother Keyword\n    No Operation\n"
+    with open(suite_path, "w") as stream:
+        stream.write(suite_contents)
+    with open(resource_path, "w") as stream:
+        stream.write(resource_contents)
+
+    suite_uri = uris.from_fs_path(suite_path)
+    resource_uri = uris.from_fs_path(resource_path)
+
+    # Note: a handler is used (instead of a message matcher) so that no
+    # notification is missed in-between waits.
+    suite_diagnostics = []
+    condition = threading.Condition()
+
+    def on_publish_diagnostics(msg):
+        params = msg["params"]
+        if params["uri"] == suite_uri:
+            with condition:
+                suite_diagnostics.append(params["diagnostics"])
+                condition.notify_all()
+
+    language_server.register_notification_handler(
+        "textDocument/publishDiagnostics", on_publish_diagnostics
+    )
+
+    def wait_for_suite_diagnostics(check):
+        timeout_at = time.time() + TIMEOUT
+        with condition:
+            while not suite_diagnostics or not check(suite_diagnostics[-1]):
+                remaining = timeout_at - time.time()
+                if remaining <= 0:
+                    raise AssertionError(
+                        "Did not get the expected diagnostics for the suite. Found: %s"
+                        % (suite_diagnostics,)
+                    )
+                condition.wait(remaining)
+
+    language_server.initialize(ws_root_path, process_id=os.getpid())
+    language_server.open_doc(resource_uri, 1, text=resource_contents)
+    language_server.open_doc(suite_uri, 1, text=suite_contents)
+    wait_for_suite_diagnostics(
+        lambda diagnostics: [d["message"] for d in diagnostics]
+        == ["Undefined keyword: My Keyword."]
+    )
+
+    # Changing the resource lints the suite again.
+    language_server.change_doc(
+        resource_uri, 2, resource_contents + "\nMy Keyword\n    No Operation\n"
+    )
+    wait_for_suite_diagnostics(lambda diagnostics: diagnostics == [])
+
+
 def test_variables_completions_integrated(
     language_server_tcp: ILanguageServerClient, ws_root_path, data_regression
 ):